@@ -0,0 +1,119 @@
+"""
+Compares the NumPy analytics engine with the pure Python statistics of CodeTimeDataRepository on synthetic data.
+
+Run from the repository root:
+    python -m benchmarks.analytics_benchmark
+"""
+import datetime
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.analytics_engine import AnalyticsEngine
+
+YEARS = 5
+ACTIVITIES = 200
+ACTIVITIES_PER_DAY = 25
+REPEATS = 3
+
+
+def write_synthetic_data(data_backend: DataBackend, start: datetime.date, end: datetime.date):
+    generator = random.Random(42)
+    names = [f"Activity {index}" for index in range(ACTIVITIES)]
+
+    month = start
+    while month <= end:
+        next_month = (month + datetime.timedelta(days=32)).replace(day=1)
+        month_data = {}
+        for day in range(1, (next_month - month).days + 1):
+            month_data[day] = {name: generator.randint(1000, 3600000)
+                               for name in generator.sample(names, ACTIVITIES_PER_DAY)}
+
+        data_backend.write_month_data(month_data, month)
+        month = next_month
+
+
+def measure(function) -> float:
+    """:return: best duration of REPEATS calls in milliseconds"""
+    durations = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return min(durations)
+
+
+def python_analytics(data_repository: CodeTimeDataRepository, start: datetime.date, end: datetime.date):
+    """Totals, shares, ranking, 7 day moving average and percentiles of the day totals with dicts and lists."""
+    day_totals = []
+    activity_totals = {}
+    day = start
+    while day <= end:
+        activities = data_repository.get_month_data(day).get(day.day, {})
+        day_totals.append(sum(activities.values()))
+        for name, time_ in activities.items():
+            activity_totals[name] = activity_totals.get(name, 0) + time_
+
+        day += datetime.timedelta(days=1)
+
+    total_time = sum(activity_totals.values())
+    shares = {name: time_ / total_time for name, time_ in activity_totals.items()}
+    ranking = sorted(activity_totals.keys(), key=lambda name: activity_totals[name], reverse=True)
+    moving_average = [sum(day_totals[index:index + 7]) / 7 for index in range(len(day_totals) - 6)]
+    percentiles = statistics.quantiles(day_totals, n=100)
+    return shares, ranking, moving_average, percentiles
+
+
+def numpy_analytics(engine: AnalyticsEngine, start: datetime.date, end: datetime.date):
+    matrix = engine.load(start, end)
+    return (engine.get_shares(matrix), engine.get_ranking(matrix), engine.get_moving_average(matrix, 7),
+            engine.get_percentiles(matrix, range(1, 100)))
+
+
+def run():
+    end = datetime.date(2020, 12, 31)
+    start = datetime.date(end.year - YEARS + 1, 1, 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_backend = DataBackend({DATA_FILES_PATH_KEYWORD: Path(directory)})
+        write_synthetic_data(data_backend, start, end)
+
+        data_repository = CodeTimeDataRepository(data_backend, cache_max_entries=YEARS * 12,
+                                                 cache_max_bytes=256 * 1024 * 1024)
+        engine = AnalyticsEngine(data_repository)
+        data_repository.get_range_statistics(start, end)
+        engine.get_range_statistics(start, end)
+
+        loaded = engine.load(start, end)
+        year = datetime.date(end.year, 1, 1)
+
+        benchmarks = [
+            ("range statistics per day", lambda: data_repository.get_range_statistics(start, end, "day"),
+             lambda: engine.get_range_statistics(start, end, "day")),
+            ("range statistics per week", lambda: data_repository.get_range_statistics(start, end, "week"),
+             lambda: engine.get_range_statistics(start, end, "week")),
+            ("day statistics of a year", lambda: [data_repository.get_statistics(year + datetime.timedelta(days=d))
+                                                  for d in range(365)],
+             lambda: [engine.get_statistics(year + datetime.timedelta(days=d)) for d in range(365)]),
+            ("totals, shares, ranking, moving average, percentiles",
+             lambda: python_analytics(data_repository, start, end), lambda: numpy_analytics(engine, start, end)),
+            ("same on a loaded matrix", lambda: python_analytics(data_repository, start, end),
+             lambda: (engine.get_shares(loaded), engine.get_ranking(loaded), engine.get_moving_average(loaded, 7),
+                      engine.get_percentiles(loaded, range(1, 100))))
+        ]
+
+        print(f"{YEARS} years, {ACTIVITIES} activities, {ACTIVITIES_PER_DAY} activities per day, month data cached")
+        print(f"{'benchmark':<55}{'python ms':>12}{'numpy ms':>12}{'speedup':>10}")
+        for name, python_function, numpy_function in benchmarks:
+            python_duration = measure(python_function)
+            numpy_duration = measure(numpy_function)
+            print(f"{name:<55}{python_duration:>12.1f}{numpy_duration:>12.1f}{python_duration / numpy_duration:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run()
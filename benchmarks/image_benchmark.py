@@ -0,0 +1,90 @@
+"""
+Compares the render time of day images with and without the asset cache of the image creators, and of previews
+rendered at full resolution and resized with previews rendered scaled, and of the bars of a year summary drawn one by
+one and as a single mask.
+
+Run from the repository root:
+    python -m benchmarks.image_benchmark
+"""
+import datetime
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.image_fixtures import create_image_paths, create_image_data_repository, BACKGROUND_SIZE
+from src.use_cases.image_creator import summary_image_creator
+from src.use_cases.image_creator.basic_image_creator import BasicImageCreator
+from src.use_cases.image_creator.summary_image_creator import YearSummaryImageCreator
+
+IMAGE_SIZE = BACKGROUND_SIZE
+ACTIVITIES = 12
+IMAGES = 20
+PREVIEW_SCALE = 0.5
+
+STATISTICS = {
+    "date": "Jan 01 2020",
+    "total_time": 12 * 3600000,
+    "activities": [{"name": f"Activity {index}", "time": 3600000, "progress": 1 / ACTIVITIES}
+                   for index in range(ACTIVITIES)]
+}
+
+
+def measure(function) -> float:
+    """:return: average duration of IMAGES calls in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(IMAGES):
+        function()
+
+    return (time.perf_counter() - start) * 1000 / IMAGES
+
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        data_repository = create_image_data_repository(create_image_paths(Path(directory), IMAGE_SIZE))
+        image_creator = BasicImageCreator(data_repository)
+
+        def render_without_cache():
+            image_creator.asset_cache.clear()
+            image_creator.create_image(STATISTICS)
+
+        uncached_duration = measure(render_without_cache)
+        image_creator.create_image(STATISTICS)
+        cached_duration = measure(lambda: image_creator.create_image(STATISTICS))
+
+        print(f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]} image, {ACTIVITIES} activities, average of {IMAGES} images")
+        print(f"{'without asset cache':<25}{uncached_duration:>10.1f} ms")
+        print(f"{'with asset cache':<25}{cached_duration:>10.1f} ms")
+        print(f"{'speedup':<25}{uncached_duration / cached_duration:>10.1f}x")
+
+        def render_and_resize():
+            image = image_creator.create_image(STATISTICS)
+            image.resize((image.width // 2, image.height // 2))
+
+        resized_duration = measure(render_and_resize)
+        scaled_duration = measure(lambda: image_creator.create_image(STATISTICS, scale=PREVIEW_SCALE))
+
+        print(f"preview at scale {PREVIEW_SCALE}")
+        print(f"{'render and resize':<25}{resized_duration:>10.1f} ms")
+        print(f"{'render scaled':<25}{scaled_duration:>10.1f} ms")
+        print(f"{'speedup':<25}{resized_duration / scaled_duration:>10.1f}x")
+
+        for month in range(1, 13):
+            data_repository.write_month_data({day: {f"Activity {index}": (day + index) * 60000
+                                                    for index in range(ACTIVITIES)}
+                                              for day in range(1, 29)}, datetime.date(2020, month, 1))
+
+        year_image_creator = YearSummaryImageCreator(data_repository)
+        year_statistics = year_image_creator.get_summary_statistics(datetime.date(2020, 1, 1))
+        year_image_creator.create_image(year_statistics)
+        masked_duration = measure(lambda: year_image_creator.create_image(year_statistics))
+        with patch.object(summary_image_creator, "numpy", None):
+            rectangles_duration = measure(lambda: year_image_creator.create_image(year_statistics))
+
+        print("year summary with 366 bars")
+        print(f"{'bars drawn one by one':<25}{rectangles_duration:>10.1f} ms")
+        print(f"{'bars as numpy mask':<25}{masked_duration:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    run()
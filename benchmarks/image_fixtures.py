@@ -0,0 +1,38 @@
+"""
+Resources and data repositories for rendering images outside of a release, shared by the image tests and benchmarks.
+"""
+import shutil
+from pathlib import Path
+
+from PIL import Image
+
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD, CONFIG_FILE_PATH_KEYWORD, \
+    RES_DIRECTORY_KEYWORD
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+
+RES_DIRECTORY = Path(__file__).resolve().parent.parent.joinpath("res")
+BACKGROUND_SIZE = (1080, 1920)
+USER_IMAGE_SIZE = (256, 256)
+
+
+def create_image_paths(directory: Path, background_size=BACKGROUND_SIZE) -> dict:
+    """
+    Copies the fonts and creates a background and user image like the ones shipped with releases, which are not
+    part of the repository.
+    :return: paths of data, config and res in directory
+    """
+    res_directory = Path(directory).joinpath("res")
+    shutil.copytree(RES_DIRECTORY.joinpath("fonts"), res_directory.joinpath("fonts"))
+    Image.new("RGB", background_size, "#FAFAFA").save(res_directory.joinpath("default_background.png"))
+    Image.new("RGB", USER_IMAGE_SIZE, "#3F51B5").save(res_directory.joinpath("default_user.png"))
+
+    return {DATA_FILES_PATH_KEYWORD: Path(directory).joinpath("data"),
+            CONFIG_FILE_PATH_KEYWORD: Path(directory).joinpath("config.json"),
+            RES_DIRECTORY_KEYWORD: res_directory}
+
+
+def create_image_data_repository(paths: dict) -> CodeTimeDataRepository:
+    """:return: repository of paths with the default config"""
+    data_repository = CodeTimeDataRepository(DataBackend(paths))
+    data_repository.create_default_config_if_config_is_missing()
+    return data_repository
@@ -0,0 +1,156 @@
+import argparse
+import datetime
+import multiprocessing
+import sys
+from pathlib import Path
+
+from src.data_sources.data_backend import DataBackend, convert_month_data
+from src.data_sources.data_backend_factory import create_data_backend, get_configured_storage_backend, \
+    STORAGE_BACKENDS, STORAGE_BACKEND_KEYWORD
+from src.data_sources.errors import InvalidStorageBackendError
+from src.data_sources.import_ledger import ImportLedger, IMPORTS_FILE_NAME
+from src.data_sources.journal import Journal, JOURNAL_FILE_NAME
+from src.data_sources.session_store import SessionStore, SESSIONS_DIRECTORY_NAME
+from src.paths import get_paths
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.batch_image_exporter import export_images, get_days_to_export
+from src.use_cases.exporter import EXPORT_FORMATS, iter_export_rows
+from src.use_cases.importer import import_tracking_data
+
+
+def convert(paths: dict, arguments):
+    source = arguments.source or get_configured_storage_backend(paths)
+    if source == arguments.to:
+        raise InvalidStorageBackendError(message=f"The month data already is stored as {source}")
+
+    convert_month_data(create_data_backend(paths, source), create_data_backend(paths, arguments.to))
+
+    config_backend = DataBackend(paths)
+    if config_backend.does_config_file_exist():
+        config = config_backend.read_config()
+        config[STORAGE_BACKEND_KEYWORD] = arguments.to
+        config_backend.write_config(config)
+
+
+def parse_month(value: str) -> datetime.date:
+    """Parses months in the format of the month data file names, like 01-2020."""
+    try:
+        return datetime.datetime.strptime(value, "%m-%Y").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid month {value}, expected MM-YYYY")
+
+
+def repair(paths: dict, arguments):
+    data_backend = create_data_backend(paths)
+    data_repository = CodeTimeDataRepository(
+        data_backend=data_backend, journal=Journal(paths["data_directory"].joinpath(JOURNAL_FILE_NAME)),
+        session_store=SessionStore(paths["data_directory"].joinpath(SESSIONS_DIRECTORY_NAME)))
+
+    if arguments.month is not None:
+        months = [arguments.month]
+    else:
+        months = [month for month in data_backend.get_existing_month_dates()
+                  if data_backend.is_month_data_corrupt(month)]
+
+    for month in months:
+        data_repository.repair_month_data(month)
+        print(f"Repaired month data of {month.month:02d}-{month.year}")
+
+
+def parse_date(value: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value}, expected YYYY-MM-DD")
+
+
+def export(paths: dict, arguments):
+    rows = iter_export_rows(create_data_backend(paths), start=arguments.start, end=arguments.end,
+                            activities=arguments.activities,
+                            journal=Journal(paths["data_directory"].joinpath(JOURNAL_FILE_NAME)))
+    write_rows = EXPORT_FORMATS[arguments.format]
+
+    if arguments.output == "-":
+        write_rows(rows, sys.stdout)
+    else:
+        with open(arguments.output, "w", newline="") as file:
+            write_rows(rows, file)
+
+
+def import_sources(paths: dict, arguments):
+    data_backend = create_data_backend(paths)
+    data_repository = CodeTimeDataRepository(
+        data_backend=data_backend, journal=Journal(paths["data_directory"].joinpath(JOURNAL_FILE_NAME)))
+    data_repository.replay_journal()
+    data_repository.compact_journal()
+
+    ledger = ImportLedger(paths["data_directory"].joinpath(IMPORTS_FILE_NAME))
+    for source in arguments.sources:
+        result = import_tracking_data(data_backend, ledger, source, name=arguments.name)
+        if result.skipped:
+            print(f"Skipped {source}, it has already been imported")
+        else:
+            print(f"Imported {source} into {result.imported_months} months")
+
+
+def export_day_images(paths: dict, arguments):
+    data_repository = CodeTimeDataRepository(
+        data_backend=create_data_backend(paths), journal=Journal(paths["data_directory"].joinpath(JOURNAL_FILE_NAME)))
+    data_repository.replay_journal()
+
+    days = get_days_to_export(data_repository, arguments.start, arguments.end)
+    export_images(paths, data_repository, days, arguments.output, processes=arguments.processes,
+                  progress=lambda done, total: print(f"Exported {done}/{total} images", end="\r"))
+    print(f"Exported {len(days)} images to {arguments.output}")
+
+
+def create_argument_parser():
+    parser = argparse.ArgumentParser(prog="code-time", description="Headless code-time commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser("convert",
+                                           help="convert the month data to another storage format and use it")
+    convert_parser.add_argument("--from", dest="source", choices=list(STORAGE_BACKENDS.keys()),
+                                help="storage format to convert from, defaults to the configured one")
+    convert_parser.add_argument("--to", choices=list(STORAGE_BACKENDS.keys()), required=True)
+    convert_parser.set_defaults(handler=convert)
+
+    repair_parser = subparsers.add_parser("repair", help="rebuild corrupt month data from its backup, the journal "
+                                                         "and the stored sessions")
+    repair_parser.add_argument("--month", type=parse_month,
+                               help="month to rebuild as MM-YYYY, defaults to every month with a corrupt data file")
+    repair_parser.set_defaults(handler=repair)
+
+    export_parser = subparsers.add_parser("export", help="export the tracked time of every day and activity")
+    export_parser.add_argument("--format", choices=list(EXPORT_FORMATS.keys()), default="csv")
+    export_parser.add_argument("--output", default="-", help="file to write to, defaults to stdout")
+    export_parser.add_argument("--from", dest="start", type=parse_date, help="first day to export as YYYY-MM-DD")
+    export_parser.add_argument("--to", dest="end", type=parse_date, help="last day to export as YYYY-MM-DD")
+    export_parser.add_argument("--activity", dest="activities", action="append",
+                               help="activity to export, supports the patterns of the activities setting and can be "
+                                    "repeated, defaults to every activity")
+    export_parser.set_defaults(handler=export)
+
+    import_parser = subparsers.add_parser("import", help="add the tracked time of other data directories or exports, "
+                                                         "sources which have been imported before are not counted "
+                                                         "twice")
+    import_parser.add_argument("sources", nargs="+", type=Path, help="data directory, .csv or .ndjson export")
+    import_parser.add_argument("--name", help="name identifying the source in later imports, defaults to its path")
+    import_parser.set_defaults(handler=import_sources)
+
+    images_parser = subparsers.add_parser("images", help="render the image of every day with data to a directory")
+    images_parser.add_argument("--output", type=Path, required=True, help="directory to write the images to")
+    images_parser.add_argument("--from", dest="start", type=parse_date, help="first day to export as YYYY-MM-DD")
+    images_parser.add_argument("--to", dest="end", type=parse_date, help="last day to export as YYYY-MM-DD")
+    images_parser.add_argument("--processes", type=int, help="number of rendering processes, defaults to the number "
+                                                             "of CPUs")
+    images_parser.set_defaults(handler=export_day_images)
+
+    return parser
+
+
+if __name__ == "__main__":
+    # worker processes of the image export must not start the app again in frozen builds
+    multiprocessing.freeze_support()
+    args = create_argument_parser().parse_args()
+    args.handler(get_paths(Path(__file__)), args)
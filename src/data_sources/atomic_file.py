@@ -0,0 +1,68 @@
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+TEMP_FILE_SUFFIX = ".tmp"
+BACKUP_FILE_SUFFIX = ".bak"
+
+
+@contextmanager
+def atomic_write(file_path: Path, mode="w"):
+    """
+    Opens a temporary file next to file_path for writing, which replaces file_path once the block completed. The
+    temporary file is being synced to disk before the rename and the directory after it, so readers either see the
+    old or the new content, never a partially written file, even after a power loss.
+    """
+    temp_path = Path(f"{file_path}{TEMP_FILE_SUFFIX}")
+    try:
+        with open(temp_path, mode) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, file_path)
+        sync_directory(Path(file_path).parent)
+    finally:
+        if temp_path.exists():
+            os.remove(temp_path)
+
+
+def sync_directory(directory: Path):
+    """Syncs a directory to disk, which persists renames of its entries. Not supported on Windows."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def get_backup_path(file_path: Path) -> Path:
+    return Path(f"{file_path}{BACKUP_FILE_SUFFIX}")
+
+
+def keep_backup(file_path: Path):
+    """
+    Keeps the current content of file_path as backup generation before it gets replaced. The backup is being
+    created as hard link if possible, which does not copy any data as atomic_write replaces file_path by a new file.
+    """
+    backup_path = get_backup_path(file_path)
+    temp_path = Path(f"{backup_path}{TEMP_FILE_SUFFIX}")
+    if temp_path.exists():
+        os.remove(temp_path)
+
+    try:
+        os.link(file_path, temp_path)
+    except OSError:
+        shutil.copyfile(file_path, temp_path)
+
+    os.replace(temp_path, backup_path)
+
+
+def remove_with_backup(file_path: Path):
+    for path in (Path(file_path), get_backup_path(file_path)):
+        if path.exists():
+            os.remove(path)
@@ -0,0 +1,165 @@
+import datetime
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from src.data_sources.atomic_file import atomic_write
+from src.data_sources.data_backend import DataBackend, convert_month_data
+from src.data_sources.errors import InvalidMonthDataFileError
+
+COLUMNAR_MONTH_DATA_FILE_NAME_PATTERN = re.compile(r"^\d{2}-\d{4}\.ctm$")
+
+MAGIC = b"CTM1"
+HEADER = struct.Struct("<4sIII")
+NAME_LENGTH = struct.Struct("<H")
+DAY_OFFSETS_COUNT = 33
+
+UINT32_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+
+
+class ColumnarDataBackend(DataBackend):
+    """
+    Stores month data in a binary columnar format instead of JSON.
+
+    Layout of a month data file, all numbers are little endian:
+        header        magic "CTM1", activity count, row count and size of the activity names block (4 x 4 bytes)
+        day offsets   33 uint32 row indices, the rows of day d are in [offsets[d], offsets[d + 1])
+        names         for every activity id its utf-8 encoded name prefixed by its length as uint16
+        columns       day, activity id and milliseconds as uint32 columns of row count length each
+
+    Rows are sorted by day, which allows reading a single day without decoding the whole month.
+    """
+    DATA_FILE_EXTENSION = ".ctm"
+    DATA_FILE_NAME_PATTERN = COLUMNAR_MONTH_DATA_FILE_NAME_PATTERN
+
+    def read_month_data_file(self, file_path: Path) -> dict:
+        with open(file_path, "rb") as file:
+            names, row_count, offsets = self.read_header(file)
+            days = self.read_column(file, row_count)
+            activity_ids = self.read_column(file, row_count)
+            times = self.read_column(file, row_count)
+
+        month_data = {}
+        try:
+            for day, activity_id, time in zip(days, activity_ids, times):
+                if day not in month_data:
+                    month_data[day] = {}
+
+                month_data[day][names[activity_id]] = time
+        except IndexError:
+            raise InvalidMonthDataFileError()
+
+        return month_data
+
+    def read_day_data(self, date: datetime.date) -> dict:
+        """
+        Reads the data of a single day by only decoding its rows.
+        :param date: date of desired day
+        :return: dict of activity names and their time, empty if there is no data for that day
+        """
+        file_path = self.get_data_file_path(date)
+        if not file_path.exists():
+            return {}
+
+        with open(file_path, "rb") as file:
+            names, row_count, offsets = self.read_header(file)
+            columns_start = file.tell()
+
+            first_row = offsets[date.day]
+            day_row_count = offsets[date.day + 1] - first_row
+
+            file.seek(columns_start + (row_count + first_row) * 4)
+            activity_ids = self.read_column(file, day_row_count)
+
+            file.seek(columns_start + (2 * row_count + first_row) * 4)
+            times = self.read_column(file, day_row_count)
+
+        return {names[activity_id]: time for activity_id, time in zip(activity_ids, times)}
+
+    def write_month_data_file(self, file_path: Path, data: dict):
+        activity_ids = {}
+        days = array(UINT32_TYPECODE)
+        ids = array(UINT32_TYPECODE)
+        times = array(UINT32_TYPECODE)
+        offsets = array(UINT32_TYPECODE, [0] * DAY_OFFSETS_COUNT)
+
+        for day in sorted(data.keys(), key=int):
+            for name, time in data[day].items():
+                if name not in activity_ids:
+                    activity_ids[name] = len(activity_ids)
+
+                days.append(int(day))
+                ids.append(activity_ids[name])
+                times.append(time)
+
+            offsets[int(day) + 1:] = array(UINT32_TYPECODE, [len(days)] * (DAY_OFFSETS_COUNT - int(day) - 1))
+
+        names = b"".join(NAME_LENGTH.pack(len(encoded)) + encoded
+                         for encoded in (name.encode("utf-8") for name in activity_ids.keys()))
+
+        with atomic_write(file_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, len(activity_ids), len(days), len(names)))
+            self.write_column(file, offsets)
+            file.write(names)
+            for column in (days, ids, times):
+                self.write_column(file, column)
+
+    def read_header(self, file):
+        """
+        Reads header, day offsets and activity names and leaves the file positioned at the start of the columns.
+        :return: activity names indexed by activity id, row count and day offsets
+        """
+        header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise InvalidMonthDataFileError()
+
+        magic, name_count, row_count, names_size = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise InvalidMonthDataFileError()
+
+        offsets = self.read_column(file, DAY_OFFSETS_COUNT)
+        names_block = file.read(names_size)
+
+        names = []
+        position = 0
+        try:
+            for _ in range(name_count):
+                length, = NAME_LENGTH.unpack_from(names_block, position)
+                position += NAME_LENGTH.size
+                names.append(names_block[position:position + length].decode("utf-8"))
+                position += length
+        except (struct.error, UnicodeDecodeError):
+            raise InvalidMonthDataFileError()
+
+        return names, row_count, offsets
+
+    @staticmethod
+    def read_column(file, length) -> array:
+        column = array(UINT32_TYPECODE)
+        try:
+            column.fromfile(file, length)
+        except (EOFError, ValueError):
+            raise InvalidMonthDataFileError()
+
+        if sys.byteorder == "big":
+            column.byteswap()
+
+        return column
+
+    @staticmethod
+    def write_column(file, column: array):
+        if sys.byteorder == "big":
+            column = array(UINT32_TYPECODE, column)
+            column.byteswap()
+
+        column.tofile(file)
+
+
+def convert_json_to_columnar(paths: dict):
+    convert_month_data(DataBackend(paths), ColumnarDataBackend(paths))
+
+
+def convert_columnar_to_json(paths: dict):
+    convert_month_data(ColumnarDataBackend(paths), DataBackend(paths))
@@ -1,27 +1,39 @@
 import datetime
 import json
 import os
+import re
 from os import listdir
 from pathlib import Path
 
+from src.data_sources.atomic_file import atomic_write, keep_backup, get_backup_path, remove_with_backup
+from src.data_sources.days_index import DaysIndex, DAYS_INDEX_FILE_NAME
 from src.data_sources.errors import MonthDataFileNotFoundError, EmptyMonthDataError, ConfigFileNotFoundError, \
-    EmptyConfigError, InvalidMonthDataFileNameError
+    EmptyConfigError, InvalidMonthDataFileNameError, InvalidMonthDataFileError, CorruptMonthDataError, \
+    CorruptConfigError, InvalidStorageBackendError
+from src.data_sources.rollups import Rollups, ROLLUPS_FILE_NAME
 
 DATA_FILES_PATH_KEYWORD = "data_directory"
 CONFIG_FILE_PATH_KEYWORD = "config"
 RES_DIRECTORY_KEYWORD = "res_directory"
 
+MONTH_DATA_FILE_NAME_PATTERN = re.compile(r"^\d{2}-\d{4}\.json$")
+
 
 class DataBackend:
+    DATA_FILE_EXTENSION = ".json"
+    DATA_FILE_NAME_PATTERN = MONTH_DATA_FILE_NAME_PATTERN
+
     def __init__(self, paths: dict):
         self.paths = paths
+        self.days_index = None
+        self.rollups = None
 
     def get_data_file_path(self, date: datetime.date) -> Path:
         month_str = str(date.month)
         if date.month < 10:
             month_str = f"0{month_str}"
 
-        return self.paths[DATA_FILES_PATH_KEYWORD].joinpath(Path(f"{month_str}-{date.year}.json"))
+        return self.paths[DATA_FILES_PATH_KEYWORD].joinpath(Path(f"{month_str}-{date.year}{self.DATA_FILE_EXTENSION}"))
 
     def read_month_data(self, date: datetime.date) -> dict:
         """
@@ -32,11 +44,28 @@ class DataBackend:
                 "IntelliJ": 2000
             }
         }
+        If the month data file is corrupt, the backup generation kept by write_month_data is being read instead.
         :param date: date of desired month
         :return: dict of month data
         """
         file_path = self.get_data_file_path(date)
-        if file_path.exists():
+        backup_path = get_backup_path(file_path)
+
+        for path in (file_path, backup_path):
+            if path.exists():
+                try:
+                    return self.read_month_data_file(path)
+                except InvalidMonthDataFileError:
+                    continue
+
+        if file_path.exists() or backup_path.exists():
+            raise CorruptMonthDataError(
+                message=f"Month data of {date.month}-{date.year} and its backup are corrupt, run the repair command")
+
+        return {}
+
+    def read_month_data_file(self, file_path: Path) -> dict:
+        try:
             with open(file_path, "r") as file:
                 content = json.loads(file.read())
                 formatted_month_data = {}
@@ -45,8 +74,37 @@ class DataBackend:
                     formatted_month_data[int(k)] = v
 
                 return formatted_month_data
-        else:
-            return {}
+        except (ValueError, TypeError, AttributeError):
+            raise InvalidMonthDataFileError()
+
+    def is_month_data_file_valid(self, file_path: Path) -> bool:
+        try:
+            self.read_month_data_file(file_path)
+            return True
+        except (InvalidMonthDataFileError, OSError):
+            return False
+
+    def get_month_data_stamp(self, date: datetime.date):
+        """
+        :return: stamp which changes whenever the month data of date is being changed on disk, None if there is no
+        month data file
+        """
+        if DATA_FILES_PATH_KEYWORD not in self.paths:
+            return None
+
+        return get_file_stamp(self.get_data_file_path(date))
+
+    def get_config_stamp(self):
+        """:return: stamp which changes whenever the config file is being changed, None if there is no config file"""
+        if CONFIG_FILE_PATH_KEYWORD not in self.paths:
+            return None
+
+        return get_file_stamp(self.paths[CONFIG_FILE_PATH_KEYWORD])
+
+    def is_month_data_corrupt(self, date: datetime.date) -> bool:
+        """:return: whether the month data file exists but can not be read, regardless of its backup"""
+        file_path = self.get_data_file_path(date)
+        return file_path.exists() and not self.is_month_data_file_valid(file_path)
 
     def write_month_data(self, data: dict, date: datetime):
         if not bool(data):
@@ -56,23 +114,99 @@ class DataBackend:
             os.mkdir(self.paths[DATA_FILES_PATH_KEYWORD])
 
         file_path = self.get_data_file_path(date)
-        with open(file_path, "w") as file:
+        if self.is_month_data_file_valid(file_path):
+            keep_backup(file_path)
+
+        self.write_month_data_file(file_path, data)
+        self.get_days_index().update_month(date, data.keys())
+        self.get_rollups().update_month(date, data)
+
+    def write_month_data_file(self, file_path: Path, data: dict):
+        with atomic_write(file_path) as file:
             file.write(json.dumps(data))
 
+    def remove_month_data(self, date: datetime.date):
+        remove_with_backup(self.get_data_file_path(date))
+        self.get_days_index().remove_month(date)
+        self.get_rollups().remove_month(date)
+
     def read_config(self):
-        try:
-            with open(self.paths[CONFIG_FILE_PATH_KEYWORD], "r") as file:
-                return json.load(file)
-        except FileNotFoundError:
+        """Reads the config, falls back to the backup generation if the config file is corrupt."""
+        file_path = Path(self.paths[CONFIG_FILE_PATH_KEYWORD])
+        if not file_path.exists() and not get_backup_path(file_path).exists():
             raise ConfigFileNotFoundError
 
+        for path in (file_path, get_backup_path(file_path)):
+            try:
+                with open(path, "r") as file:
+                    config = json.load(file)
+
+                if type(config) is dict:
+                    return config
+            except (FileNotFoundError, ValueError):
+                continue
+
+        raise CorruptConfigError()
+
     def write_config(self, config):
         if type(config) is not dict or not bool(config):
             raise EmptyConfigError()
 
-        with open(self.paths[CONFIG_FILE_PATH_KEYWORD], "w") as file:
+        file_path = Path(self.paths[CONFIG_FILE_PATH_KEYWORD])
+        try:
+            with open(file_path, "r") as file:
+                if type(json.load(file)) is dict:
+                    keep_backup(file_path)
+        except (FileNotFoundError, ValueError):
+            pass
+
+        with atomic_write(self.paths[CONFIG_FILE_PATH_KEYWORD]) as file:
             file.write(json.dumps(config))
 
+    def get_days_index(self) -> DaysIndex:
+        if self.days_index is None:
+            self.days_index = DaysIndex(self.paths[DATA_FILES_PATH_KEYWORD].joinpath(DAYS_INDEX_FILE_NAME))
+
+        return self.days_index
+
+    def get_rollups(self) -> Rollups:
+        if self.rollups is None:
+            self.rollups = Rollups(self.paths[DATA_FILES_PATH_KEYWORD].joinpath(ROLLUPS_FILE_NAME))
+
+        return self.rollups
+
+    def get_month_rollup(self, date: datetime.date) -> dict:
+        """
+        Activity totals of the weeks overlapping a month, see Rollups. The rollups are being rebuilt from the month
+        data files if they are missing.
+        :param date: date within the desired month
+        :return: dict of week starts as iso format and their activity totals within the month
+        """
+        rollups = self.get_rollups()
+        if not rollups.is_available():
+            if not os.path.exists(self.paths[DATA_FILES_PATH_KEYWORD]):
+                return {}
+
+            self.rebuild_rollups()
+
+        return rollups.get_month_rollup(date)
+
+    def rebuild_rollups(self):
+        self.get_rollups().rebuild({date: self.read_month_data(date) for date in self.get_existing_month_dates()})
+
+    def rebuild_indexes(self):
+        """Rebuilds days index and rollups from the month data files."""
+        if not os.path.exists(self.paths[DATA_FILES_PATH_KEYWORD]):
+            return
+
+        self.get_days_index().rebuild(self.scan_days_with_data())
+        self.rebuild_rollups()
+
+    def get_existing_month_dates(self) -> list:
+        """:return: first days of every month with a month data file"""
+        return [datetime.date(year, month, 1) for year in self.get_existing_years()
+                for month in self.get_existing_months(datetime.date(year, 1, 1))]
+
     def get_days_with_data(self):
         """
         return format example:
@@ -81,8 +215,22 @@ class DataBackend:
                 1: [1,2,3]
             }
         }
+        The days are being read from the days index, which is being rebuilt from the month data files if it is
+        missing.
         :return: list of days with tracking data
         """
+        days_index = self.get_days_index()
+        if not days_index.is_available():
+            days_with_data = self.scan_days_with_data()
+            if os.path.exists(self.paths[DATA_FILES_PATH_KEYWORD]):
+                days_index.rebuild(days_with_data)
+
+            return days_with_data
+
+        return days_index.get_days_with_data()
+
+    def scan_days_with_data(self):
+        """Reads the days with data from every month data file, used for rebuilding the days index."""
         result = {}
         years = self.get_existing_years()
 
@@ -102,7 +250,7 @@ class DataBackend:
         if not os.path.exists(self.paths[DATA_FILES_PATH_KEYWORD]):
             return []
 
-        files = listdir(self.paths[DATA_FILES_PATH_KEYWORD])
+        files = self.get_month_data_file_names()
         years = []
 
         for file in files:
@@ -116,7 +264,7 @@ class DataBackend:
     def get_existing_months(self, year: datetime) -> list:
         months = []
 
-        files = listdir(self.paths[DATA_FILES_PATH_KEYWORD])
+        files = self.get_month_data_file_names()
         for file in files:
             if self.parse_year_from_data_file_name(file) == year.year:
                 months.append(int(file[:file.index("-")]))
@@ -124,6 +272,11 @@ class DataBackend:
         months.sort()
         return months
 
+    def get_month_data_file_names(self) -> list:
+        """Names of all month data files, other files in the data directory like the journal are being ignored."""
+        return [file for file in listdir(self.paths[DATA_FILES_PATH_KEYWORD])
+                if self.DATA_FILE_NAME_PATTERN.match(file)]
+
     def get_res_file_path(self, relative_path):
         return self.paths["res_directory"].joinpath(relative_path)
 
@@ -134,6 +287,40 @@ class DataBackend:
     def parse_year_from_data_file_name(name) -> int:
         """File name example: 12-2020.json"""
         try:
-            return int(name[name.index("-") + 1:name.index(".json")])
+            return int(name[name.index("-") + 1:name.index(".")])
         except Exception:
             raise InvalidMonthDataFileNameError()
+
+
+def get_file_stamp(file_path: Path):
+    """:return: modification time and size of a file, None if it does not exist"""
+    try:
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return None
+
+
+def convert_month_data(source: DataBackend, target: DataBackend):
+    """
+    Converts the month data of the source backend into the storage format of the target backend. The month data of
+    the source is only being removed after the converted month has been read back and compared to the original.
+    Converting a backend onto itself is rejected, as removing the source month would remove the converted one.
+    """
+    if type(source) is type(target) and Path(source.paths[DATA_FILES_PATH_KEYWORD]).resolve() == \
+            Path(target.paths[DATA_FILES_PATH_KEYWORD]).resolve():
+        raise InvalidStorageBackendError(message="Can not convert the month data into its own storage format")
+
+    for year in source.get_existing_years():
+        for month in source.get_existing_months(datetime.date(year, 1, 1)):
+            date = datetime.date(year, month, 1)
+            month_data = source.read_month_data(date)
+
+            target.write_month_data(month_data, date)
+            if target.read_month_data(date) != month_data:
+                raise InvalidMonthDataFileError(message=f"Could not convert month data of {month}-{year}")
+
+            source.remove_month_data(date)
+
+    # source and target may share days index and rollups if they store their month data in the same directory
+    target.rebuild_indexes()
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+
+from src.data_sources.columnar_data_backend import ColumnarDataBackend, COLUMNAR_MONTH_DATA_FILE_NAME_PATTERN
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD
+from src.data_sources.errors import InvalidStorageBackendError
+from src.data_sources.sqlite_data_backend import SqliteDataBackend, DATABASE_FILE_NAME
+
+STORAGE_BACKEND_KEYWORD = "storage_backend"
+DEFAULT_STORAGE_BACKEND = "json"
+
+STORAGE_BACKENDS = {
+    "json": DataBackend,
+    "columnar": ColumnarDataBackend,
+    "sqlite": SqliteDataBackend
+}
+
+
+def create_data_backend(paths: dict, storage_backend: str = None) -> DataBackend:
+    """
+    :param paths: paths passed to the data backend
+    :param storage_backend: name of the storage backend, read from the config if not set
+    :return: data backend for the storage backend
+    """
+    if storage_backend is None:
+        storage_backend = get_configured_storage_backend(paths)
+
+    if storage_backend not in STORAGE_BACKENDS:
+        raise InvalidStorageBackendError(message=f"Invalid storage backend {storage_backend}")
+
+    return STORAGE_BACKENDS[storage_backend](paths)
+
+
+def get_configured_storage_backend(paths: dict) -> str:
+    config_backend = DataBackend(paths)
+    if not config_backend.does_config_file_exist():
+        return DEFAULT_STORAGE_BACKEND
+
+    return config_backend.read_config().get(STORAGE_BACKEND_KEYWORD, DEFAULT_STORAGE_BACKEND)
+
+
+def detect_storage_backend(data_directory: Path) -> str:
+    """:return: name of the storage backend whose files are in data_directory, used for data of other machines"""
+    data_directory = Path(data_directory)
+    if data_directory.joinpath(DATABASE_FILE_NAME).exists():
+        return "sqlite"
+
+    if any(COLUMNAR_MONTH_DATA_FILE_NAME_PATTERN.match(name) for name in os.listdir(data_directory)):
+        return "columnar"
+
+    return DEFAULT_STORAGE_BACKEND
+
+
+def open_data_directory(data_directory: Path) -> DataBackend:
+    """:return: data backend reading the month data of another data directory in its storage format"""
+    return STORAGE_BACKENDS[detect_storage_backend(data_directory)]({DATA_FILES_PATH_KEYWORD: Path(data_directory)})
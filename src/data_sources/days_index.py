@@ -0,0 +1,111 @@
+import datetime
+import json
+from pathlib import Path
+
+from src.data_sources.atomic_file import atomic_write
+
+DAYS_INDEX_FILE_NAME = "days_index.json"
+
+
+class DaysIndex:
+
+    def __init__(self, file_path: Path):
+        """
+        Index of days with tracking data, stored as one bitmap per month where bit n is set if day n has data.
+
+        example format of the index file:
+        {
+            "2020": {
+                "1": 14
+            }
+        }
+        """
+        self.file_path = Path(file_path)
+        self.bitmaps = None
+
+    def is_available(self):
+        if self.bitmaps is None:
+            self.load()
+
+        return self.bitmaps is not None and self.file_path.exists()
+
+    def load(self):
+        if not self.file_path.exists():
+            self.bitmaps = None
+            return
+
+        try:
+            with open(self.file_path, "r") as file:
+                content = json.load(file)
+
+            self.bitmaps = {int(year): {int(month): int(bitmap) for month, bitmap in months.items()}
+                            for year, months in content.items()}
+        except (ValueError, TypeError, AttributeError):
+            self.bitmaps = None
+
+    def save(self):
+        with atomic_write(self.file_path) as file:
+            file.write(json.dumps(self.bitmaps))
+
+    def rebuild(self, days_with_data: dict):
+        """
+        :param days_with_data: days with data in the format returned by DataBackend.get_days_with_data
+        """
+        self.bitmaps = {}
+        for year, months in days_with_data.items():
+            for month, days in months.items():
+                self.set_month_bitmap(year, month, self.days_to_bitmap(days))
+
+        self.save()
+
+    def update_month(self, date: datetime.date, days):
+        """
+        Updates the days of a single month, the index file is only being rewritten if a day has been added. A missing
+        index is not being updated as it is going to be rebuilt on its next use.
+        """
+        if not self.is_available():
+            return
+
+        bitmap = self.days_to_bitmap(days)
+        if self.bitmaps.get(date.year, {}).get(date.month) != bitmap:
+            self.set_month_bitmap(date.year, date.month, bitmap)
+            self.save()
+
+    def remove_month(self, date: datetime.date):
+        if not self.is_available() or date.month not in self.bitmaps.get(date.year, {}):
+            return
+
+        del self.bitmaps[date.year][date.month]
+        if not self.bitmaps[date.year]:
+            del self.bitmaps[date.year]
+
+        self.save()
+
+    def set_month_bitmap(self, year, month, bitmap):
+        if year not in self.bitmaps:
+            self.bitmaps[year] = {}
+
+        self.bitmaps[year][month] = bitmap
+
+    def get_days_with_data(self):
+        if not self.is_available():
+            return {}
+
+        result = {}
+        for year in sorted(self.bitmaps.keys()):
+            months = self.bitmaps[year]
+            result[year] = {month: self.bitmap_to_days(months[month]) for month in sorted(months.keys())}
+
+        return result
+
+    @staticmethod
+    def days_to_bitmap(days) -> int:
+        bitmap = 0
+        for day in days:
+            bitmap |= 1 << int(day)
+
+        return bitmap
+
+    @staticmethod
+    def bitmap_to_days(bitmap: int) -> list:
+        return [day for day in range(1, 32) if bitmap & (1 << day)]
@@ -66,3 +66,52 @@ class DataNotAvailableError(CodeTimeError):
     def __init__(self, message="No data available for the requested day"):
         """Raised when a specific month data is not available."""
         super(DataNotAvailableError, self).__init__(message)
+
+
+class InvalidMonthDataFileError(CodeTimeError):
+
+    def __init__(self, message="Month data file is invalid"):
+        """Raised when the content of a month data file can not be decoded."""
+        super(InvalidMonthDataFileError, self).__init__(message)
+
+
+class InvalidStorageBackendError(CodeTimeError):
+
+    def __init__(self, message="Invalid storage backend"):
+        """Raised when the config contains an unknown storage backend."""
+        super(InvalidStorageBackendError, self).__init__(message)
+
+
+class CorruptMonthDataError(InvalidMonthDataFileError):
+
+    def __init__(self, message="Month data file and its backup are corrupt, run the repair command"):
+        """Raised when neither a month data file nor its backup generation can be read."""
+        super(CorruptMonthDataError, self).__init__(message)
+
+
+class CorruptConfigError(CodeTimeError):
+
+    def __init__(self, message="Config file and its backup are corrupt"):
+        """Raised when neither the config file nor its backup generation can be read."""
+        super(CorruptConfigError, self).__init__(message)
+
+
+class InvalidGranularityError(CodeTimeError):
+
+    def __init__(self, message="Invalid granularity, expected day, week, month or year"):
+        """Raised when range statistics are being requested with an unknown granularity."""
+        super(InvalidGranularityError, self).__init__(message)
+
+
+class AnalyticsNotAvailableError(CodeTimeError):
+
+    def __init__(self, message="The analytics engine requires NumPy, install it with pip install numpy"):
+        """Raised when creating the analytics engine without NumPy being installed."""
+        super(AnalyticsNotAvailableError, self).__init__(message)
+
+
+class InvalidImportSourceError(CodeTimeError):
+
+    def __init__(self, message="Invalid import source, expected a data directory or an export"):
+        """Raised when importing a source which is neither a data directory nor a readable export."""
+        super(InvalidImportSourceError, self).__init__(message)
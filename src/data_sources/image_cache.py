@@ -0,0 +1,125 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from src.data_sources.atomic_file import TEMP_FILE_SUFFIX
+
+IMAGE_CACHE_DIRECTORY_NAME = "image_cache"
+IMAGE_FILE_SUFFIX = ".png"
+
+MAX_MEMORY_BYTES = 32 * 1024 * 1024
+MAX_DISK_BYTES = 128 * 1024 * 1024
+
+
+class ImageCache:
+
+    def __init__(self, directory: Path = None, max_memory_bytes=MAX_MEMORY_BYTES, max_disk_bytes=MAX_DISK_BYTES):
+        """
+        Cache of rendered PNG images keyed by a hash of everything an image depends on, see
+        BaseImageCreator.get_image_key. Images are being kept in memory and, if directory is set, on disk, so they
+        survive restarts. Both levels evict least recently used images once they exceed their size limit. Entries
+        are never stale, as changed statistics or settings produce a different key.
+        :param directory: directory of the cached files, images are only kept in memory if not set
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self.images = OrderedDict()
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_file_path(self, key: str) -> Path:
+        return self.directory.joinpath(f"{key}{IMAGE_FILE_SUFFIX}")
+
+    def get(self, key: str):
+        """:return: PNG bytes of key, None if the image is not cached"""
+        with self.lock:
+            if key in self.images:
+                self.images.move_to_end(key)
+                self.hits += 1
+                return self.images[key]
+
+            png = self.read_file(key)
+            if png is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.put_in_memory(key, png)
+            return png
+
+    def put(self, key: str, png: bytes):
+        with self.lock:
+            self.put_in_memory(key, png)
+            self.write_file(key, png)
+
+    def put_in_memory(self, key: str, png: bytes):
+        if key in self.images:
+            self.memory_bytes -= len(self.images.pop(key))
+
+        self.images[key] = png
+        self.memory_bytes += len(png)
+        while self.memory_bytes > self.max_memory_bytes and len(self.images) > 1:
+            self.memory_bytes -= len(self.images.popitem(last=False)[1])
+
+    def read_file(self, key: str):
+        if self.directory is None:
+            return None
+
+        file_path = self.get_file_path(key)
+        try:
+            with open(file_path, "rb") as file:
+                png = file.read()
+        except FileNotFoundError:
+            return None
+
+        # the modification time orders files by their last use for eviction
+        os.utime(file_path)
+        return png
+
+    def write_file(self, key: str, png: bytes):
+        """Writes the image through a temporary file, without syncing as a lost image is rendered again."""
+        if self.directory is None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_path = self.get_file_path(key)
+        temp_path = Path(f"{file_path}{TEMP_FILE_SUFFIX}")
+        with open(temp_path, "wb") as file:
+            file.write(png)
+
+        os.replace(temp_path, file_path)
+        self.evict_files(keep=file_path)
+
+    def evict_files(self, keep: Path = None):
+        """Removes least recently used files until the files of the directory fit into max_disk_bytes."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(IMAGE_FILE_SUFFIX) and entry.path != str(keep):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        disk_bytes = sum(size for _, size, _ in entries) + (os.path.getsize(keep) if keep is not None else 0)
+        for _, size, path in sorted(entries):
+            if disk_bytes <= self.max_disk_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            disk_bytes -= size
+
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+            self.memory_bytes = 0
+            if self.directory is not None and self.directory.exists():
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(IMAGE_FILE_SUFFIX):
+                        os.remove(entry.path)
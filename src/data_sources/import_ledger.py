@@ -0,0 +1,128 @@
+import datetime
+import hashlib
+import json
+from pathlib import Path
+
+from src.data_sources.atomic_file import atomic_write
+
+IMPORTS_FILE_NAME = "imports.json"
+IMPORTED_MONTHS_DIRECTORY_NAME = "imports"
+
+
+class ImportLedger:
+
+    def __init__(self, file_path: Path):
+        """
+        Remembers the month data which has been imported from every source, which makes importing a source again
+        only add what changed since the last import.
+
+        The month data of every source is kept in a file per month in the imports directory next to the ledger file,
+        named by the sha256 of the source name, so recording a month only writes that month and the ledger file:
+        imports/<sha256 of the source name>/2020-01.json
+        {
+            "hash": "<sha256 of the month data>",
+            "data": {"1": {"PyCharm": 1000}}
+        }
+
+        example format of the ledger file:
+        {
+            "hashes": {
+                "<sha256 of the whole source>": "workstation"
+            },
+            "pending": {
+                "name": "workstation",
+                "month": "2020-02-01",
+                "hash": "<sha256 of the month data>",
+                "data": {"3": {"Terminal": 300}},
+                "previous_hash": "<sha256 of the local month data before the import>"
+            }
+        }
+
+        pending is the month which is being written right now, it is recorded before the month data file is written,
+        so an interrupted import can find out whether the write happened, see ImportLedger.record_pending.
+        """
+        self.file_path = Path(file_path)
+        self.months_directory = self.file_path.parent.joinpath(IMPORTED_MONTHS_DIRECTORY_NAME)
+        self.hashes = None
+        self.pending = None
+
+    def load(self):
+        if self.hashes is not None:
+            return
+
+        self.hashes = {}
+        self.pending = None
+        if self.file_path.exists():
+            with open(self.file_path, "r") as file:
+                content = json.load(file)
+
+            self.hashes = content["hashes"]
+            self.pending = content.get("pending")
+            if self.pending is not None:
+                self.pending["data"] = to_month_data(self.pending["data"])
+
+    def save(self):
+        with atomic_write(self.file_path) as file:
+            file.write(json.dumps({"hashes": self.hashes, "pending": self.pending}))
+
+    def get_month_file_path(self, name: str, month_key: str) -> Path:
+        source_directory = hashlib.sha256(name.encode("utf-8")).hexdigest()
+        return self.months_directory.joinpath(source_directory, f"{month_key}.json")
+
+    def get_source_with_hash(self, source_hash: str):
+        """:return: name of the source which has been imported with source_hash, None if there is none"""
+        self.load()
+        return self.hashes.get(source_hash)
+
+    def get_imported_month(self, name: str, month_key: str):
+        """:return: dict containing hash and data of the last import of a month of a source, None if there is none"""
+        file_path = self.get_month_file_path(name, month_key)
+        if not file_path.exists():
+            return None
+
+        with open(file_path, "r") as file:
+            entry = json.load(file)
+
+        return {"hash": entry["hash"], "data": to_month_data(entry["data"])}
+
+    def record_month(self, name: str, month_key: str, month_hash: str, month_data: dict):
+        """Records the import of a month and clears the pending month."""
+        self.load()
+        file_path = self.get_month_file_path(name, month_key)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(file_path) as file:
+            file.write(json.dumps({"hash": month_hash, "data": month_data}))
+
+        if self.pending is not None:
+            self.pending = None
+            self.save()
+
+    def record_pending(self, name: str, month: datetime.date, month_hash: str, month_data: dict, previous_hash: str):
+        """
+        Records the month which is about to be written, before writing it.
+        :param previous_hash: hash of the local month data before the write, if the local month data still has this
+        hash after an interruption, the write did not happen
+        """
+        self.load()
+        self.pending = {"name": name, "month": month.isoformat(), "hash": month_hash, "data": month_data,
+                        "previous_hash": previous_hash}
+        self.save()
+
+    def get_pending(self):
+        """:return: dict of the month recorded by record_pending and not by record_month yet, None if there is none"""
+        self.load()
+        return self.pending
+
+    def discard_pending(self):
+        self.load()
+        self.pending = None
+        self.save()
+
+    def record_source(self, name: str, source_hash: str):
+        self.load()
+        self.hashes[source_hash] = name
+        self.save()
+
+
+def to_month_data(content: dict) -> dict:
+    return {int(day): activities for day, activities in content.items()}
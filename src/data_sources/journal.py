@@ -0,0 +1,89 @@
+import datetime
+import json
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+JOURNAL_FILE_NAME = "journal.log"
+
+JournalRecord = namedtuple("JournalRecord", ["start", "name", "time", "day_total"])
+
+
+class Journal:
+
+    def __init__(self, file_path: Path):
+        """
+        Append-only log of tracked time which is being folded into the month data files by compaction.
+
+        Every record stores the tracked time together with the resulting day total of the activity. Replaying a
+        record therefore sets the day total instead of adding to it, which makes replaying records that have already
+        been compacted into a month data file harmless.
+
+        Appended records are being buffered in memory until flush is called, which writes all of them at once.
+        """
+        self.file_path = Path(file_path)
+        self.lock = threading.Lock()
+        self.pending_lines = []
+
+    def append(self, start: datetime.datetime, name: str, time: int, day_total: int):
+        line = json.dumps([start.isoformat(), name, time, day_total]) + "\n"
+
+        with self.lock:
+            self.pending_lines.append(line)
+
+    def get_pending_count(self) -> int:
+        """:return: number of appended records which have not been flushed yet"""
+        return len(self.pending_lines)
+
+    def flush(self):
+        """Writes the buffered records with a single write and syncs the journal file to disk."""
+        with self.lock:
+            if not self.pending_lines:
+                return
+
+            if not os.path.exists(self.file_path.parent):
+                os.mkdir(self.file_path.parent)
+
+            with open(self.file_path, "a") as file:
+                file.write("".join(self.pending_lines))
+                file.flush()
+                os.fsync(file.fileno())
+
+            self.pending_lines = []
+
+    def read_records(self):
+        """
+        Yields every record of the journal in the order it has been appended, including records which have not been
+        flushed yet. A line which can not be parsed, like one that got cut off by a crash, is being skipped.
+        :return: generator of JournalRecord
+        """
+        with self.lock:
+            lines = []
+            if self.file_path.exists():
+                with open(self.file_path, "r") as file:
+                    lines = file.readlines()
+
+            lines += self.pending_lines
+
+        for line in lines:
+            try:
+                start, name, time, day_total = json.loads(line)
+                yield JournalRecord(datetime.datetime.fromisoformat(start), name, time, day_total)
+            except (ValueError, TypeError):
+                continue
+
+    def truncate(self):
+        """Removes every record, including the ones which have not been flushed yet."""
+        with self.lock:
+            self.pending_lines = []
+            if self.file_path.exists():
+                with open(self.file_path, "w") as file:
+                    file.flush()
+                    os.fsync(file.fileno())
+
+    def is_empty(self):
+        if self.pending_lines:
+            return False
+
+        return not self.file_path.exists() or os.path.getsize(self.file_path) == 0
@@ -0,0 +1,130 @@
+import datetime
+import json
+from pathlib import Path
+
+from src.data_sources.atomic_file import atomic_write
+
+ROLLUPS_FILE_NAME = "rollups.json"
+
+GRANULARITIES = ["day", "week", "month", "year"]
+
+
+class Rollups:
+
+    def __init__(self, file_path: Path):
+        """
+        Precomputed activity totals of every month, split into the weeks overlapping the month. Weeks start on monday
+        and are identified by the date of their monday. Month and year totals are the sums of at most 6 respectively
+        72 week partials, a week crossing a month boundary is the sum of the partials of both months.
+
+        example format of the rollups file:
+        {
+            "2020-01": {
+                "2019-12-30": {
+                    "PyCharm": 1000
+                },
+                "2020-01-06": {
+                    "PyCharm": 2000
+                }
+            }
+        }
+        """
+        self.file_path = Path(file_path)
+        self.months = None
+
+    def is_available(self):
+        if self.months is None:
+            self.load()
+
+        return self.months is not None and self.file_path.exists()
+
+    def load(self):
+        if not self.file_path.exists():
+            self.months = None
+            return
+
+        try:
+            with open(self.file_path, "r") as file:
+                content = json.load(file)
+
+            self.months = {month: {week: {name: int(time) for name, time in activities.items()}
+                                   for week, activities in weeks.items()}
+                           for month, weeks in content.items()}
+        except (ValueError, TypeError, AttributeError):
+            self.months = None
+
+    def save(self):
+        with atomic_write(self.file_path) as file:
+            file.write(json.dumps(self.months))
+
+    def rebuild(self, month_data_by_month: dict):
+        """
+        :param month_data_by_month: dict of first days of months and their month data
+        """
+        self.months = {get_month_key(date): compute_month_rollup(date, month_data)
+                       for date, month_data in month_data_by_month.items()}
+        self.save()
+
+    def update_month(self, date: datetime.date, month_data: dict):
+        """
+        Recomputes the rollup of a single month, the rollups file is only being rewritten if it changed. Missing
+        rollups are not being updated as they are going to be rebuilt on their next use.
+        """
+        if not self.is_available():
+            return
+
+        rollup = compute_month_rollup(date, month_data)
+        if self.months.get(get_month_key(date)) != rollup:
+            self.months[get_month_key(date)] = rollup
+            self.save()
+
+    def remove_month(self, date: datetime.date):
+        if not self.is_available() or get_month_key(date) not in self.months:
+            return
+
+        del self.months[get_month_key(date)]
+        self.save()
+
+    def get_month_rollup(self, date: datetime.date) -> dict:
+        """:return: dict of week starts and their activity totals within the month of date"""
+        if not self.is_available():
+            return {}
+
+        return self.months.get(get_month_key(date), {})
+
+
+def get_month_key(date: datetime.date) -> str:
+    return f"{date.year}-{date.month:02d}"
+
+
+def get_week_start(date: datetime.date) -> datetime.date:
+    return date - datetime.timedelta(days=date.weekday())
+
+
+def get_period_start(date: datetime.date, granularity: str) -> datetime.date:
+    """:return: first day of the day, week, month or year containing date"""
+    if granularity == "week":
+        return get_week_start(date)
+    elif granularity == "month":
+        return date.replace(day=1)
+    elif granularity == "year":
+        return date.replace(month=1, day=1)
+    else:
+        return date
+
+
+def compute_month_rollup(date: datetime.date, month_data: dict) -> dict:
+    """
+    :param date: date within the month
+    :param month_data: month data in the format of DataBackend.read_month_data
+    :return: dict of week starts as iso format and their activity totals within the month
+    """
+    rollup = {}
+    for day, activities in month_data.items():
+        week = get_week_start(datetime.date(date.year, date.month, int(day))).isoformat()
+        week_rollup = rollup.setdefault(week, {})
+
+        for name, time in activities.items():
+            week_rollup[name] = week_rollup.get(name, 0) + time
+
+    return rollup
@@ -0,0 +1,183 @@
+import datetime
+import json
+import os
+import struct
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from src.data_sources.atomic_file import atomic_write
+
+SESSIONS_DIRECTORY_NAME = "sessions"
+ACTIVITIES_FILE_NAME = "activities.json"
+
+# start as epoch seconds (uint32), duration in milliseconds (uint32) and activity id (uint16): 10 bytes per session
+SESSION_RECORD = struct.Struct("<IIH")
+MAX_DURATION = 2 ** 32 - 1
+
+Session = namedtuple("Session", ["start", "duration", "name"])
+
+
+class SessionStore:
+
+    def __init__(self, directory: Path):
+        """
+        Stores every tracked focus interval as packed record of SESSION_RECORD.size bytes in one file per month of
+        its start. Activity names are being stored once in a separate file and referenced by id. At 500 focus changes
+        a day a year of sessions takes about 1.8 MB.
+
+        Appended sessions are being buffered in memory until flush is called.
+        """
+        self.directory = Path(directory)
+        self.lock = threading.Lock()
+        self.pending_records = {}
+        self.activity_names = None
+        self.activity_ids = None
+        self.cached_month_totals = {}
+
+    def get_month_file_path(self, date: datetime.date) -> Path:
+        return self.directory.joinpath(f"{date.month:02d}-{date.year}.sessions")
+
+    def load_activities(self):
+        if self.activity_names is not None:
+            return
+
+        file_path = self.directory.joinpath(ACTIVITIES_FILE_NAME)
+        if file_path.exists():
+            with open(file_path, "r") as file:
+                self.activity_names = json.load(file)
+        else:
+            self.activity_names = []
+
+        self.activity_ids = {name: i for i, name in enumerate(self.activity_names)}
+
+    def get_activity_id(self, name: str) -> int:
+        self.load_activities()
+        if name not in self.activity_ids:
+            self.activity_ids[name] = len(self.activity_names)
+            self.activity_names.append(name)
+
+            with atomic_write(self.directory.joinpath(ACTIVITIES_FILE_NAME)) as file:
+                file.write(json.dumps(self.activity_names))
+
+        return self.activity_ids[name]
+
+    def append(self, start: datetime.datetime, duration: int, name: str):
+        """
+        :param start: start of the focus interval
+        :param duration: duration in milliseconds, empty intervals are not being stored
+        :param name: name of the focused activity
+        """
+        if duration <= 0:
+            return
+
+        with self.lock:
+            if not os.path.exists(self.directory):
+                os.makedirs(self.directory)
+
+            record = SESSION_RECORD.pack(int(start.timestamp()), min(duration, MAX_DURATION),
+                                         self.get_activity_id(name))
+            self.pending_records.setdefault(self.get_month_file_path(start.date()), bytearray()).extend(record)
+
+    def flush(self):
+        """Appends the buffered sessions to their month files."""
+        with self.lock:
+            for file_path, records in self.pending_records.items():
+                with open(file_path, "ab") as file:
+                    # a record cut off by a crash would shift every record appended after it
+                    file.truncate(file.tell() - file.tell() % SESSION_RECORD.size)
+                    file.write(records)
+                    file.flush()
+                    os.fsync(file.fileno())
+
+            self.pending_records = {}
+
+    def get_month_size(self, file_path: Path) -> int:
+        """:return: size of a month file including the sessions which have not been flushed yet"""
+        size = os.path.getsize(file_path) if file_path.exists() else 0
+        return size + len(self.pending_records.get(file_path, b""))
+
+    def read_month_sessions(self, date: datetime.date) -> list:
+        """
+        :param date: date of desired month
+        :return: sessions which started in the month, ordered by the time they have been stored
+        """
+        file_path = self.get_month_file_path(date)
+
+        with self.lock:
+            content = b""
+            if file_path.exists():
+                with open(file_path, "rb") as file:
+                    content = file.read()
+
+            if not content and file_path not in self.pending_records:
+                return []
+
+            self.load_activities()
+            content = content[:len(content) - len(content) % SESSION_RECORD.size]
+            content += self.pending_records.get(file_path, b"")
+
+        return [Session(datetime.datetime.fromtimestamp(start), duration, self.activity_names[activity_id])
+                for start, duration, activity_id in SESSION_RECORD.iter_unpack(content)]
+
+    def read_sessions(self, start: datetime.datetime, end: datetime.datetime):
+        """
+        Yields every session overlapping the window between start and end. Sessions are being stored in the month of
+        their start, so the month before start is being read as well.
+        """
+        month = (start.replace(day=1) - datetime.timedelta(days=1)).date().replace(day=1)
+        while month <= end.date():
+            for session in self.read_month_sessions(month):
+                session_end = session.start + datetime.timedelta(milliseconds=session.duration)
+                if session.start < end and session_end > start:
+                    yield session
+
+            month = (month + datetime.timedelta(days=32)).replace(day=1)
+
+    def get_month_totals(self, date: datetime.date) -> dict:
+        """
+        Per day totals derived from the sessions of a month, in the format of DataBackend.read_month_data. Sessions
+        reaching into the next day are being split at midnight. As session files are append only, the result is
+        being cached until the size of the month file or of the file of the month before changes.
+        """
+        month_start = datetime.datetime(date.year, date.month, 1)
+        month_end = (month_start + datetime.timedelta(days=32)).replace(day=1)
+        previous_month = (month_start - datetime.timedelta(days=1)).date()
+
+        sizes = tuple(self.get_month_size(path)
+                      for path in (self.get_month_file_path(previous_month), self.get_month_file_path(date)))
+        cache_key = (date.year, date.month)
+
+        if cache_key in self.cached_month_totals and self.cached_month_totals[cache_key][0] == sizes:
+            return self.cached_month_totals[cache_key][1]
+
+        totals = {}
+        for session in self.read_sessions(month_start, month_end):
+            for day_start, duration in split_at_midnight(session.start, session.duration):
+                if not month_start <= day_start < month_end:
+                    continue
+
+                day = totals.setdefault(day_start.day, {})
+                day[session.name] = day.get(session.name, 0) + duration
+
+        self.cached_month_totals[cache_key] = (sizes, totals)
+        return totals
+
+
+def split_interval(start: datetime.datetime, duration: int, step: datetime.timedelta):
+    """
+    Yields (start, duration) pieces of an interval which each lie within a single step, steps are being counted from
+    midnight.
+    """
+    end = start + datetime.timedelta(milliseconds=duration)
+    while start < end:
+        midnight = datetime.datetime.combine(start.date(), datetime.time())
+        next_boundary = midnight + ((start - midnight) // step + 1) * step
+        piece_end = min(end, next_boundary)
+        yield start, round((piece_end - start) / datetime.timedelta(milliseconds=1))
+        start = piece_end
+
+
+def split_at_midnight(start: datetime.datetime, duration: int):
+    """Yields (start, duration) pieces of an interval which each lie within a single day."""
+    return split_interval(start, duration, datetime.timedelta(days=1))
@@ -0,0 +1,133 @@
+import calendar
+import datetime
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD, get_file_stamp
+from src.data_sources.errors import EmptyMonthDataError
+from src.data_sources.rollups import compute_month_rollup
+
+DATABASE_FILE_NAME = "code-time.sqlite3"
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS activity_time ("
+    "date TEXT NOT NULL, activity TEXT NOT NULL, ms INTEGER NOT NULL, PRIMARY KEY (date, activity))",
+    "CREATE INDEX IF NOT EXISTS activity_time_activity ON activity_time (activity, date)"
+]
+
+
+class SqliteDataBackend(DataBackend):
+    """
+    Stores month data in a single SQLite table of (date, activity, ms) rows. The primary key doubles as index on date,
+    a second index on activity serves range queries for single activities. The config is still being stored as JSON.
+    """
+
+    def get_database_path(self) -> Path:
+        return Path(self.paths[DATA_FILES_PATH_KEYWORD]).joinpath(DATABASE_FILE_NAME)
+
+    def connect(self):
+        """Opens a new connection, connections are not being shared between threads."""
+        if not os.path.exists(self.paths[DATA_FILES_PATH_KEYWORD]):
+            os.mkdir(self.paths[DATA_FILES_PATH_KEYWORD])
+
+        connection = sqlite3.connect(self.get_database_path())
+        for statement in SCHEMA:
+            connection.execute(statement)
+
+        return connection
+
+    def query(self, sql, parameters=()):
+        if not self.get_database_path().exists():
+            return []
+
+        with closing(self.connect()) as connection:
+            return connection.execute(sql, parameters).fetchall()
+
+    @staticmethod
+    def get_month_range(date: datetime.date):
+        last_day = calendar.monthrange(date.year, date.month)[1]
+        return datetime.date(date.year, date.month, 1).isoformat(), datetime.date(date.year, date.month,
+                                                                                   last_day).isoformat()
+
+    def read_month_data(self, date: datetime.date) -> dict:
+        month_data = {}
+        rows = self.query("SELECT date, activity, ms FROM activity_time WHERE date BETWEEN ? AND ? ORDER BY date",
+                          self.get_month_range(date))
+
+        for day, activity, ms in rows:
+            day = int(day[8:10])
+            if day not in month_data:
+                month_data[day] = {}
+
+            month_data[day][activity] = ms
+
+        return month_data
+
+    def write_month_data(self, data: dict, date: datetime):
+        if not bool(data):
+            raise EmptyMonthDataError()
+
+        rows = [(datetime.date(date.year, date.month, int(day)).isoformat(), activity, ms)
+                for day, activities in data.items() for activity, ms in activities.items()]
+
+        with closing(self.connect()) as connection, connection:
+            connection.execute("DELETE FROM activity_time WHERE date BETWEEN ? AND ?", self.get_month_range(date))
+            connection.executemany("INSERT INTO activity_time (date, activity, ms) VALUES (?, ?, ?)", rows)
+
+    def get_month_data_stamp(self, date: datetime.date):
+        """Changes whenever the database is being written, no matter which month has been changed."""
+        return get_file_stamp(self.get_database_path())
+
+    def remove_month_data(self, date: datetime.date):
+        if self.get_database_path().exists():
+            with closing(self.connect()) as connection, connection:
+                connection.execute("DELETE FROM activity_time WHERE date BETWEEN ? AND ?",
+                                   self.get_month_range(date))
+
+    def get_days_with_data(self):
+        result = {}
+        for date, in self.query("SELECT DISTINCT date FROM activity_time ORDER BY date"):
+            date = datetime.date.fromisoformat(date)
+            if date.year not in result:
+                result[date.year] = {}
+
+            if date.month not in result[date.year]:
+                result[date.year][date.month] = []
+
+            result[date.year][date.month].append(date.day)
+
+        return result
+
+    def get_month_rollup(self, date: datetime.date) -> dict:
+        """Computed from the month data, as reading a month only reads its rows of the date index."""
+        return compute_month_rollup(date, self.read_month_data(date))
+
+    def rebuild_indexes(self):
+        pass
+
+    def get_existing_years(self) -> list:
+        rows = self.query("SELECT DISTINCT substr(date, 1, 4) FROM activity_time ORDER BY 1")
+        return [int(year) for year, in rows]
+
+    def get_existing_months(self, year: datetime) -> list:
+        rows = self.query("SELECT DISTINCT substr(date, 6, 2) FROM activity_time WHERE date BETWEEN ? AND ? "
+                          "ORDER BY 1", (f"{year.year}-01-01", f"{year.year}-12-31"))
+        return [int(month) for month, in rows]
+
+    def get_activity_time(self, activity: str, start: datetime.date, end: datetime.date) -> int:
+        """
+        :return: tracked milliseconds of an activity between start and end, both inclusive
+        """
+        rows = self.query("SELECT COALESCE(SUM(ms), 0) FROM activity_time WHERE activity = ? AND date BETWEEN ? AND ?",
+                          (activity, start.isoformat(), end.isoformat()))
+        return rows[0][0] if rows else 0
+
+    def get_time_per_activity(self, start: datetime.date, end: datetime.date) -> dict:
+        """
+        :return: dict of activity names and their tracked milliseconds between start and end, both inclusive
+        """
+        rows = self.query("SELECT activity, SUM(ms) FROM activity_time WHERE date BETWEEN ? AND ? GROUP BY activity",
+                          (start.isoformat(), end.isoformat()))
+        return dict(rows)
@@ -1,42 +1,65 @@
+import atexit
+import multiprocessing
+import signal
 import sys
 from pathlib import Path
 
-from src.data_sources.data_backend import DataBackend
+from src.data_sources.data_backend_factory import create_data_backend
+from src.data_sources.image_cache import ImageCache, IMAGE_CACHE_DIRECTORY_NAME
+from src.data_sources.journal import Journal, JOURNAL_FILE_NAME
+from src.data_sources.session_store import SessionStore, SESSIONS_DIRECTORY_NAME
+from src.paths import get_paths
 from src.presentation.tray_handler import TrayHandler
 from src.repositories.code_time_data_repository import CodeTimeDataRepository
 from src.repositories.focus_activity_provider import MacFocusActivityProvider
 from src.use_cases.activity_tracker import ActivityTracker
 from src.use_cases.autostart import AutostartManager
 from src.use_cases.image_creator.basic_image_creator import BasicImageCreator
+from src.use_cases.persistence_worker import PersistenceWorker
+from src.use_cases.runtime import ConfigWatcher, Runtime
 
 if __name__ == "__main__":
+    # worker processes of the image export must not start the app again in frozen builds
+    multiprocessing.freeze_support()
     if getattr(sys, 'frozen', False):
         main_file = Path(sys.executable).resolve()
-        paths = {
-            "data_directory": main_file.parent.joinpath(Path("data")).resolve(),
-            "config": main_file.parent.joinpath(Path("config.json")).resolve(),
-            "res_directory": main_file.parent.joinpath(Path("res")).resolve()
-        }
     else:
         main_file = Path(__file__)
-        paths = {
-            "data_directory": main_file.parent.parent.joinpath(Path("data/")).resolve(),
-            "config": main_file.parent.parent.joinpath(Path("config.json")).resolve(),
-            "res_directory": main_file.parent.parent.joinpath("res/").resolve()
-        }
-
-    data_backend = DataBackend(paths)
-    data_repository = CodeTimeDataRepository(data_backend=data_backend)
+
+    paths = get_paths(main_file)
+
+    data_backend = create_data_backend(paths)
+    journal = Journal(paths["data_directory"].joinpath(JOURNAL_FILE_NAME))
+    session_store = SessionStore(paths["data_directory"].joinpath(SESSIONS_DIRECTORY_NAME))
+    data_repository = CodeTimeDataRepository(data_backend=data_backend, journal=journal, session_store=session_store)
     data_repository.create_default_config_if_config_is_missing()
 
+    data_repository.replay_journal()
+    data_repository.compact_journal()
+
+    atexit.register(data_repository.flush)
+
     focus_activity_provider = MacFocusActivityProvider()
 
-    image_creator = BasicImageCreator(data_repository)
+    image_creator = BasicImageCreator(
+        data_repository, image_cache=ImageCache(paths["data_directory"].joinpath(IMAGE_CACHE_DIRECTORY_NAME)))
     activity_tracker = ActivityTracker(data_repository=data_repository, focus_activity_provider=focus_activity_provider)
-    activity_tracker.start()
+    persistence_worker = PersistenceWorker(data_repository)
+    config_watcher = ConfigWatcher(data_repository)
+    config_watcher.add_listener(activity_tracker.on_config_changed)
 
     autostart = AutostartManager(str(main_file))
     tray_handler = TrayHandler(image_creator=image_creator, activity_tracker=activity_tracker,
                                data_repository=data_repository, activity_provider=focus_activity_provider,
-                               autostart=autostart)
+                               autostart=autostart, paths=paths)
+
+    runtime = Runtime([activity_tracker.run_async, config_watcher.run_async, persistence_worker.run_async],
+                      on_failed=tray_handler.on_background_failed)
+    runtime.start()
+
+    # quitting the tray stops the runtime below, which writes the last tracked interval before the final flush
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: tray_handler.on_terminate())
     tray_handler.start()
+
+    runtime.stop()
+    runtime.join()
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+
+def get_paths(main_file: Path) -> dict:
+    """
+    Paths of the data directory, config and resources, either next to the executable when running as frozen
+    application or in the project root otherwise.
+    :param main_file: file of the entry point, located in the src directory when not frozen
+    """
+    if getattr(sys, 'frozen', False):
+        base_directory = Path(sys.executable).resolve().parent
+    else:
+        base_directory = Path(main_file).resolve().parent.parent
+
+    return {
+        "data_directory": base_directory.joinpath(Path("data/")).resolve(),
+        "config": base_directory.joinpath(Path("config.json")).resolve(),
+        "res_directory": base_directory.joinpath(Path("res/")).resolve()
+    }
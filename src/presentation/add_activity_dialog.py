@@ -1,7 +1,5 @@
-import time
-from threading import Thread
-
 from PyQt5 import QtGui
+from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QListWidget, QPushButton
 
 from src.repositories.code_time_data_repository import CodeTimeDataRepository
@@ -25,7 +23,8 @@ class AddActivityDialog(QDialog):
         self.list_widget = QListWidget()
         self.list_widget.selectionModel().selectionChanged.connect(self.on_selection_changed)
 
-        self.list_manager = AddActivityListManager(self.list_widget, activity_provider, data_repository)
+        self.list_manager = AddActivityListManager(activity_provider, data_repository)
+        self.list_manager.activity_found.connect(self.list_widget.addItem)
         self.list_manager.start()
 
         self.add_button = QPushButton("ADD SELECTED ACTIVITY")
@@ -51,20 +50,26 @@ class AddActivityDialog(QDialog):
 
     def closeEvent(self, a0: QtGui.QCloseEvent) -> None:
         self.list_manager.stop()
+        self.list_manager.wait()
+
 
+class AddActivityListManager(QThread):
+    # emitted with the name of every newly focused activity which is not being tracked yet
+    activity_found = pyqtSignal(str)
 
-class AddActivityListManager(Thread):
-    def __init__(self, list_widget: QListWidget, activity_provider: FocusActivityProvider,
-                 data_repository: CodeTimeDataRepository):
+    def __init__(self, activity_provider: FocusActivityProvider, data_repository: CodeTimeDataRepository):
+        """
+        Polls the focused activity off the GUI thread. Found activities are passed on by the activity_found signal,
+        which Qt delivers on the GUI thread, as widgets must only be changed from there.
+        """
         super().__init__()
 
         self.data_repository = data_repository
         self.activity_provider = activity_provider
-        self.list_widget = list_widget
         self.running = True
 
     def is_activity_not_being_tracked(self, activity):
-        return activity not in self.data_repository.get_setting("activities")
+        return not self.data_repository.is_activity_tracked(activity, self.activity_provider.get_bundle_id)
 
     def stop(self):
         self.running = False
@@ -75,7 +80,7 @@ class AddActivityListManager(Thread):
             current_activity = self.activity_provider.get_activity_name()
             if last_activity != current_activity and self.is_activity_not_being_tracked(
                     current_activity) and current_activity:
-                self.list_widget.addItem(current_activity)
+                self.activity_found.emit(current_activity)
                 last_activity = current_activity
 
-            time.sleep(0.25)
+            self.msleep(250)
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.data_sources.errors import CodeTimeError
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.batch_image_exporter import export_images
+
+
+class ImageExportWorker(QThread):
+    # number of exported and number of all images
+    progress = pyqtSignal(int, int)
+    # title and description of the error
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, paths: dict, data_repository: CodeTimeDataRepository, days: list, directory: Path):
+        """
+        Runs export_images off the GUI thread, so the tray stays responsive without re-entering the event loop. The
+        signals are delivered on the GUI thread, finished is emitted by QThread after success and failure.
+        """
+        super().__init__()
+
+        self.paths = paths
+        self.data_repository = data_repository
+        self.days = days
+        self.directory = directory
+
+    def run(self) -> None:
+        try:
+            export_images(self.paths, self.data_repository, self.days, self.directory,
+                          progress=lambda done, total: self.progress.emit(done, total))
+        except CodeTimeError as e:
+            self.failed.emit("An error occurred", str(e))
+        except Exception as e:
+            # OSError of a worker or BrokenProcessPool, an exception escaping run would abort the process
+            self.failed.emit("Could not export images", repr(e))
@@ -0,0 +1,89 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.data_sources.errors import CodeTimeError, DataNotAvailableError
+
+
+class RenderSignals(QObject):
+    # PNG bytes of the rendered image
+    finished = pyqtSignal(bytes)
+    # title and description of the error
+    failed = pyqtSignal(str, str)
+
+
+class RenderTask(QRunnable):
+
+    def __init__(self, render):
+        """
+        Runs render on a thread of the render pool and delivers its result with the signals, which are being
+        received on the GUI thread as the signals object lives there.
+        :param render: function returning PNG bytes, errors it raises are delivered with the failed signal
+        """
+        super().__init__()
+        # the worker keeps owning the task, so cancelling it after Qt ran it does not touch a deleted object
+        self.setAutoDelete(False)
+        self.render = render
+        self.signals = RenderSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevents the task from starting, a render which already started is finished but not delivered."""
+        self.cancelled = True
+
+    def run(self):
+        if self.cancelled:
+            return
+
+        try:
+            png = self.render()
+        except DataNotAvailableError as e:
+            self.emit_failed("Data not found", str(e))
+            return
+        except CodeTimeError as e:
+            self.emit_failed("An error occurred", str(e))
+            return
+        except OSError as e:
+            self.emit_failed("Could not write the image", str(e))
+            return
+        except Exception as e:
+            # an exception escaping QRunnable.run aborts the whole process
+            self.emit_failed("An error occurred", repr(e))
+            return
+
+        if not self.cancelled:
+            self.signals.finished.emit(png)
+
+    def emit_failed(self, title: str, description: str):
+        if not self.cancelled:
+            self.signals.failed.emit(title, description)
+
+
+class RenderWorker:
+
+    def __init__(self):
+        """
+        Renders images off the GUI thread, so the tray menu and dialogs stay responsive while PIL draws. Renders run
+        one after another on a single thread, as image creators share loaded fonts which must not be used by two
+        threads at once.
+        """
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+
+    def submit(self, render, on_finished, on_failed) -> RenderTask:
+        """
+        :param render: function returning PNG bytes
+        :param on_finished: called with the PNG bytes on the GUI thread
+        :param on_failed: called with title and description of the error on the GUI thread
+        :return: task which can be cancelled
+        """
+        task = RenderTask(render)
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(on_failed)
+        self.pool.start(task)
+        return task
+
+    def cancel(self, task: RenderTask):
+        task.cancel()
+        self.pool.tryTake(task)
+
+    def wait(self):
+        self.pool.waitForDone()
@@ -1,40 +1,63 @@
 import datetime
 from pathlib import Path
 
-from PIL.ImageQt import ImageQt
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtWidgets import QAction, QApplication, QSystemTrayIcon, QMenu, QFileDialog, QMessageBox, QDialog, QLabel, \
-    QPushButton, QVBoxLayout
+    QPushButton, QVBoxLayout, QProgressDialog
 
 from src.data_sources.errors import CodeTimeError, DataNotAvailableError
+from src.presentation.image_export_worker import ImageExportWorker
+from src.presentation.render_worker import RenderWorker
 from src.presentation.settings.settings_dialog import SettingsDialog
 from src.repositories.code_time_data_repository import CodeTimeDataRepository
 from src.repositories.focus_activity_provider import FocusActivityProvider
 from src.use_cases.activity_tracker import ActivityTracker
 from src.use_cases.autostart import AutostartManager
+from src.use_cases.batch_image_exporter import get_days_to_export
 from src.use_cases.image_creator.basic_image_creator import BasicImageCreator
 
 TEXT_PAUSE = "Pause tracking"
 TEXT_CONTINUE = "Continue tracking"
+PREVIEW_SCALE = 0.5
+PREVIEW_PLACEHOLDER_WIDTH = 540
+PREVIEW_PLACEHOLDER_HEIGHT = 960
+# milliseconds between returns to the interpreter, which runs python signal handlers only then
+SIGNAL_CHECK_INTERVAL = 500
+
+
+class TraySignals(QObject):
+    # description of the failed background task, may be emitted from any thread
+    background_failed = pyqtSignal(str)
 
 
 class TrayHandler:
 
     def __init__(self, image_creator: BasicImageCreator, activity_tracker: ActivityTracker,
                  data_repository: CodeTimeDataRepository, activity_provider: FocusActivityProvider,
-                 autostart: AutostartManager):
+                 autostart: AutostartManager, paths: dict):
         super().__init__()
+        self.paths = paths
         self.autostart = autostart
         self.activity_provider = activity_provider
         self.image_creator = image_creator
         self.activity_tracker = activity_tracker
         self.data_repository = data_repository
 
+        self.menu_entries = {}
+
         self.action_pause_continue = QAction(TEXT_PAUSE)
         self.action_quit = QAction("Quit")
 
         self.app = QApplication([])
         self.app.setQuitOnLastWindowClosed(False)
+        self.render_worker = RenderWorker()
+        self.signals = TraySignals()
+        self.signals.background_failed.connect(self._on_background_failed)
+        self.signal_timer = QTimer()
+        self.quit_requested = False
+        self.action_export_images = None
+        self.export_worker = None
 
     def start(self):
         icon = QIcon(self.data_repository.get_res_file_path("clock.svg"))
@@ -50,12 +73,17 @@ class TrayHandler:
 
         menu.addAction(self.action_pause_continue)
         self.add_statistics_to_menu(menu)
+        self.setup_export_images(menu)
 
         self.setup_settings(menu)
         menu.addAction(self.action_quit)
 
         tray.setContextMenu(menu)
-        self.app.exec_()
+
+        self.signal_timer.timeout.connect(lambda: None)
+        self.signal_timer.start(SIGNAL_CHECK_INTERVAL)
+        if not self.quit_requested:
+            self.app.exec_()
 
     def setup_settings(self, menu):
         menu.addAction("Settings").triggered.connect(self.on_settings)
@@ -64,6 +92,29 @@ class TrayHandler:
         dialog = SettingsDialog(self.activity_provider, self.data_repository, self.autostart)
         dialog.exec_()
 
+    def setup_export_images(self, menu):
+        self.action_export_images = menu.addAction("Export images")
+        self.action_export_images.triggered.connect(self.on_export_images)
+
+    def on_export_images(self):
+        directory = QFileDialog.getExistingDirectory(QFileDialog(), "Export images", str(Path.home()))
+        if directory == "":
+            return
+
+        days = get_days_to_export(self.data_repository)
+        progress_dialog = QProgressDialog("Exporting images", None, 0, len(days))
+        progress_dialog.setWindowTitle("code-time")
+        progress_dialog.setMinimumDuration(0)
+
+        self.export_worker = ImageExportWorker(self.paths, self.data_repository, days, Path(directory))
+        self.export_worker.progress.connect(lambda done, total: progress_dialog.setValue(done))
+        self.export_worker.failed.connect(lambda title, description: self.show_error_message(title, description))
+        self.export_worker.finished.connect(progress_dialog.close)
+        self.export_worker.finished.connect(lambda: self.action_export_images.setEnabled(True))
+
+        self.action_export_images.setEnabled(False)
+        self.export_worker.start()
+
     def save_statistic_as_png(self, date):
         recommended_path = str(Path.home().joinpath(f"code-time_{date.day}{date.month}{date.year}.png"))
         result = QFileDialog.getSaveFileName(QFileDialog(), "Save statistic", recommended_path, "Image (*.png)"),
@@ -71,49 +122,112 @@ class TrayHandler:
         selected_path = result[0][0]
         if selected_path != "":
             statistics = self.data_repository.get_statistics(date)
-            self.image_creator.create_image(statistics).save(selected_path)
+
+            def render_to_file():
+                png = self.image_creator.create_png(statistics)
+                with open(selected_path, "wb") as file:
+                    file.write(png)
+
+                return png
+
+            self.render_worker.submit(render_to_file, lambda png: None,
+                                      lambda title, description: self.show_error_message(title, description))
 
     def add_days_statistics_to_menu(self, menu, date: datetime.date):
-        days = self.data_repository.get_days_with_data()[date.year][date.month]
-        for day in days:
-            day_action = menu.addAction(str(day))
-            day_date = date.replace(day=day)
-            self.add_statistic_actions_to_menu(day_action, day_date)
+        days = self.data_repository.get_days_with_data().get(date.year, {}).get(date.month, [])
+
+        def create_day_action(day):
+            day_action = QAction(str(day), menu)
+            self.add_statistic_actions_to_menu(day_action, date.replace(day=day))
+            return day_action
+
+        self.sync_menu(menu, days, create_day_action)
 
     def add_months_statistics_to_menu(self, menu, date: datetime.date):
-        months = self.data_repository.get_months_with_data()[date.year]
-        for month in months:
-            month_str = datetime.date(2000, month, 1).strftime('%B')
-            current_month_menu = menu.addMenu(month_str)
+        months = self.data_repository.get_months_with_data().get(date.year, [])
 
+        def create_month_menu(month):
+            month_menu = QMenu(datetime.date(2000, month, 1).strftime('%B'), menu)
             month_date = date.replace(month=month)
-            self.add_days_statistics_to_menu(current_month_menu, month_date)
+            self.fill_lazily(month_menu, lambda: self.add_days_statistics_to_menu(month_menu, month_date))
+            return month_menu.menuAction()
+
+        self.sync_menu(menu, months, create_month_menu)
 
     def add_years_statistics_to_menu(self, menu):
         years = self.data_repository.get_years_with_data()
-        for year in years:
-            current_year_menu = menu.addMenu(str(year))
-            self.add_months_statistics_to_menu(current_year_menu, datetime.date(year, 1, 1))
+
+        def create_year_menu(year):
+            year_menu = QMenu(str(year), menu)
+            year_date = datetime.date(year, 1, 1)
+            self.fill_lazily(year_menu, lambda: self.add_months_statistics_to_menu(year_menu, year_date))
+            return year_menu.menuAction()
+
+        self.sync_menu(menu, years, create_year_menu)
 
     def add_statistics_to_menu(self, menu):
         statistics_menu = menu.addMenu("Statistics")
         today_action = statistics_menu.addAction("Today")
-
-        today = datetime.datetime.today()
-
-        try:
-            self.add_statistic_actions_to_menu(today_action, today)
-            self.add_years_statistics_to_menu(statistics_menu)
-        except CodeTimeError as ex:
-            self.show_error_message(description=str(ex))
+        today_action.triggered.connect(lambda: self.show_image_preview(datetime.date.today()))
+
+        self.fill_lazily(statistics_menu, lambda: self.add_years_statistics_to_menu(statistics_menu))
+
+    def fill_lazily(self, menu, fill):
+        """
+        Fills menu whenever it is about to be shown instead of building the whole statistics tree up front, so only
+        opened menus are being built and days tracked after the start show up.
+        """
+        def on_about_to_show():
+            try:
+                fill()
+            except CodeTimeError as ex:
+                self.show_error_message(description=str(ex))
+
+        menu.aboutToShow.connect(on_about_to_show)
+
+    def sync_menu(self, menu, keys, create_entry):
+        """
+        Adds an entry for every key which is not in menu yet, ordered by key. Entries which have been added before
+        are kept, so refreshing an opened menu only creates the entries of new keys.
+        :param create_entry: function creating the QAction of a key
+        """
+        entries = self.menu_entries.setdefault(menu, {})
+        for key in sorted(keys):
+            if key in entries:
+                continue
+
+            entry = create_entry(key)
+            following_keys = [existing_key for existing_key in entries.keys() if existing_key > key]
+            if following_keys:
+                menu.insertAction(entries[min(following_keys)], entry)
+            else:
+                menu.addAction(entry)
+
+            entries[key] = entry
 
     def add_statistic_actions_to_menu(self, action, date):
         action.triggered.connect(lambda: self.show_image_preview(date))
 
     def _on_quit(self):
+        self.render_worker.wait()
+        if self.export_worker is not None:
+            self.export_worker.wait()
         self.activity_tracker.on_quit()
         self.app.quit()
 
+    def on_terminate(self):
+        """Called by the SIGTERM handler on the main thread, quits like the quit action."""
+        self.quit_requested = True
+        self._on_quit()
+
+    def on_background_failed(self, error: Exception):
+        """Can be called from any thread, shows the error and quits, as time would not be tracked anymore."""
+        self.signals.background_failed.emit(repr(error))
+
+    def _on_background_failed(self, description):
+        self.show_error_message("Tracking stopped", description)
+        self._on_quit()
+
     def _on_pause_continue(self):
         if self.activity_tracker.on_pause_continue():
             self.action_pause_continue.setText(TEXT_CONTINUE)
@@ -133,13 +247,8 @@ class TrayHandler:
         message.exec_()
 
     def show_image_preview(self, date: datetime):
-        dialog = QDialog()
-        dialog.setWindowTitle("Statistics preview")
-
-        layout = QVBoxLayout()
-
         try:
-            image = self.image_creator.create_image(self.data_repository.get_statistics(date))
+            statistics = self.data_repository.get_statistics(date)
         except DataNotAvailableError as e:
             self.show_error_message(title="Data not found", description=str(e))
             return
@@ -147,11 +256,28 @@ class TrayHandler:
             self.show_error_message(description=str(e))
             return
 
-        image = image.resize((image.width // 2, image.height // 2))
-        image_view = QPixmap.fromImage(ImageQt(image))
+        dialog = QDialog()
+        dialog.setWindowTitle("Statistics preview")
+
+        layout = QVBoxLayout()
+
+        image_label = QLabel("Rendering statistics...")
+        image_label.setAlignment(Qt.AlignCenter)
+        image_label.setMinimumSize(PREVIEW_PLACEHOLDER_WIDTH, PREVIEW_PLACEHOLDER_HEIGHT)
+
+        def on_rendered(png):
+            image_view = QPixmap()
+            image_view.loadFromData(png, "PNG")
+            image_label.setPixmap(image_view)
+            image_label.setMinimumSize(image_view.size())
+
+        def on_failed(title, description):
+            dialog.reject()
+            self.show_error_message(title=title, description=description)
 
-        image_label = QLabel()
-        image_label.setPixmap(image_view)
+        task = self.render_worker.submit(lambda: self.image_creator.create_png(statistics, scale=PREVIEW_SCALE),
+                                         on_rendered, on_failed)
+        dialog.finished.connect(lambda result: self.render_worker.cancel(task))
 
         btn_export = QPushButton("EXPORT AS PNG")
         btn_export.clicked.connect(lambda: self.save_statistic_as_png(date))
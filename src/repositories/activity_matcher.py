@@ -0,0 +1,77 @@
+import re
+
+PREFIX_PATTERN = "prefix:"
+REGEX_PATTERN = "regex:"
+BUNDLE_PATTERN = "bundle:"
+
+MAX_CACHED_RESULTS = 4096
+
+
+class ActivityMatcher:
+
+    def __init__(self, activities: list):
+        """
+        Compiled form of the activities setting which decides whether an activity is being tracked.
+
+        Entries are being matched against activity names exactly, except for entries starting with one of the
+        following prefixes:
+            prefix:Visual Studio     activity names starting with "Visual Studio"
+            regex:Py(Charm|thon)     activity names fully matching the regular expression
+            bundle:com.apple.Safari  activities whose application has the bundle id "com.apple.Safari"
+
+        Exact names and bundle ids are being kept in frozensets, prefixes and regular expressions are being combined
+        into a single tuple respectively expression. Results are being memoized per activity name, so repeated
+        lookups take constant time no matter how many entries there are. Invalid regular expressions never match.
+        """
+        names = []
+        prefixes = []
+        expressions = []
+        bundle_ids = []
+        self.invalid_patterns = []
+
+        for activity in activities:
+            if activity.startswith(PREFIX_PATTERN):
+                prefixes.append(activity[len(PREFIX_PATTERN):])
+            elif activity.startswith(REGEX_PATTERN):
+                expression = activity[len(REGEX_PATTERN):]
+                try:
+                    re.compile(expression)
+                    expressions.append(f"(?:{expression})")
+                except re.error:
+                    self.invalid_patterns.append(activity)
+            elif activity.startswith(BUNDLE_PATTERN):
+                bundle_ids.append(activity[len(BUNDLE_PATTERN):])
+            else:
+                names.append(activity)
+
+        self.names = frozenset(names)
+        self.prefixes = tuple(prefixes)
+        self.expression = re.compile("|".join(expressions)) if expressions else None
+        self.bundle_ids = frozenset(bundle_ids)
+        self.results = {}
+
+    def matches(self, activity_name: str, get_bundle_id=None) -> bool:
+        """
+        :param activity_name: name of the activity
+        :param get_bundle_id: function returning the bundle id of an activity name, only called if there are bundle
+        entries and the name did not match otherwise
+        :return: whether the activity is being tracked
+        """
+        if activity_name in self.names:
+            return True
+
+        if activity_name in self.results:
+            return self.results[activity_name]
+
+        result = bool(self.prefixes) and activity_name.startswith(self.prefixes)
+        if not result and self.expression is not None:
+            result = self.expression.fullmatch(activity_name) is not None
+
+        if not result and self.bundle_ids and get_bundle_id is not None:
+            result = get_bundle_id(activity_name) in self.bundle_ids
+
+        if len(self.results) >= MAX_CACHED_RESULTS:
+            self.results.clear()
+
+        self.results[activity_name] = result
+        return result
@@ -1,38 +1,111 @@
+import copy
 import datetime
+import threading
 
 from src.data_sources.data_backend import DataBackend
-from src.data_sources.errors import DefaultSettingNotFoundError, DataNotAvailableError
+from src.data_sources.errors import DefaultSettingNotFoundError, DataNotAvailableError, CorruptMonthDataError, \
+    InvalidGranularityError
+from src.data_sources.journal import Journal
+from src.data_sources.rollups import GRANULARITIES, compute_month_rollup, get_period_start
+from src.data_sources.session_store import SessionStore, split_interval
+from src.repositories.activity_matcher import ActivityMatcher
+from src.repositories.month_data_cache import MonthDataCache, MAX_ENTRIES, MAX_BYTES
 
 
 class CodeTimeDataRepository:
-    cached_month_data = {}
-    cached_config = None
 
-    def __init__(self, data_backend: DataBackend):
+    def __init__(self, data_backend: DataBackend, journal: Journal = None, session_store: SessionStore = None,
+                 cache_max_entries=MAX_ENTRIES, cache_max_bytes=MAX_BYTES):
+        """
+        :param data_backend: backend used for reading and writing month data and config
+        :param journal: if set, tracked time is being appended to the journal instead of rewriting the month data file
+        on every call of add_day_data. Month data files are then being updated by compact_journal.
+        :param session_store: if set, every focus interval passed to add_session_data is being kept as session
+        :param cache_max_entries: maximum number of months kept in memory
+        :param cache_max_bytes: maximum estimated memory of the months kept in memory
+
+        Journal and session store buffer their records in memory, flush has to be called to write them to disk.
+
+        The repository is shared by the tracker, the persistence worker, the GUI thread and the render worker. Cached
+        month data, config and indexes are guarded by a single reentrant lock instead of a reader-writer lock or an
+        actor owning the state: every critical section is a few dict operations, reads are not faster in parallel
+        under the GIL, and methods call each other while holding the lock, like add_day_data calling
+        get_cached_month_data. get_month_data, get_config and get_setting return copies, so callers never iterate
+        dicts another thread is changing, the live cached dicts are only used while holding the lock.
+        """
         self.data_backend = data_backend
+        self.journal = journal
+        self.session_store = session_store
+        self.dirty_months = {}
+        self.lock = threading.RLock()
+        self.pending_listener = None
+
+        self.cached_month_data = MonthDataCache(cache_max_entries, cache_max_bytes)
+        self.cached_config = None
+        self.cached_config_stamp = None
+        self.config_version = 0
+        self.activity_matcher = None
+        self.activity_matcher_version = None
 
     @staticmethod
     def get_cache_key(date: datetime.date):
         return f"{date.month}-{date.year}"
 
-    def cache_month_data(self, date: datetime.date):
-        self.cached_month_data[self.get_cache_key(date)] = self.data_backend.read_month_data(date)
+    def cache_month_data(self, date: datetime.date) -> dict:
+        with self.lock:
+            stamp = self.data_backend.get_month_data_stamp(date)
+            month_data = self.data_backend.read_month_data(date)
+            self.cached_month_data.put(self.get_cache_key(date), month_data, stamp)
+            return month_data
 
     def get_month_data(self, date: datetime.date):
         """
         :param date: date of desired month
-        :return: month data using DataBackend
+        :return: copy of the month data, see get_cached_month_data
+        """
+        with self.lock:
+            return copy.deepcopy(self.get_cached_month_data(date))
+
+    def get_cached_month_data(self, date: datetime.date):
+        """
+        Must only be called while holding the lock, changes to the returned dict change the cached month data.
+        :param date: date of desired month
+        :return: month data using DataBackend, cached until it gets evicted or the month data changes on disk
         """
+        with self.lock:
+            month_data = self.cached_month_data.lookup(self.get_cache_key(date),
+                                                       self.data_backend.get_month_data_stamp(date))
+            if month_data is None:
+                month_data = self.cache_month_data(date)
+
+            return month_data
+
+    def write_month_data(self, month_data: dict, date: datetime.date):
+        """Writes month data to the data backend and keeps it cached with the stamp of the written file."""
+        with self.lock:
+            self.data_backend.write_month_data(month_data, date)
+            self.cached_month_data.put(self.get_cache_key(date), month_data,
+                                       self.data_backend.get_month_data_stamp(date))
+
+    def mark_month_dirty(self, date: datetime.date):
         cache_key = self.get_cache_key(date)
+        self.dirty_months[cache_key] = date
+        self.cached_month_data.pin(cache_key)
+        self.cached_month_data.bump_version(cache_key)
 
-        if cache_key not in self.cached_month_data:
-            self.cache_month_data(date)
+    def get_month_version(self, date: datetime.date):
+        """:return: version of the cached month data, which changes whenever the month data changes"""
+        with self.lock:
+            return self.cached_month_data.get_version(self.get_cache_key(date))
 
-        return self.cached_month_data[cache_key]
+    def get_cache_statistics(self) -> dict:
+        """:return: hit, miss, eviction and invalidation counters and the size of the month data cache"""
+        with self.lock:
+            return self.cached_month_data.get_statistics()
 
     def add_day_data(self, data: dict, date: datetime.date):
         """
-        Saves time tracking data
+        Saves time tracking data, either by rewriting the month data file or by appending it to the journal
 
         Example structure for data argument:
         data: dict
@@ -64,25 +137,176 @@ class CodeTimeDataRepository:
             self.add_day_data(day_data, next_day_date.date())
             time = time_diff.seconds * 1000
 
-        if cache_key not in self.cached_month_data:
-            self.cache_month_data(date)
+        with self.lock:
+            cached_data = self.get_cached_month_data(date)
 
-        cached_data = self.cached_month_data[cache_key]
+            day = date.day
+            if date.day not in cached_data:
+                cached_data[day] = {}
 
-        day = date.day
-        if date.day not in cached_data:
-            cached_data[day] = {}
+            if name not in cached_data[day]:
+                cached_data[day][name] = time
+            else:
+                cached_data[day][name] += time
 
-        if name not in cached_data[day]:
-            cached_data[day][name] = time
-        else:
-            cached_data[day][name] += time
+            if self.journal is None:
+                self.write_month_data(cached_data, date)
+            else:
+                self.journal.append(start_datetime, name, time, cached_data[day][name])
+                self.cached_month_data[cache_key] = cached_data
+                self.mark_month_dirty(date)
+
+        if self.pending_listener is not None and self.journal is not None:
+            self.pending_listener(self.journal.get_pending_count())
 
-        self.cached_month_data[cache_key] = cached_data
-        self.data_backend.write_month_data(cached_data, date)
+    def add_session_data(self, data: dict, date: datetime.date):
+        """
+        Stores a whole focus interval as session and adds its time to the day data, data has the same structure as
+        for add_day_data.
+        """
+        if self.session_store is not None:
+            self.session_store.append(datetime.datetime.combine(date, data["start_time"]), data["time"], data["name"])
+
+        self.add_day_data(data, date)
+
+    def get_sessions(self, start: datetime.datetime, end: datetime.datetime) -> list:
+        """
+        :return: sessions overlapping the window between start and end, empty if sessions are not being stored
+        """
+        if self.session_store is None:
+            return []
+
+        return list(self.session_store.read_sessions(start, end))
+
+    def get_hour_heatmap(self, start: datetime.date, end: datetime.date) -> list:
+        """
+        :param start: first day of the heatmap
+        :param end: last day of the heatmap
+        :return: list of 24 tracked milliseconds, one for every hour of the day
+        """
+        window_start = datetime.datetime.combine(start, datetime.time())
+        window_end = datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time())
+        heatmap = [0] * 24
+
+        for session in self.get_sessions(window_start, window_end):
+            for piece_start, duration in split_interval(session.start, session.duration, datetime.timedelta(hours=1)):
+                if window_start <= piece_start < window_end:
+                    heatmap[piece_start.hour] += duration
+
+        return heatmap
+
+    def get_longest_focus_streak(self, start: datetime.date, end: datetime.date, max_gap=60000):
+        """
+        Longest streak of consecutive sessions of tracked activities, sessions are being counted as consecutive if the
+        gap between them is not longer than max_gap milliseconds.
+        :return: dict containing start, end and tracked time of the streak, None if there are no sessions
+        """
+        window_start = datetime.datetime.combine(start, datetime.time())
+        window_end = datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time())
+        sessions = sorted(self.get_sessions(window_start, window_end), key=lambda session: session.start)
+
+        longest_streak = None
+        streak = None
+        for session in sessions:
+            session_end = session.start + datetime.timedelta(milliseconds=session.duration)
+            if streak is not None and session.start - streak["end"] <= datetime.timedelta(milliseconds=max_gap):
+                streak["end"] = max(streak["end"], session_end)
+                streak["time"] += session.duration
+            else:
+                streak = {"start": session.start, "end": session_end, "time": session.duration}
+
+            if longest_streak is None or streak["time"] > longest_streak["time"]:
+                longest_streak = dict(streak)
+
+        return longest_streak
+
+    def replay_journal(self):
+        """Applies records of the journal which have not been compacted into the month data files yet."""
+        if self.journal is None:
+            return
+
+        with self.lock:
+            for record in self.journal.read_records():
+                date = record.start.date()
+                month_data = self.get_cached_month_data(date)
+
+                if date.day not in month_data:
+                    month_data[date.day] = {}
+
+                month_data[date.day][record.name] = record.day_total
+                self.mark_month_dirty(date)
+
+    def flush(self):
+        """Writes records buffered by journal and session store to disk."""
+        if self.journal is not None:
+            self.journal.flush()
+
+        if self.session_store is not None:
+            self.session_store.flush()
+
+    def compact_journal(self):
+        """Writes every month changed since the last compaction to its month data file and clears the journal."""
+        if self.journal is None:
+            return
+
+        with self.lock:
+            if self.session_store is not None:
+                self.session_store.flush()
+
+            for cache_key, date in self.dirty_months.items():
+                self.cached_month_data.unpin(cache_key)
+                self.write_month_data(self.cached_month_data[cache_key], date)
+
+            self.dirty_months = {}
+            self.journal.truncate()
+
+    def repair_month_data(self, date: datetime.date) -> dict:
+        """
+        Rebuilds the month data of a month whose data file and backup are corrupt or outdated. Starting from the last
+        readable generation, the records of the journal are being replayed and every day total is being raised to
+        the total of the stored sessions, as sessions and month data can both only miss time but never count too
+        much. The result is being written to the data backend.
+        :param date: date of desired month
+        :return: repaired month data
+        """
+        with self.lock:
+            try:
+                month_data = self.data_backend.read_month_data(date)
+            except CorruptMonthDataError:
+                month_data = {}
+
+            if self.journal is not None:
+                for record in self.journal.read_records():
+                    if (record.start.year, record.start.month) == (date.year, date.month):
+                        month_data.setdefault(record.start.day, {})[record.name] = record.day_total
+
+            if self.session_store is not None:
+                self.session_store.flush()
+                for day, activities in self.session_store.get_month_totals(date).items():
+                    day_data = month_data.setdefault(day, {})
+                    for name, time in activities.items():
+                        day_data[name] = max(day_data.get(name, 0), time)
+
+            if month_data:
+                self.write_month_data(month_data, date)
+            else:
+                self.cached_month_data[self.get_cache_key(date)] = month_data
+
+            return month_data
 
     def get_days_with_data(self):
-        return self.data_backend.get_days_with_data()
+        """Days with data of the data backend including days which are only tracked in the journal yet."""
+        with self.lock:
+            days_with_data = self.data_backend.get_days_with_data()
+            for cache_key, date in self.dirty_months.items():
+                if date.year not in days_with_data:
+                    days_with_data[date.year] = {}
+
+                days = set(days_with_data[date.year].get(date.month, []))
+                days.update(self.cached_month_data[cache_key].keys())
+                days_with_data[date.year][date.month] = sorted(days)
+
+        return days_with_data
 
     def get_months_with_data(self):
         data = self.get_days_with_data()
@@ -97,29 +321,67 @@ class CodeTimeDataRepository:
         return list(data.keys())
 
     def cache_config(self):
-        self.cached_config = self.data_backend.read_config()
+        with self.lock:
+            self.cached_config_stamp = self.data_backend.get_config_stamp()
+            self.cached_config = self.data_backend.read_config()
+            self.config_version += 1
 
     def get_config(self):
-        if self.cached_config is None:
-            self.cache_config()
+        """:return: copy of the config, see get_cached_config"""
+        with self.lock:
+            return copy.deepcopy(self.get_cached_config())
+
+    def get_cached_config(self):
+        """
+        Must only be called while holding the lock and the returned dict must not be changed, see update_setting.
+        :return: config, cached until the config file changes on disk
+        """
+        with self.lock:
+            if self.cached_config is None or self.data_backend.get_config_stamp() != self.cached_config_stamp:
+                self.cache_config()
 
-        return self.cached_config
+            return self.cached_config
 
     def write_config(self, config):
-        self.cached_config = config
-        self.data_backend.write_config(config)
+        """Writes the config and caches a copy of it once it has been written, a failed write changes nothing."""
+        with self.lock:
+            self.data_backend.write_config(config)
+            self.cached_config = copy.deepcopy(config)
+            self.cached_config_stamp = self.data_backend.get_config_stamp()
+            self.config_version += 1
+
+    def get_activity_matcher(self) -> ActivityMatcher:
+        """:return: matcher of the activities setting, rebuilt whenever the config version changes"""
+        with self.lock:
+            activities = self.get_cached_config().get("activities", self.get_default_setting("activities"))
+            if self.activity_matcher is None or self.activity_matcher_version != self.config_version:
+                self.activity_matcher = ActivityMatcher(activities)
+                self.activity_matcher_version = self.config_version
+
+            return self.activity_matcher
+
+    def is_activity_tracked(self, activity_name: str, get_bundle_id=None) -> bool:
+        """
+        :param activity_name: name of the activity
+        :param get_bundle_id: function returning the bundle id of an activity name, see ActivityMatcher.matches
+        :return: whether the activity matches an entry of the activities setting
+        """
+        return self.get_activity_matcher().matches(activity_name, get_bundle_id)
 
     def get_setting(self, name):
-        config = self.get_config()
-        if name not in config:
-            return self.get_default_setting(name)
-        else:
-            return config[name]
+        """:return: copy of the setting, so changing it has no effect until update_setting is called"""
+        with self.lock:
+            config = self.get_config()
+            if name not in config:
+                return self.get_default_setting(name)
+            else:
+                return config[name]
 
     def update_setting(self, name, value):
-        config = self.get_config()
-        config[name] = value
-        self.write_config(config)
+        with self.lock:
+            config = self.get_config()
+            config[name] = value
+            self.write_config(config)
 
     def reset_setting(self, name):
         self.update_setting(name, self.get_default_setting(name))
@@ -135,8 +397,9 @@ class CodeTimeDataRepository:
             self.write_default_config()
 
     def reset_settings(self):
-        self.write_default_config()
-        self.cache_config()
+        with self.lock:
+            self.write_default_config()
+            self.cache_config()
 
     def write_default_config(self):
         config = {
@@ -186,15 +449,22 @@ class CodeTimeDataRepository:
             }
         elif name == "username":
             return "a random user"
+        elif name == "storage_backend":
+            return "json"
+        elif name == "gap_policy":
+            return "drop"
+        elif name == "gap_cap":
+            return 300
         else:
             raise DefaultSettingNotFoundError(message=f"Invalid settings key {name}")
 
     def get_statistics(self, date: datetime.date):
-        data = self.get_month_data(date)
-        if date.day not in data:
-            raise DataNotAvailableError()
+        with self.lock:
+            data = self.get_cached_month_data(date)
+            if date.day not in data:
+                raise DataNotAvailableError()
 
-        data = data[date.day]
+            data = dict(data[date.day])
         total_time = 0
         sorted_activities = []
 
@@ -217,6 +487,86 @@ class CodeTimeDataRepository:
             "activities": sorted_activities
         }
 
+    def get_month_rollup(self, date: datetime.date) -> dict:
+        """Week partials of a month, see Rollups, including changes which have not been written yet."""
+        with self.lock:
+            cache_key = self.get_cache_key(date)
+            if cache_key in self.dirty_months:
+                return compute_month_rollup(date, self.cached_month_data[cache_key])
+
+            return self.data_backend.get_month_rollup(date)
+
+    def get_range_statistics(self, start: datetime.date, end: datetime.date, granularity="day"):
+        """
+        Totals of every day, week, month or year between start and end, both inclusive, together with the time of
+        every activity in the whole range. Months lying completely within the range are being summed up from their
+        rollups, only the months at the borders of the range are being read day by day.
+
+        example format of the returned statistics:
+        {
+            "start": datetime.date(2020, 1, 1),
+            "end": datetime.date(2020, 12, 31),
+            "granularity": "month",
+            "total_time": 5000,
+            "periods": [
+                {
+                    "start": datetime.date(2020, 1, 1),
+                    "total_time": 5000,
+                    "activities": {"PyCharm": 5000}
+                }
+            ],
+            "activities": [{"name": "PyCharm", "time": 5000, "progress": 1.0}]
+        }
+        :param granularity: day, week, month or year, periods are ordered by their start and only contain periods
+        with tracked time
+        """
+        if granularity not in GRANULARITIES:
+            raise InvalidGranularityError(message=f"Invalid granularity {granularity}")
+
+        periods = {}
+
+        def add_activities(period_start, activities):
+            period = periods.setdefault(period_start, {})
+            for name, time in activities.items():
+                period[name] = period.get(name, 0) + time
+
+        with self.lock:
+            month = start.replace(day=1)
+            while month <= end:
+                next_month = (month + datetime.timedelta(days=32)).replace(day=1)
+
+                if granularity != "day" and start <= month and next_month - datetime.timedelta(days=1) <= end:
+                    for week, activities in self.get_month_rollup(month).items():
+                        week_start = max(datetime.date.fromisoformat(week), month)
+                        add_activities(get_period_start(week_start, granularity), activities)
+                else:
+                    for day, activities in self.get_cached_month_data(month).items():
+                        day_date = month.replace(day=int(day))
+                        if start <= day_date <= end:
+                            add_activities(get_period_start(day_date, granularity), activities)
+
+                month = next_month
+
+        activity_times = {}
+        for activities in periods.values():
+            for name, time in activities.items():
+                activity_times[name] = activity_times.get(name, 0) + time
+
+        total_time = sum(activity_times.values())
+        sorted_activities = sorted(({"name": name, "time": time, "progress": time / total_time}
+                                    for name, time in activity_times.items()),
+                                   key=lambda activity: activity["time"], reverse=True)
+
+        return {
+            "start": start,
+            "end": end,
+            "granularity": granularity,
+            "total_time": total_time,
+            "periods": [{"start": period_start, "total_time": sum(periods[period_start].values()),
+                         "activities": periods[period_start]} for period_start in sorted(periods.keys())],
+            "activities": sorted_activities
+        }
+
     @staticmethod
     def summarize_activities(activities):
         if len(activities) > 3:
@@ -1,8 +1,26 @@
 import sys
+import threading
 from abc import ABC, abstractmethod
 
 if sys.platform in ['Mac', 'darwin', 'os2', 'os2emx']:
-    from AppKit import NSWorkspace
+    import objc
+    from AppKit import NSWorkspace, NSWorkspaceDidActivateApplicationNotification
+    from Foundation import NSObject
+    from Quartz import CGEventSourceSecondsSinceLastEventType, kCGEventSourceStateCombinedSessionState, \
+        kCGAnyInputEventType
+
+    class ApplicationActivationObserver(NSObject):
+        """Receives NSWorkspace notifications about activated applications and forwards their names."""
+
+        def initWithCallback_(self, callback):
+            self = objc.super(ApplicationActivationObserver, self).init()
+            if self is not None:
+                self.callback = callback
+
+            return self
+
+        def applicationActivated_(self, notification):
+            self.callback(notification.userInfo()["NSWorkspaceApplicationKey"].localizedName())
 
 
 class FocusActivityProvider(ABC):
@@ -12,7 +30,83 @@ class FocusActivityProvider(ABC):
         """Get name of the currently focused activity"""
         pass
 
+    def get_idle_time(self):
+        """Seconds since the last user input, None if the provider can't detect idle time"""
+        return None
+
+    def get_bundle_id(self, activity_name: str):
+        """Bundle id of the application of an activity, None if unknown"""
+        return None
+
+    def supports_subscription(self) -> bool:
+        """Whether focus changes are being pushed to subscribers, providers which can't push have to be polled"""
+        return False
+
+    def subscribe(self, callback):
+        """Calls callback with the name of the newly focused activity on every focus change"""
+        raise NotImplementedError("Focus activity provider does not support subscriptions")
+
+    def unsubscribe(self, callback):
+        raise NotImplementedError("Focus activity provider does not support subscriptions")
+
+
+class SubscribableFocusActivityProvider(FocusActivityProvider, ABC):
+
+    def __init__(self):
+        """Base for providers which push focus changes to their subscribers."""
+        self.subscribers = []
+        self.subscribers_lock = threading.Lock()
+
+    def supports_subscription(self) -> bool:
+        return True
+
+    def subscribe(self, callback):
+        with self.subscribers_lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.subscribers_lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    def notify_subscribers(self, activity_name: str):
+        with self.subscribers_lock:
+            subscribers = list(self.subscribers)
+
+        for callback in subscribers:
+            callback(activity_name)
+
+
+class MacFocusActivityProvider(SubscribableFocusActivityProvider):
+
+    def __init__(self):
+        """Gets notified by NSWorkspace about activated applications, which requires a running main run loop."""
+        super().__init__()
+        self.observer = None
+        self.bundle_ids = {}
 
-class MacFocusActivityProvider(FocusActivityProvider):
     def get_activity_name(self) -> str:
         return NSWorkspace.sharedWorkspace().activeApplication()['NSApplicationName']
+
+    def get_bundle_id(self, activity_name: str):
+        if activity_name not in self.bundle_ids:
+            bundle_id = next((application.bundleIdentifier()
+                              for application in NSWorkspace.sharedWorkspace().runningApplications()
+                              if application.localizedName() == activity_name), None)
+            if bundle_id is None:
+                return None
+
+            self.bundle_ids[activity_name] = bundle_id
+
+        return self.bundle_ids[activity_name]
+
+    def get_idle_time(self):
+        return CGEventSourceSecondsSinceLastEventType(kCGEventSourceStateCombinedSessionState, kCGAnyInputEventType)
+
+    def subscribe(self, callback):
+        super().subscribe(callback)
+
+        if self.observer is None:
+            self.observer = ApplicationActivationObserver.alloc().initWithCallback_(self.notify_subscribers)
+            NSWorkspace.sharedWorkspace().notificationCenter().addObserver_selector_name_object_(
+                self.observer, "applicationActivated:", NSWorkspaceDidActivateApplicationNotification, None)
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+
+MAX_ENTRIES = 24
+MAX_BYTES = 4 * 1024 * 1024
+
+# rough memory usage of a day and of an activity entry of month data, used for estimating the size of a month
+DAY_SIZE = 256
+ACTIVITY_SIZE = 128
+
+UNKNOWN_STAMP = object()
+
+
+class MonthDataCache(OrderedDict):
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        """
+        Least recently used cache of month data, keyed by CodeTimeDataRepository.get_cache_key.
+
+        Every month is being stored together with the stamp of its month data file at the time it has been read. A
+        lookup with a different stamp means the file has been changed on disk and invalidates the cached month.
+        Months are being evicted once more than max_entries months or more than max_bytes estimated bytes are cached.
+        Pinned months, like months with changes which have not been written yet, are neither evicted nor invalidated.
+        Every change of a month gives it a new version, which lets consumers cache values derived from a month.
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.stamps = {}
+        self.sizes = {}
+        self.pinned = set()
+        self.versions = {}
+        self.last_version = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(self, key, stamp=UNKNOWN_STAMP):
+        """
+        :param key: cache key of the month
+        :param stamp: current stamp of the month data file
+        :return: cached month data, None if the month is not cached or has been changed on disk
+        """
+        if key in self and key not in self.pinned and stamp is not UNKNOWN_STAMP \
+                and self.stamps[key] is not UNKNOWN_STAMP and self.stamps[key] != stamp:
+            self.invalidations += 1
+            self.pop(key)
+
+        if key not in self:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.move_to_end(key)
+        return super().__getitem__(key)
+
+    def put(self, key, month_data: dict, stamp=UNKNOWN_STAMP):
+        self.stamps[key] = stamp
+        self[key] = month_data
+
+    def __setitem__(self, key, month_data):
+        super().__setitem__(key, month_data)
+        self.move_to_end(key)
+        self.stamps.setdefault(key, UNKNOWN_STAMP)
+        self.sizes[key] = self.estimate_size(month_data)
+        self.bump_version(key)
+        self.evict(keep=key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.stamps.pop(key, None)
+        self.sizes.pop(key, None)
+        self.versions.pop(key, None)
+        self.pinned.discard(key)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+
+        month_data = super().__getitem__(key)
+        del self[key]
+        return month_data
+
+    def clear(self):
+        super().clear()
+        self.stamps.clear()
+        self.sizes.clear()
+        self.versions.clear()
+        self.pinned.clear()
+
+    def bump_version(self, key):
+        """Marks a month as changed, needed if its month data has been changed in place."""
+        self.last_version += 1
+        self.versions[key] = self.last_version
+
+    def get_version(self, key):
+        """:return: version of a cached month, None if the month is not cached"""
+        return self.versions.get(key)
+
+    def pin(self, key):
+        self.pinned.add(key)
+
+    def unpin(self, key):
+        self.pinned.discard(key)
+
+    def get_size(self) -> int:
+        """:return: estimated bytes of all cached months"""
+        return sum(self.sizes.values())
+
+    def evict(self, keep=None):
+        """Evicts least recently used months until the limits are met again, pinned months and keep are skipped."""
+        candidates = [key for key in self.keys() if key not in self.pinned and key != keep]
+        size = self.get_size()
+
+        for key in candidates:
+            if len(self) <= self.max_entries and size <= self.max_bytes:
+                break
+
+            size -= self.sizes[key]
+            del self[key]
+            self.evictions += 1
+
+    def get_statistics(self) -> dict:
+        """Counters of the cache for diagnostics."""
+        return {
+            "entries": len(self),
+            "bytes": self.get_size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+    @staticmethod
+    def estimate_size(month_data: dict) -> int:
+        return sum(DAY_SIZE + sum(ACTIVITY_SIZE + len(name) for name in activities)
+                   for activities in month_data.values())
@@ -0,0 +1,44 @@
+import time
+
+from src.repositories.focus_activity_provider import SubscribableFocusActivityProvider
+
+
+class ScriptedFocusActivityProvider(SubscribableFocusActivityProvider):
+
+    def __init__(self, activity_name="", push=True):
+        """
+        Fake provider whose focused activity is being changed by a script instead of the operating system, used for
+        testing and for running code-time on platforms without a real provider.
+        :param activity_name: activity which is focused initially
+        :param push: whether focus changes are being pushed to subscribers or have to be polled
+        """
+        super().__init__()
+        self.activity_name = activity_name
+        self.push = push
+        self.poll_count = 0
+        self.idle_time = None
+
+    def supports_subscription(self) -> bool:
+        return self.push
+
+    def get_activity_name(self) -> str:
+        self.poll_count += 1
+        return self.activity_name
+
+    def get_idle_time(self):
+        return self.idle_time
+
+    def switch_to(self, activity_name: str):
+        self.activity_name = activity_name
+        if self.push:
+            self.notify_subscribers(activity_name)
+
+    def play(self, script, sleep=time.sleep):
+        """
+        :param script: list of (seconds, activity name) tuples, the focus is being switched to the activity after
+        waiting the given amount of seconds
+        :param sleep: function used for waiting
+        """
+        for seconds, activity_name in script:
+            sleep(seconds)
+            self.switch_to(activity_name)
@@ -1,59 +1,261 @@
-import time
-from datetime import datetime
-import threading
+import asyncio
+import queue
 
 from src.repositories.code_time_data_repository import CodeTimeDataRepository
 from src.repositories.focus_activity_provider import FocusActivityProvider
+from src.use_cases.clock import SystemClock
 
+POLL_INTERVAL = 1
+GAP_THRESHOLD = 60
+SUSPEND_TOLERANCE = 1
 
-class ActivityTracker(threading.Thread):
-    def __init__(self, data_repository: CodeTimeDataRepository, focus_activity_provider: FocusActivityProvider):
-        super().__init__()
+GAP_POLICY_DROP = "drop"
+GAP_POLICY_CAP = "cap"
+GAP_POLICY_KEEP = "keep"
 
+
+class TimeAccountant:
+
+    def __init__(self, clock, gap_policy=GAP_POLICY_DROP, gap_cap=300, polling=True, poll_interval=POLL_INTERVAL,
+                 gap_threshold=GAP_THRESHOLD):
+        """
+        Measures focus intervals with a monotonic clock instead of counting loop iterations.
+
+        Time is being treated as gap if the system has been suspended (the suspend aware clock advanced further than
+        the monotonic clock), the tracker has not been woken up for more than gap_threshold seconds while polling, or
+        the user has been idle for more than gap_threshold seconds. Gaps are being counted according to gap_policy:
+        drop does not count them, cap counts at most gap_cap seconds of every gap and keep counts them completely.
+
+        The wall clock only decides the day an interval belongs to, so daylight saving time changes or steps of the
+        wall clock by NTP are not taken for gaps.
+        """
+        self.clock = clock
+        self.gap_policy = gap_policy
+        self.gap_cap = gap_cap
+        self.polling = polling
+        self.poll_interval = poll_interval
+        self.gap_threshold = gap_threshold
+
+        self.start_date = None
+        self.elapsed = 0.0
+        self.counted_gap = 0.0
+        self.last_monotonic = None
+        self.last_since_boot = None
+        self.last_wall = None
+
+    def start(self):
+        self.last_monotonic = self.clock.monotonic()
+        self.last_since_boot = self.clock.since_boot()
+        self.last_wall = self.clock.now()
+        self.start_date = self.last_wall
+        self.elapsed = 0.0
+        self.counted_gap = 0.0
+
+    def tick(self, idle_time=None):
+        """
+        Accounts the time since the last tick.
+        :param idle_time: seconds since the last user input, None if unknown
+        """
+        monotonic = self.clock.monotonic()
+        since_boot = self.clock.since_boot()
+
+        active = monotonic - self.last_monotonic
+        suspended = max(0.0, since_boot - self.last_since_boot - active)
+        self.last_monotonic = monotonic
+        self.last_since_boot = since_boot
+        self.last_wall = self.clock.now()
+
+        if suspended < SUSPEND_TOLERANCE:
+            active += suspended
+            suspended = 0.0
+
+        stalled = 0.0
+        if self.polling and active > self.gap_threshold:
+            stalled = active - self.poll_interval
+
+        idle = 0.0
+        if idle_time is not None and idle_time > self.gap_threshold:
+            idle = min(idle_time, active - stalled)
+
+        gap = suspended + stalled + idle
+        if gap == 0:
+            self.counted_gap = 0.0
+
+        self.elapsed += active - stalled - idle + self.count_gap(gap)
+
+    def count_gap(self, gap) -> float:
+        if self.gap_policy == GAP_POLICY_KEEP:
+            return gap
+        elif self.gap_policy == GAP_POLICY_CAP:
+            counted = min(gap, max(0.0, self.gap_cap - self.counted_gap))
+            self.counted_gap += counted
+            return counted
+        else:
+            return 0.0
+
+    def take(self):
+        """
+        Ends the current interval at the last tick and starts the next one at the same moment.
+        :return: start date and accounted milliseconds of the ended interval
+        """
+        result = (self.start_date, round(self.elapsed * 1000))
+        self.start_date = self.last_wall
+        self.elapsed = 0.0
+        return result
+
+
+class ActivityTracker:
+    def __init__(self, data_repository: CodeTimeDataRepository, focus_activity_provider: FocusActivityProvider,
+                 poll_interval=POLL_INTERVAL, clock=SystemClock()):
+        """
+        Task of the asyncio runtime which tracks the time spent in the focused activity. Providers which support
+        subscriptions wake the tracker up on focus changes only, other providers are being polled every poll_interval
+        seconds.
+        """
         self.focus_activity_provider = focus_activity_provider
         self.data_repository = data_repository
+        self.poll_interval = poll_interval
+        self.clock = clock
 
         self.tracking_paused = False
         self.quit_app = False
 
+        self.events = queue.Queue()
+        self.wake_ups = 0
+
+        self.loop = None
+        self.wake_event = None
+
+        self.time_accountant = None
+        self.last_activity = None
+        self.tracking = False
+
+    def put_event(self, activity):
+        """Queues an event and wakes up run_async, can be called from any thread."""
+        self.events.put(activity)
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.wake_event.set)
+            except RuntimeError:
+                # the loop has been closed after the tracker stopped
+                pass
+
     def on_pause_continue(self):
         self.tracking_paused = not self.tracking_paused
+        self.put_event(None)
         return self.tracking_paused
 
     def on_quit(self):
         self.quit_app = True
+        self.put_event(None)
+
+    def on_focus_changed(self, activity):
+        self.put_event(activity)
 
     def is_activity_to_track(self, activity):
-        return activity in self.data_repository.get_setting("activities")
-
-    def run(self):
-        last_activity = self.focus_activity_provider.get_activity_name()
-        start_date = datetime.now()
-        time_diff = 0
-
-        def write_if_activity_is_to_track():
-            if self.is_activity_to_track(last_activity):
-                self.data_repository.add_day_data({
-                    "name": last_activity,
-                    "time": time_diff,
-                    "start_time": start_date.time()
-                }, start_date.date())
-
-        while not self.quit_app:
-            if not self.tracking_paused:
-                current_activity = self.focus_activity_provider.get_activity_name()
-                if last_activity != current_activity:
-                    write_if_activity_is_to_track()
-                    last_activity = current_activity
-
-                    time_diff = 0
-                    start_date = datetime.now()
-            else:
-                if time_diff > 0:
-                    write_if_activity_is_to_track()
-                    time_diff = 0
-
-            time_diff += 1000
-            time.sleep(1)
-
-        write_if_activity_is_to_track()
+        return self.data_repository.is_activity_tracked(activity, self.focus_activity_provider.get_bundle_id)
+
+    def is_event_driven(self):
+        return self.focus_activity_provider.supports_subscription()
+
+    def get_wait_timeout(self):
+        """Push providers only need periodic wake-ups for detecting idle time, other providers are being polled."""
+        if not self.is_event_driven():
+            return self.poll_interval
+        elif self.focus_activity_provider.get_idle_time() is not None:
+            return GAP_THRESHOLD
+        else:
+            return None
+
+    async def wait_for_activity(self):
+        """
+        Waits until the focus changes, the tracker gets paused or quit, or the wait timeout passed.
+        :return: name of the focused activity
+        """
+        try:
+            activity = self.events.get_nowait()
+        except queue.Empty:
+            self.wake_event.clear()
+            await self.clock.wait(self.wake_event, self.get_wait_timeout())
+
+            try:
+                activity = self.events.get_nowait()
+            except queue.Empty:
+                activity = None
+
+        self.wake_ups += 1
+        if activity is None:
+            return self.focus_activity_provider.get_activity_name()
+
+        return activity
+
+    def create_time_accountant(self):
+        return TimeAccountant(self.clock, gap_policy=self.data_repository.get_setting("gap_policy"),
+                              gap_cap=self.data_repository.get_setting("gap_cap"),
+                              polling=not self.is_event_driven(), poll_interval=self.poll_interval)
+
+    def on_config_changed(self):
+        """Applies changed gap settings to the running interval, called on the thread the tracker runs on."""
+        if self.time_accountant is not None:
+            self.time_accountant.gap_policy = self.data_repository.get_setting("gap_policy")
+            self.time_accountant.gap_cap = self.data_repository.get_setting("gap_cap")
+
+    def write_if_activity_is_to_track(self, activity, time_accountant: TimeAccountant):
+        start_date, time = time_accountant.take()
+        if self.is_activity_to_track(activity):
+            self.data_repository.add_session_data({
+                "name": activity,
+                "time": time,
+                "start_time": start_date.time()
+            }, start_date.date())
+
+    def start_tracking(self):
+        if self.is_event_driven():
+            self.focus_activity_provider.subscribe(self.on_focus_changed)
+
+        self.time_accountant = self.create_time_accountant()
+        self.last_activity = self.focus_activity_provider.get_activity_name()
+        self.time_accountant.start()
+        self.tracking = True
+
+    def process(self, current_activity):
+        """Accounts the time since the last wake-up and writes the interval of the last activity if it ended."""
+        if self.tracking_paused:
+            if self.tracking:
+                self.time_accountant.tick(self.focus_activity_provider.get_idle_time())
+                self.write_if_activity_is_to_track(self.last_activity, self.time_accountant)
+                self.data_repository.flush()
+                self.tracking = False
+        elif not self.tracking:
+            self.last_activity = current_activity
+            self.time_accountant.start()
+            self.tracking = True
+        else:
+            self.time_accountant.tick(self.focus_activity_provider.get_idle_time())
+            if self.last_activity != current_activity:
+                self.write_if_activity_is_to_track(self.last_activity, self.time_accountant)
+                self.last_activity = current_activity
+
+    def stop_tracking(self):
+        if self.tracking:
+            self.time_accountant.tick(self.focus_activity_provider.get_idle_time())
+            self.write_if_activity_is_to_track(self.last_activity, self.time_accountant)
+            self.tracking = False
+
+        self.data_repository.flush()
+
+        if self.is_event_driven():
+            self.focus_activity_provider.unsubscribe(self.on_focus_changed)
+
+    async def run_async(self):
+        """Tracks until on_quit is called or the task is cancelled, the last interval is written in both cases."""
+        self.wake_event = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+
+        self.start_tracking()
+        try:
+            while not self.quit_app:
+                self.process(await self.wait_for_activity())
+        finally:
+            self.stop_tracking()
+            self.loop = None
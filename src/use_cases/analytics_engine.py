@@ -0,0 +1,227 @@
+import datetime
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from src.data_sources.errors import AnalyticsNotAvailableError, DataNotAvailableError, InvalidGranularityError
+from src.data_sources.rollups import GRANULARITIES
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+
+MAX_CACHED_MONTHS = 120
+
+
+def is_analytics_engine_available() -> bool:
+    return numpy is not None
+
+
+class ActivityMatrix:
+
+    def __init__(self, start: datetime.date, names: list, times):
+        """
+        Dense matrix of tracked milliseconds with one row per day starting at start and one column per activity.
+        :param names: activity names indexed by column
+        :param times: int64 array of shape (days, activities)
+        """
+        self.start = start
+        self.names = names
+        self.times = times
+
+    def get_dates(self) -> list:
+        return [self.start + datetime.timedelta(days=day) for day in range(self.times.shape[0])]
+
+
+class AnalyticsEngine:
+
+    def __init__(self, data_repository: CodeTimeDataRepository):
+        """
+        Computes statistics with vectorized NumPy operations on ActivityMatrix instead of summing up dicts. Results
+        have the same format as the statistics of CodeTimeDataRepository. NumPy is an optional dependency, the engine
+        raises AnalyticsNotAvailableError if it is not installed.
+
+        The matrix of every month is being cached until the repository reports a new version of the month, so
+        converting dicts into arrays is only paid once per month.
+        """
+        if numpy is None:
+            raise AnalyticsNotAvailableError()
+
+        self.data_repository = data_repository
+        self.month_matrices = OrderedDict()
+
+    def load_month(self, month: datetime.date) -> ActivityMatrix:
+        """:return: matrix of every day of the month of month"""
+        month = month.replace(day=1)
+        with self.data_repository.lock:
+            month_data = self.data_repository.get_month_data(month)
+            version = self.data_repository.get_month_version(month)
+
+            cached = self.month_matrices.get(month)
+            if cached is not None and cached[0] == version and cached[1] is month_data:
+                self.month_matrices.move_to_end(month)
+                return cached[2]
+
+            columns = {}
+            rows = []
+            for day, activities in month_data.items():
+                for name, time in activities.items():
+                    rows.append((int(day) - 1, columns.setdefault(name, len(columns)), time))
+
+        next_month = (month + datetime.timedelta(days=32)).replace(day=1)
+        times = numpy.zeros(((next_month - month).days, len(columns)), dtype=numpy.int64)
+        if rows:
+            day_indices, activity_indices, values = numpy.array(rows, dtype=numpy.int64).T
+            numpy.add.at(times, (day_indices, activity_indices), values)
+
+        matrix = ActivityMatrix(month, list(columns.keys()), times)
+        self.month_matrices[month] = (version, month_data, matrix)
+        if len(self.month_matrices) > MAX_CACHED_MONTHS:
+            self.month_matrices.popitem(last=False)
+
+        return matrix
+
+    def load(self, start: datetime.date, end: datetime.date) -> ActivityMatrix:
+        """
+        :return: matrix of every day between start and end, both inclusive
+        """
+        month_matrices = []
+        columns = {}
+        month = start.replace(day=1)
+
+        while month <= end:
+            matrix = self.load_month(month)
+            month_matrices.append((matrix, numpy.array([columns.setdefault(name, len(columns))
+                                                        for name in matrix.names], dtype=numpy.intp)))
+            month = (month + datetime.timedelta(days=32)).replace(day=1)
+
+        times = numpy.zeros((max(0, (end - start).days + 1), len(columns)), dtype=numpy.int64)
+        for matrix, column_indices in month_matrices:
+            first_day = max(start, matrix.start)
+            last_day = min(end, matrix.start + datetime.timedelta(days=matrix.times.shape[0] - 1))
+            if first_day > last_day or len(column_indices) == 0:
+                continue
+
+            rows = slice((first_day - start).days, (last_day - start).days + 1)
+            month_rows = slice((first_day - matrix.start).days, (last_day - matrix.start).days + 1)
+            times[rows, column_indices] = matrix.times[month_rows]
+
+        return ActivityMatrix(start, list(columns.keys()), times)
+
+    @staticmethod
+    def get_day_totals(matrix: ActivityMatrix):
+        return matrix.times.sum(axis=1)
+
+    @staticmethod
+    def get_activity_totals(matrix: ActivityMatrix):
+        return matrix.times.sum(axis=0)
+
+    @staticmethod
+    def get_shares(matrix: ActivityMatrix):
+        """:return: share of every activity in the total time, zeros if nothing has been tracked"""
+        activity_totals = matrix.times.sum(axis=0)
+        total_time = activity_totals.sum()
+        if total_time == 0:
+            return numpy.zeros(len(activity_totals))
+
+        return activity_totals / total_time
+
+    @staticmethod
+    def get_ranking(matrix: ActivityMatrix):
+        """:return: column indices ordered by descending total time, ties in the order of the columns"""
+        return numpy.argsort(-matrix.times.sum(axis=0), kind="stable")
+
+    @staticmethod
+    def get_moving_average(matrix: ActivityMatrix, window: int):
+        """:return: average of the day totals over every window of consecutive days, one value per complete window"""
+        return numpy.convolve(matrix.times.sum(axis=1), numpy.ones(window) / window, mode="valid")
+
+    @staticmethod
+    def get_percentiles(matrix: ActivityMatrix, percentiles):
+        """:return: percentiles of the day totals, days without tracked time included"""
+        return numpy.percentile(matrix.times.sum(axis=1), percentiles)
+
+    @staticmethod
+    def get_period_totals(matrix: ActivityMatrix, granularity: str):
+        """
+        :return: period starts and an array of shape (periods, activities) of the time tracked in every period
+        """
+        if matrix.times.shape[0] == 0:
+            return [], numpy.zeros((0, len(matrix.names)), dtype=numpy.int64)
+
+        dates = numpy.datetime64(matrix.start, "D") + numpy.arange(matrix.times.shape[0])
+        if granularity == "week":
+            # day 0 of datetime64 is a thursday
+            period_starts = dates - (dates.astype(numpy.int64) + 3) % 7
+        elif granularity == "month":
+            period_starts = dates.astype("datetime64[M]").astype("datetime64[D]")
+        elif granularity == "year":
+            period_starts = dates.astype("datetime64[Y]").astype("datetime64[D]")
+        else:
+            period_starts = dates
+
+        boundaries = numpy.concatenate(([0], numpy.flatnonzero(period_starts[1:] != period_starts[:-1]) + 1))
+        return period_starts[boundaries].tolist(), numpy.add.reduceat(matrix.times, boundaries, axis=0)
+
+    def get_sorted_activities(self, names: list, activity_totals) -> list:
+        total_time = activity_totals.sum()
+        ranking = numpy.argsort(-activity_totals, kind="stable")
+        ranking = ranking[activity_totals[ranking] > 0]
+
+        return [{"name": names[index], "time": int(activity_totals[index]),
+                 "progress": float(activity_totals[index] / total_time)} for index in ranking]
+
+    def get_statistics(self, date: datetime.date):
+        """Statistics of a single day, see CodeTimeDataRepository.get_statistics."""
+        month_matrix = self.load_month(date)
+        activity_totals = month_matrix.times[date.day - 1]
+        total_time = int(activity_totals.sum())
+        if total_time == 0:
+            raise DataNotAvailableError()
+
+        sorted_activities = CodeTimeDataRepository.summarize_activities(
+            [{"name": activity["name"], "time": activity["time"]}
+             for activity in self.get_sorted_activities(month_matrix.names, activity_totals)])
+
+        for activity in sorted_activities:
+            activity["progress"] = activity["time"] / total_time
+
+        return {
+            "date": date.strftime("%b %d %Y"),
+            "total_time": total_time,
+            "activities": sorted_activities
+        }
+
+    def get_range_statistics(self, start: datetime.date, end: datetime.date, granularity="day"):
+        """Statistics of a range of days, see CodeTimeDataRepository.get_range_statistics."""
+        if granularity not in GRANULARITIES:
+            raise InvalidGranularityError(message=f"Invalid granularity {granularity}")
+
+        matrix = self.load(start, end)
+        period_starts, period_times = self.get_period_totals(matrix, granularity)
+        activity_totals = period_times.sum(axis=0)
+
+        period_indices, activity_indices = numpy.nonzero(period_times)
+        period_totals = period_times.sum(axis=1).tolist()
+
+        periods = []
+        period_activities = None
+        last_period_index = None
+        for period_index, activity_index, time in zip(period_indices.tolist(), activity_indices.tolist(),
+                                                      period_times[period_indices, activity_indices].tolist()):
+            if period_index != last_period_index:
+                period_activities = {}
+                periods.append({"start": period_starts[period_index], "total_time": period_totals[period_index],
+                                "activities": period_activities})
+                last_period_index = period_index
+
+            period_activities[matrix.names[activity_index]] = time
+
+        return {
+            "start": start,
+            "end": end,
+            "granularity": granularity,
+            "total_time": int(activity_totals.sum()),
+            "periods": periods,
+            "activities": self.get_sorted_activities(matrix.names, activity_totals)
+        }
@@ -0,0 +1,72 @@
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from src.data_sources.data_backend_factory import create_data_backend
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.image_creator.basic_image_creator import BasicImageCreator
+
+# image creator of a worker process, created once per worker so fonts and images are only loaded once per worker
+worker_image_creator = None
+
+
+def get_days_to_export(data_repository: CodeTimeDataRepository, start: datetime.date = None,
+                       end: datetime.date = None) -> list:
+    """:return: sorted days with data between start and end, both inclusive and optional"""
+    days = []
+    for year, months in data_repository.get_days_with_data().items():
+        for month, month_days in months.items():
+            for day in month_days:
+                date = datetime.date(year, month, day)
+                if (start is None or date >= start) and (end is None or date <= end):
+                    days.append(date)
+
+    return sorted(days)
+
+
+def get_image_file_name(date: datetime.date) -> str:
+    return f"code-time_{date.isoformat()}.png"
+
+
+def init_worker(paths: dict):
+    global worker_image_creator
+    worker_image_creator = BasicImageCreator(CodeTimeDataRepository(create_data_backend(paths)))
+
+
+def render_to_file(statistics: dict, file_path: Path) -> Path:
+    worker_image_creator.create_image(statistics).save(file_path)
+    return file_path
+
+
+def export_images(paths: dict, data_repository: CodeTimeDataRepository, days: list, directory: Path,
+                  processes: int = None, progress=None) -> list:
+    """
+    Renders the image of every day to directory. Rendering is CPU bound, so images are being rendered by a pool of
+    processes, each with its own image creator reading the settings from paths. Statistics are computed in the calling
+    process, which also includes data of data_repository which has not been written yet.
+    :param days: days to export, see get_days_to_export
+    :param processes: number of worker processes, defaults to the number of CPUs, 1 renders in the calling process
+    :param progress: function called with the number of exported and the number of all images after every image
+    :return: paths of the written images, ordered like days
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    tasks = [(data_repository.get_statistics(day), directory.joinpath(get_image_file_name(day))) for day in days]
+    processes = min(processes or os.cpu_count() or 1, max(len(tasks), 1))
+
+    if processes == 1:
+        image_creator = BasicImageCreator(data_repository)
+        for index, (statistics, file_path) in enumerate(tasks):
+            image_creator.create_image(statistics).save(file_path)
+            if progress is not None:
+                progress(index + 1, len(tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(paths,)) as executor:
+            futures = [executor.submit(render_to_file, statistics, file_path) for statistics, file_path in tasks]
+            for index, future in enumerate(as_completed(futures)):
+                future.result()
+                if progress is not None:
+                    progress(index + 1, len(tasks))
+
+    return [file_path for _, file_path in tasks]
@@ -0,0 +1,46 @@
+import asyncio
+import sys
+import time
+from datetime import datetime
+
+if hasattr(time, "CLOCK_BOOTTIME"):
+    SUSPEND_AWARE_CLOCK = time.CLOCK_BOOTTIME
+elif sys.platform == "darwin":
+    # unlike mach_absolute_time behind time.monotonic, CLOCK_MONOTONIC of macOS keeps running while sleeping
+    SUSPEND_AWARE_CLOCK = time.CLOCK_MONOTONIC
+else:
+    SUSPEND_AWARE_CLOCK = None
+
+
+class SystemClock:
+    """Time source of the activity tracker, replaced by a simulated clock in tests."""
+
+    @staticmethod
+    def monotonic() -> float:
+        return time.monotonic()
+
+    @staticmethod
+    def since_boot() -> float:
+        """
+        Monotonic seconds which keep advancing while the system is suspended. Without such a clock the wall clock is
+        being used, so steps of the wall clock are then taken for suspends.
+        """
+        if SUSPEND_AWARE_CLOCK is None:
+            return time.time()
+
+        return time.clock_gettime(SUSPEND_AWARE_CLOCK)
+
+    @staticmethod
+    def now() -> datetime:
+        return datetime.now()
+
+    @staticmethod
+    async def wait(wake_event: asyncio.Event, timeout):
+        """
+        Waits until wake_event is set or timeout seconds passed.
+        :param timeout: seconds to wait at most, None for waiting without limit
+        """
+        try:
+            await asyncio.wait_for(wake_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
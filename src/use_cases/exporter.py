@@ -0,0 +1,75 @@
+import csv
+import datetime
+import json
+from collections import namedtuple
+
+from src.data_sources.data_backend import DataBackend
+from src.data_sources.journal import Journal
+from src.repositories.activity_matcher import ActivityMatcher
+
+ExportRow = namedtuple("ExportRow", ["date", "activity", "time"])
+
+CSV_HEADER = ["date", "activity", "time"]
+
+
+def iter_export_rows(data_backend: DataBackend, start: datetime.date = None, end: datetime.date = None,
+                     activities: list = None, journal: Journal = None):
+    """
+    Yields the tracked time of every day and activity, ordered by date. Month data is being read one month at a time,
+    so memory usage does not grow with the length of the history.
+    :param start: first day to export, defaults to the first day with data
+    :param end: last day to export, defaults to the last day with data
+    :param activities: entries in the format of the activities setting, see ActivityMatcher, every activity is being
+    exported if not set
+    :param journal: if set, records which have not been compacted into the month data yet are being included
+    :return: generator of ExportRow
+    """
+    matcher = ActivityMatcher(activities) if activities else None
+    journal_months = group_journal_records_by_month(journal) if journal is not None else {}
+
+    months = set(data_backend.get_existing_month_dates()) | set(journal_months.keys())
+    for month in sorted(months):
+        next_month = (month + datetime.timedelta(days=32)).replace(day=1)
+        if (start is not None and next_month <= start) or (end is not None and month > end):
+            continue
+
+        month_data = data_backend.read_month_data(month)
+        for record in journal_months.get(month, []):
+            month_data.setdefault(record.start.day, {})[record.name] = record.day_total
+
+        for day in sorted(month_data.keys(), key=int):
+            date = month.replace(day=int(day))
+            if (start is not None and date < start) or (end is not None and date > end):
+                continue
+
+            for activity, time in month_data[day].items():
+                if matcher is None or matcher.matches(activity):
+                    yield ExportRow(date, activity, time)
+
+
+def group_journal_records_by_month(journal: Journal) -> dict:
+    months = {}
+    for record in journal.read_records():
+        months.setdefault(record.start.date().replace(day=1), []).append(record)
+
+    return months
+
+
+def write_csv(rows, file):
+    """Writes rows as CSV with a header line, dates in iso format and time in milliseconds."""
+    writer = csv.writer(file)
+    writer.writerow(CSV_HEADER)
+    for row in rows:
+        writer.writerow([row.date.isoformat(), row.activity, row.time])
+
+
+def write_ndjson(rows, file):
+    """Writes rows as newline delimited JSON objects."""
+    for row in rows:
+        file.write(json.dumps({"date": row.date.isoformat(), "activity": row.activity, "time": row.time}) + "\n")
+
+
+EXPORT_FORMATS = {
+    "csv": write_csv,
+    "ndjson": write_ndjson
+}
@@ -0,0 +1,57 @@
+from PIL import Image, ImageFont
+
+from src.data_sources.data_backend import get_file_stamp
+
+
+class AssetCache:
+
+    def __init__(self):
+        """
+        Loaded fonts and decoded images of the image creators, so TTF files and images are read and parsed once
+        instead of on every drawn element. Fonts are keyed by path, file stamp and size, images by path, file stamp
+        and the size they have been resized to, so files replaced under the same path are loaded again. Cached images
+        are shared and must not be drawn on, see get_image.
+        """
+        self.fonts = {}
+        self.images = {}
+        self.assets = None
+
+    def invalidate_if_changed(self, asset_paths):
+        """
+        Clears the cache if other fonts or images are being used or their files changed since the last call, so
+        assets which are not being used anymore do not stay in memory.
+        :param asset_paths: paths of the current fonts and images, see Theme.get_assets
+        """
+        assets = [(str(path), get_file_stamp(path)) for path in asset_paths]
+        if assets != self.assets:
+            self.clear()
+            self.assets = assets
+
+    def clear(self):
+        self.fonts.clear()
+        self.images.clear()
+
+    def get_font(self, path, size: int):
+        key = (str(path), get_file_stamp(path), size)
+        if key not in self.fonts:
+            self.fonts[key] = ImageFont.truetype(str(path), size)
+
+        return self.fonts[key]
+
+    def get_image(self, path, size: tuple = None, mode: str = None):
+        """
+        :param size: size to resize the image to, the original size if not set
+        :param mode: mode to convert the image to, like RGBA
+        :return: decoded image, callers drawing on it have to copy it first
+        :raise FileNotFoundError: if there is no image at path
+        """
+        key = (str(path), get_file_stamp(path), size, mode)
+        if key not in self.images:
+            with Image.open(path) as image:
+                image = image.convert(mode) if mode is not None else image.copy()
+                if size is not None:
+                    image = image.resize(size, Image.ANTIALIAS)
+
+                self.images[key] = image
+
+        return self.images[key]
@@ -1,13 +1,28 @@
+import hashlib
+import io
+import json
 from abc import ABC, abstractmethod
 
-from PIL import ImageDraw
+from PIL import Image, ImageDraw
 
+from src.data_sources.data_backend import get_file_stamp
+from src.data_sources.image_cache import ImageCache
 from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.image_creator.asset_cache import AssetCache
+from src.use_cases.image_creator.theme import Theme
 
 
 class BaseImageCreator(ABC):
-    def __init__(self, data_repository: CodeTimeDataRepository):
+    # has to be increased whenever the output of render changes, which invalidates the cached images
+    RENDERER_VERSION = 1
+
+    def __init__(self, data_repository: CodeTimeDataRepository, asset_cache: AssetCache = None,
+                 image_cache: ImageCache = None):
         self.data_repository = data_repository
+        self.asset_cache = asset_cache if asset_cache is not None else AssetCache()
+        self.image_cache = image_cache
+        self.theme = None
+        self.theme_version = None
 
     @staticmethod
     def time_as_str(time):
@@ -18,9 +33,63 @@ class BaseImageCreator(ABC):
 
         return f"{hours}h {minutes}min"
 
+    def create_image(self, statistics: dict, scale=1.0) -> ImageDraw:
+        """
+        :param scale: factor the image is being drawn at, like 0.5 for previews, fonts and geometry are scaled
+        instead of resizing the full resolution image
+        """
+        return self.render(statistics, self.get_theme(), scale)
+
     @abstractmethod
-    def create_image(self, statistics: dict) -> ImageDraw:
+    def render(self, statistics: dict, theme: Theme, scale=1.0) -> ImageDraw:
+        """Creates the image of statistics with nothing but theme and the cached assets."""
         pass
 
-    def get_font(self, name):
-        return self.data_repository.get_setting("fonts")[name]
+    def create_png(self, statistics: dict, scale=1.0) -> bytes:
+        """:return: image of statistics encoded as PNG, served from the image cache if it has been rendered before"""
+        theme = self.get_theme()
+        if self.image_cache is None:
+            return encode_png(self.render(statistics, theme, scale))
+
+        key = self.get_image_key(statistics, theme, scale)
+        png = self.image_cache.get(key)
+        if png is None:
+            png = encode_png(self.render(statistics, theme, scale))
+            self.image_cache.put(key, png)
+
+        return png
+
+    def create_cached_image(self, statistics: dict, scale=1.0) -> Image.Image:
+        """Same as create_image, but served from the image cache if it has been rendered before."""
+        return Image.open(io.BytesIO(self.create_png(statistics, scale)))
+
+    def get_image_key(self, statistics: dict, theme: Theme, scale=1.0) -> str:
+        """
+        :return: hash of the statistics, the theme, the files of its fonts and images and the renderer, which changes
+        whenever the rendered image would change
+        """
+        content = json.dumps({
+            "renderer": [type(self).__name__, self.RENDERER_VERSION, scale],
+            "statistics": statistics,
+            "theme": theme.get_values(),
+            "assets": [get_file_stamp(path) for path in theme.get_assets()]
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_theme(self) -> Theme:
+        """:return: theme of the current settings, rebuilt whenever the config version changes"""
+        self.data_repository.get_config()
+        if self.theme is None or self.theme_version != self.data_repository.config_version:
+            self.theme = Theme.from_repository(self.data_repository)
+            self.theme_version = self.data_repository.config_version
+
+        return self.theme
+
+    def load_font(self, theme: Theme, name: str, size: int):
+        return self.asset_cache.get_font(theme.get_font_path(name), size)
+
+
+def encode_png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -1,8 +1,11 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 
 from src.data_sources.errors import BackgroundImageNotFoundError, UserImageNotFoundError
+from src.data_sources.image_cache import ImageCache
 from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.image_creator.asset_cache import AssetCache
 from src.use_cases.image_creator.base_image_creator import BaseImageCreator
+from src.use_cases.image_creator.theme import Theme
 
 
 class BasicImageCreator(BaseImageCreator):
@@ -10,80 +13,91 @@ class BasicImageCreator(BaseImageCreator):
     PROGRESS_BAR_HEIGHT = 20
     USER_IMAGE_SIZE = 125
 
-    def __init__(self, data_repository: CodeTimeDataRepository):
-        super().__init__(data_repository)
+    def __init__(self, data_repository: CodeTimeDataRepository, asset_cache: AssetCache = None,
+                 image_cache: ImageCache = None):
+        super().__init__(data_repository, asset_cache, image_cache)
 
-    def create_image(self, statistics: dict):
+    def render(self, statistics: dict, theme: Theme, scale=1.0):
+        self.asset_cache.invalidate_if_changed(theme.get_assets())
+        image = self.load_background(theme, scale)
+
+        draw = ImageDraw.Draw(image)
+        self.draw_title(draw, theme, scale, statistics["date"])
+        self.draw_total_time(draw, theme, scale, statistics["total_time"])
+        self.draw_activities(draw, theme, scale, statistics["activities"])
+        self.draw_watermark(draw, theme, scale, image.height)
+        self.paste_user_image(image, theme, scale)
+        return image
+
+    def load_background(self, theme: Theme, scale):
+        """:return: copy of the background image at scale, which can be drawn on"""
         try:
-            with Image.open(self.data_repository.get_file_from_setting("image")) as image:
-                draw = ImageDraw.Draw(image)
-                self.draw_title(draw, statistics["date"])
-                self.draw_total_time(draw, statistics["total_time"])
-                self.draw_activities(draw, statistics["activities"])
-                self.draw_watermark(draw, image.height)
-                self.paste_user_image(image)
-                return image
+            image = self.asset_cache.get_image(theme.image_path)
+            if scale != 1:
+                image = self.asset_cache.get_image(
+                    theme.image_path, size=(round(image.width * scale), round(image.height * scale)))
+            return image.copy()
         except FileNotFoundError:
             raise BackgroundImageNotFoundError()
 
-    def paste_user_image(self, image):
+    def paste_user_image(self, image, theme: Theme, scale):
+        user_image_size = round(BasicImageCreator.USER_IMAGE_SIZE * scale)
         try:
-            user_image = Image.open(self.data_repository.get_file_from_setting("user_image"), "r").convert("RGBA")
+            user_image = self.asset_cache.get_image(theme.user_image_path, size=(user_image_size, user_image_size),
+                                                    mode="RGBA")
         except FileNotFoundError:
             raise UserImageNotFoundError()
 
-        user_image = user_image.resize((BasicImageCreator.USER_IMAGE_SIZE, BasicImageCreator.USER_IMAGE_SIZE),
-                                       Image.ANTIALIAS)
-
-        user_image_x = image.width - BasicImageCreator.USER_IMAGE_SIZE - 140
-        user_image_y = 200 - BasicImageCreator.USER_IMAGE_SIZE // 2
+        user_image_x = image.width - user_image_size - round(140 * scale)
+        user_image_y = round(200 * scale) - user_image_size // 2
         image.paste(user_image, (user_image_x, user_image_y), user_image)
 
-    def draw_watermark(self, draw: ImageDraw, max_height):
-        username = self.data_repository.get_setting("username").strip()
+    def draw_watermark(self, draw: ImageDraw, theme: Theme, scale, max_height):
         title = "by code-time"
-        if username != "":
-            title += f" for {username}"
+        if theme.username != "":
+            title += f" for {theme.username}"
 
-        draw.text((140, max_height - 200), title, font=ImageFont.truetype(self.get_font("semi_bold"), 30),
-                  fill=self.data_repository.get_setting("watermark_color"))
+        draw.text((round(140 * scale), max_height - round(200 * scale)), title,
+                  font=self.load_font(theme, "semi_bold", round(30 * scale)),
+                  fill=theme.watermark_color)
 
-    def draw_activity(self, draw: ImageDraw, name: str, time: str, progress: float, x: int, y: int):
-        title_font_size = 40
-        text_progress_margin = 25
+    def draw_activity(self, draw: ImageDraw, theme: Theme, scale, name: str, time: str, progress: float, x: int,
+                      y: int):
+        title_font_size = round(40 * scale)
+        text_progress_margin = round(25 * scale)
+        progress_bar_width = round(BasicImageCreator.PROGRESS_BAR_WIDTH * scale)
 
-        progress_end_y = y + BasicImageCreator.PROGRESS_BAR_HEIGHT + text_progress_margin
+        progress_end_y = y + round(BasicImageCreator.PROGRESS_BAR_HEIGHT * scale) + text_progress_margin
         progress_start_xy = (x, y + text_progress_margin)
 
-        background_end_xy = (x + BasicImageCreator.PROGRESS_BAR_WIDTH, progress_end_y)
-        foreground_end_xy = (x + BasicImageCreator.PROGRESS_BAR_WIDTH * progress, progress_end_y)
+        background_end_xy = (x + progress_bar_width, progress_end_y)
+        foreground_end_xy = (x + progress_bar_width * progress, progress_end_y)
 
-        draw.rectangle((progress_start_xy, background_end_xy),
-                       fill=self.data_repository.get_setting("progress_background_color"))
-        draw.rectangle((progress_start_xy, foreground_end_xy),
-                       fill=self.data_repository.get_setting("progress_foreground_color"))
+        draw.rectangle((progress_start_xy, background_end_xy), fill=theme.progress_background_color)
+        draw.rectangle((progress_start_xy, foreground_end_xy), fill=theme.progress_foreground_color)
 
         # Draw activity title
         draw.text((x, y - title_font_size), name,
-                  font=ImageFont.truetype(self.get_font("semi_bold"), title_font_size),
-                  fill=self.data_repository.get_setting("activity_title_color"))
+                  font=self.load_font(theme, "semi_bold", title_font_size),
+                  fill=theme.activity_title_color)
 
         # Draw activity time
-        draw.text((x + BasicImageCreator.PROGRESS_BAR_WIDTH, y - 20), BasicImageCreator.time_as_str(time),
-                  font=ImageFont.truetype(self.get_font("bold"), 30),
-                  fill=self.data_repository.get_setting("activity_time_color"),
+        draw.text((x + progress_bar_width, y - round(20 * scale)), BasicImageCreator.time_as_str(time),
+                  font=self.load_font(theme, "bold", round(30 * scale)),
+                  fill=theme.activity_time_color,
                   anchor="rt")
 
-    def draw_activities(self, draw: ImageDraw, activities: list):
+    def draw_activities(self, draw: ImageDraw, theme: Theme, scale, activities: list):
         for i, activity in enumerate(activities):
-            self.draw_activity(draw, activity["name"], activity["time"], activity["progress"], 140, 370 + i * 110)
-
-    def draw_total_time(self, draw: ImageDraw, total_time):
-        draw.text((140, 189), BasicImageCreator.time_as_str(total_time),
-                  font=ImageFont.truetype(self.get_font("extra_bold"), 60),
-                  fill=self.data_repository.get_setting("total_time_color"), )
-
-    def draw_title(self, draw: ImageDraw, date: str):
-        draw.text((140, 134), f"Coding statistics of {date}",
-                  font=ImageFont.truetype(self.get_font("semi_bold"), 40),
-                  fill=self.data_repository.get_setting("title_color"), )
+            self.draw_activity(draw, theme, scale, activity["name"], activity["time"], activity["progress"],
+                               round(140 * scale), round((370 + i * 110) * scale))
+
+    def draw_total_time(self, draw: ImageDraw, theme: Theme, scale, total_time):
+        draw.text((round(140 * scale), round(189 * scale)), BasicImageCreator.time_as_str(total_time),
+                  font=self.load_font(theme, "extra_bold", round(60 * scale)),
+                  fill=theme.total_time_color, )
+
+    def draw_title(self, draw: ImageDraw, theme: Theme, scale, date: str):
+        draw.text((round(140 * scale), round(134 * scale)), f"Coding statistics of {date}",
+                  font=self.load_font(theme, "semi_bold", round(40 * scale)),
+                  fill=theme.title_color, )
@@ -0,0 +1,165 @@
+import datetime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from PIL import Image, ImageDraw
+
+from src.data_sources.errors import DataNotAvailableError
+from src.data_sources.image_cache import ImageCache
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.image_creator.asset_cache import AssetCache
+from src.use_cases.image_creator.basic_image_creator import BasicImageCreator
+from src.use_cases.image_creator.theme import Theme
+
+# share of the space of a bar which is left empty, only if the bars are wide enough for a visible gap
+BAR_GAP = 0.2
+MIN_BAR_WIDTH_WITH_GAP = 3
+
+
+def get_summary_range(date: datetime.date, summary_range: str):
+    """:return: first and last day of the week, month or year containing date"""
+    if summary_range == "week":
+        start = date - datetime.timedelta(days=date.weekday())
+        return start, start + datetime.timedelta(days=6)
+    elif summary_range == "month":
+        next_month = (date.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+        return date.replace(day=1), next_month - datetime.timedelta(days=1)
+    else:
+        return date.replace(month=1, day=1), date.replace(month=12, day=31)
+
+
+def get_day_totals(statistics: dict) -> list:
+    """:return: total time of every day of range statistics with granularity day, zero for days without data"""
+    day_totals = [0] * ((statistics["end"] - statistics["start"]).days + 1)
+    for period in statistics["periods"]:
+        day_totals[(period["start"] - statistics["start"]).days] = period["total_time"]
+
+    return day_totals
+
+
+def create_bar_mask(values: list, width: int, height: int):
+    """
+    Computes the pixels of a bar chart with one bar per value in a single pass over an array of shape (height,
+    width), instead of drawing every bar on its own. Bars are scaled to the largest value.
+    :return: mask image of mode L, 255 for pixels of bars
+    """
+    values = numpy.asarray(values, dtype=numpy.float64)
+    bar_heights = numpy.rint(values / max(values.max(), 1) * height).astype(numpy.int64)
+
+    bar_width = width / len(values)
+    columns = numpy.arange(width)
+    bar_indices = numpy.minimum((columns / bar_width).astype(numpy.int64), len(values) - 1)
+    column_heights = bar_heights[bar_indices]
+
+    if bar_width >= MIN_BAR_WIDTH_WITH_GAP:
+        position_in_bar = (columns + 0.5) / bar_width - bar_indices
+        column_heights[position_in_bar > 1 - BAR_GAP] = 0
+
+    rows = numpy.arange(height)[:, None]
+    mask = rows >= height - column_heights[None, :]
+    return Image.fromarray(mask.astype(numpy.uint8) * 255, mode="L")
+
+
+class SummaryImageCreator(BasicImageCreator):
+    SUMMARY_RANGE = None
+
+    CHART_Y = 330
+    CHART_HEIGHT = 400
+    ACTIVITIES_Y = 930
+
+    def __init__(self, data_repository: CodeTimeDataRepository, asset_cache: AssetCache = None,
+                 image_cache: ImageCache = None):
+        """
+        Summary of a week, month or year with a bar chart of the total time of every day and the top activities of
+        the whole range. Images are created from the statistics of get_summary_statistics.
+        """
+        super().__init__(data_repository, asset_cache, image_cache)
+
+    def get_summary_statistics(self, date: datetime.date) -> dict:
+        """
+        :return: range statistics of the range of SUMMARY_RANGE containing date, see
+        CodeTimeDataRepository.get_range_statistics, with the title of the range as date
+        """
+        start, end = get_summary_range(date, self.SUMMARY_RANGE)
+        statistics = self.data_repository.get_range_statistics(start, end, "day")
+        if statistics["total_time"] == 0:
+            raise DataNotAvailableError()
+
+        statistics["date"] = self.get_title(start, end)
+        return statistics
+
+    def get_title(self, start: datetime.date, end: datetime.date) -> str:
+        return f"{start.strftime('%b %d')} - {end.strftime('%b %d %Y')}"
+
+    def render(self, statistics: dict, theme: Theme, scale=1.0):
+        self.asset_cache.invalidate_if_changed(theme.get_assets())
+        image = self.load_background(theme, scale)
+
+        draw = ImageDraw.Draw(image)
+        self.draw_title(draw, theme, scale, statistics["date"])
+        self.draw_total_time(draw, theme, scale, statistics["total_time"])
+        self.draw_chart(image, draw, theme, scale, statistics)
+        self.draw_summary_activities(draw, theme, scale, statistics["activities"])
+        self.draw_watermark(draw, theme, scale, image.height)
+        self.paste_user_image(image, theme, scale)
+        return image
+
+    def draw_chart(self, image, draw: ImageDraw, theme: Theme, scale, statistics: dict):
+        x = round(140 * scale)
+        y = round(self.CHART_Y * scale)
+        width = round(BasicImageCreator.PROGRESS_BAR_WIDTH * scale)
+        height = round(self.CHART_HEIGHT * scale)
+        day_totals = get_day_totals(statistics)
+
+        if numpy is not None:
+            image.paste(theme.progress_foreground_color, (x, y, x + width, y + height),
+                        create_bar_mask(day_totals, width, height))
+        else:
+            bar_width = width / len(day_totals)
+            gap = bar_width * BAR_GAP if bar_width >= MIN_BAR_WIDTH_WITH_GAP else 0
+            for index, day_total in enumerate(day_totals):
+                bar_height = round(day_total / max(max(day_totals), 1) * height)
+                if bar_height > 0:
+                    draw.rectangle((x + round(index * bar_width), y + height - bar_height,
+                                    x + round((index + 1) * bar_width - gap) - 1, y + height - 1),
+                                   fill=theme.progress_foreground_color)
+
+        draw.rectangle((x, y + height, x + width, y + height + max(round(2 * scale), 1)),
+                       fill=theme.progress_background_color)
+
+        label_font = self.load_font(theme, "semi_bold", round(30 * scale))
+        label_y = y + height + round(15 * scale)
+        draw.text((x, label_y), statistics["start"].strftime("%b %d"), font=label_font,
+                  fill=theme.activity_title_color)
+        draw.text((x + width, label_y), statistics["end"].strftime("%b %d"), font=label_font,
+                  fill=theme.activity_title_color, anchor="ra")
+
+    def draw_summary_activities(self, draw: ImageDraw, theme: Theme, scale, activities: list):
+        activities = CodeTimeDataRepository.summarize_activities(
+            [{"name": activity["name"], "time": activity["time"]} for activity in activities])
+        total_time = sum(activity["time"] for activity in activities)
+
+        for i, activity in enumerate(activities):
+            self.draw_activity(draw, theme, scale, activity["name"], activity["time"], activity["time"] / total_time,
+                               round(140 * scale), round((self.ACTIVITIES_Y + i * 110) * scale))
+
+
+class WeekSummaryImageCreator(SummaryImageCreator):
+    SUMMARY_RANGE = "week"
+
+
+class MonthSummaryImageCreator(SummaryImageCreator):
+    SUMMARY_RANGE = "month"
+
+    def get_title(self, start: datetime.date, end: datetime.date) -> str:
+        return start.strftime("%B %Y")
+
+
+class YearSummaryImageCreator(SummaryImageCreator):
+    SUMMARY_RANGE = "year"
+
+    def get_title(self, start: datetime.date, end: datetime.date) -> str:
+        return str(start.year)
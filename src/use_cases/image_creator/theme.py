@@ -0,0 +1,62 @@
+from PIL import ImageColor
+
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+
+COLOR_SETTINGS = ["title_color", "total_time_color", "progress_background_color", "progress_foreground_color",
+                  "activity_title_color", "activity_time_color", "watermark_color"]
+
+
+class Theme:
+    __slots__ = COLOR_SETTINGS + ["fonts", "image_path", "user_image_path", "username"]
+
+    def __init__(self, colors: dict, fonts: dict, image_path: str, user_image_path: str, username: str):
+        """
+        Immutable snapshot of the settings an image is being rendered with, so rendering is a function of the
+        statistics and the theme only. Colors are parsed into RGB tuples and paths are resolved once, instead of
+        looking up settings for every drawn element. Themes are hashable and equal if all their values are equal.
+        :param colors: dict of every name of COLOR_SETTINGS and its RGB tuple
+        :param fonts: dict of font names, like semi_bold, and resolved font paths
+        """
+        for name in COLOR_SETTINGS:
+            object.__setattr__(self, name, colors[name])
+
+        object.__setattr__(self, "fonts", tuple(sorted(fonts.items())))
+        object.__setattr__(self, "image_path", image_path)
+        object.__setattr__(self, "user_image_path", user_image_path)
+        object.__setattr__(self, "username", username)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Theme is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Theme is immutable")
+
+    def get_values(self) -> tuple:
+        return tuple(getattr(self, name) for name in Theme.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, Theme) and self.get_values() == other.get_values()
+
+    def __hash__(self):
+        return hash(self.get_values())
+
+    def __repr__(self):
+        return f"Theme({', '.join(f'{name}={getattr(self, name)!r}' for name in Theme.__slots__)})"
+
+    def get_font_path(self, name: str) -> str:
+        return dict(self.fonts)[name]
+
+    def get_assets(self) -> tuple:
+        """:return: paths of every font and image of the theme"""
+        return tuple(path for _, path in self.fonts) + (self.image_path, self.user_image_path)
+
+    @staticmethod
+    def from_repository(data_repository: CodeTimeDataRepository):
+        """:return: theme of the current settings"""
+        return Theme(
+            colors={name: ImageColor.getrgb(data_repository.get_setting(name)) for name in COLOR_SETTINGS},
+            fonts={name: data_repository.get_res_file_path(path)
+                   for name, path in data_repository.get_setting("fonts").items()},
+            image_path=data_repository.get_file_from_setting("image"),
+            user_image_path=data_repository.get_file_from_setting("user_image"),
+            username=data_repository.get_setting("username").strip())
@@ -0,0 +1,161 @@
+import csv
+import datetime
+import hashlib
+import json
+from collections import namedtuple
+from pathlib import Path
+
+from src.data_sources.data_backend import DataBackend
+from src.data_sources.data_backend_factory import open_data_directory
+from src.data_sources.errors import InvalidImportSourceError
+from src.data_sources.import_ledger import ImportLedger
+from src.data_sources.rollups import get_month_key
+
+ImportResult = namedtuple("ImportResult", ["name", "imported_months", "skipped"])
+
+CSV_SUFFIXES = [".csv"]
+NDJSON_SUFFIXES = [".ndjson", ".jsonl"]
+
+
+def read_source_months(source: Path) -> dict:
+    """
+    Reads the tracked time of another data directory, in any storage format, or of an export created by the export
+    command.
+    :return: dict of first days of months and their month data
+    """
+    source = Path(source)
+    if source.is_dir():
+        data_backend = open_data_directory(source)
+        return {month: data_backend.read_month_data(month) for month in data_backend.get_existing_month_dates()}
+
+    if source.suffix in CSV_SUFFIXES:
+        with open(source, "r", newline="") as file:
+            return group_rows_by_month(csv.DictReader(file), source)
+
+    if source.suffix in NDJSON_SUFFIXES:
+        with open(source, "r") as file:
+            return group_rows_by_month((json.loads(line) for line in file if line.strip()), source)
+
+    raise InvalidImportSourceError(message=f"Can not import {source}, expected a data directory, a .csv or a "
+                                           f".ndjson export")
+
+
+def group_rows_by_month(rows, source: Path) -> dict:
+    """Sums up rows with date, activity and time keys into month data, rows may be in any order."""
+    months = {}
+    try:
+        for row in rows:
+            date = datetime.date.fromisoformat(row["date"])
+            activities = months.setdefault(date.replace(day=1), {}).setdefault(date.day, {})
+            activities[row["activity"]] = activities.get(row["activity"], 0) + int(row["time"])
+    except (KeyError, TypeError, ValueError):
+        raise InvalidImportSourceError(message=f"Can not import {source}, it contains an invalid row")
+
+    return months
+
+
+def hash_month_data(month_data: dict) -> str:
+    """:return: sha256 of the month data which does not depend on the order of days and activities"""
+    content = json.dumps({str(day): activities for day, activities in month_data.items()}, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def hash_source_months(source_months: dict) -> str:
+    content = "\n".join(f"{get_month_key(month)} {hash_month_data(source_months[month])}"
+                        for month in sorted(source_months.keys()))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def subtract_month_data(month_data: dict, imported_month_data: dict) -> dict:
+    """:return: time of month_data minus the time already imported, only days and activities which changed"""
+    difference = {}
+    for day in month_data.keys() | imported_month_data.keys():
+        activities = month_data.get(day, {})
+        imported_activities = imported_month_data.get(day, {})
+
+        for name in activities.keys() | imported_activities.keys():
+            time = activities.get(name, 0) - imported_activities.get(name, 0)
+            if time != 0:
+                difference.setdefault(day, {})[name] = time
+
+    return difference
+
+
+def merge_month_data(month_data: dict, difference: dict) -> dict:
+    """Adds difference to month_data in place, activities and days ending up without time are removed."""
+    for day, activities in difference.items():
+        day_data = month_data.setdefault(day, {})
+        for name, time in activities.items():
+            day_data[name] = day_data.get(name, 0) + time
+            if day_data[name] <= 0:
+                del day_data[name]
+
+        if not day_data:
+            del month_data[day]
+
+    return month_data
+
+
+def recover_pending_month(data_backend: DataBackend, ledger: ImportLedger):
+    """
+    Completes the month of an interrupted import. If the local month data still is the one from before the import,
+    the write did not happen and the month is imported again, otherwise it is recorded as imported.
+    """
+    pending = ledger.get_pending()
+    if pending is None:
+        return
+
+    month = datetime.date.fromisoformat(pending["month"])
+    if hash_month_data(data_backend.read_month_data(month)) == pending["previous_hash"]:
+        ledger.discard_pending()
+    else:
+        ledger.record_month(pending["name"], get_month_key(month), pending["hash"], pending["data"])
+
+
+def import_tracking_data(data_backend: DataBackend, ledger: ImportLedger, source: Path, name: str = None):
+    """
+    Merges the tracked time of source into the month data of data_backend by summing up the time of every day and
+    activity. Every month is being read and written once, no matter how many records it receives.
+
+    Importing is idempotent: a source whose content has been imported before is skipped, and importing a source
+    again under the same name, for example the data directory of another machine which kept on tracking, only adds
+    the time tracked since the last import. The journal of data_backend has to be compacted before, as months are
+    being merged with their month data files.
+    :param source: data directory or export, see read_source_months
+    :param name: name of the source in the ledger, defaults to the resolved path of source
+    :return: ImportResult
+    """
+    name = name or str(Path(source).resolve())
+    source_months = read_source_months(source)
+    recover_pending_month(data_backend, ledger)
+
+    source_hash = hash_source_months(source_months)
+    if ledger.get_source_with_hash(source_hash) is not None:
+        return ImportResult(name, 0, True)
+
+    imported_months = 0
+    for month in sorted(source_months.keys()):
+        month_data = source_months[month]
+        month_hash = hash_month_data(month_data)
+        imported = ledger.get_imported_month(name, get_month_key(month))
+        if imported is not None and imported["hash"] == month_hash:
+            continue
+
+        difference = subtract_month_data(month_data, imported["data"] if imported is not None else {})
+        if difference:
+            local_month_data = data_backend.read_month_data(month)
+            # recorded before the write and completed after it, so an interrupted import never repeats a month
+            ledger.record_pending(name, month, month_hash, month_data, hash_month_data(local_month_data))
+
+            merged = merge_month_data(local_month_data, difference)
+            if merged:
+                data_backend.write_month_data(merged, month)
+            else:
+                data_backend.remove_month_data(month)
+
+            imported_months += 1
+
+        ledger.record_month(name, get_month_key(month), month_hash, month_data)
+
+    ledger.record_source(name, source_hash)
+    return ImportResult(name, imported_months, False)
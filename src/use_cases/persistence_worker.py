@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+
+FLUSH_INTERVAL = 30
+FLUSH_EVENTS = 50
+COMPACTION_INTERVAL = 300
+
+
+class PersistenceWorker:
+
+    def __init__(self, data_repository: CodeTimeDataRepository, flush_interval=FLUSH_INTERVAL,
+                 flush_events=FLUSH_EVENTS, compaction_interval=COMPACTION_INTERVAL):
+        """
+        Task of the asyncio runtime which writes the records buffered by the repository to disk, at the latest every
+        flush_interval seconds or as soon as flush_events records are pending, whatever comes first. Every
+        compaction_interval seconds the journal is additionally being folded into the month data files.
+
+        If the process crashes at most the records of one flush interval are lost.
+        """
+        self.data_repository = data_repository
+        self.flush_interval = flush_interval
+        self.flush_events = flush_events
+        self.compaction_interval = compaction_interval
+
+        self.quit_app = False
+        self.flush_count = 0
+
+        self.loop = None
+        self.flush_event = None
+
+        self.data_repository.pending_listener = self.on_pending_changed
+
+    def set_flush_event(self):
+        """Wakes up run_async, can be called from any thread."""
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.flush_event.set)
+            except RuntimeError:
+                # the loop has been closed after the worker stopped
+                pass
+
+    def on_pending_changed(self, pending_count):
+        if pending_count >= self.flush_events:
+            self.set_flush_event()
+
+    def on_quit(self):
+        self.quit_app = True
+        self.set_flush_event()
+
+    async def run_async(self):
+        """
+        Flushes until on_quit is called or the task is cancelled, flushes and compacts a last time in both cases.
+        Writes run on the loop thread, which only hosts background tasks, so they delay no user interface.
+        """
+        self.flush_event = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        last_compaction = time.monotonic()
+
+        try:
+            while not self.quit_app:
+                try:
+                    await asyncio.wait_for(self.flush_event.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self.flush_event.clear()
+
+                self.data_repository.flush()
+                self.flush_count += 1
+
+                if time.monotonic() - last_compaction >= self.compaction_interval:
+                    self.data_repository.compact_journal()
+                    last_compaction = time.monotonic()
+        finally:
+            self.loop = None
+            self.data_repository.flush()
+            self.data_repository.compact_journal()
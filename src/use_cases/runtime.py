@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import traceback
+
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+
+CONFIG_WATCH_INTERVAL = 5
+
+
+class ConfigWatcher:
+
+    def __init__(self, data_repository: CodeTimeDataRepository, interval=CONFIG_WATCH_INTERVAL):
+        """
+        Reloads the config every interval seconds if it has been changed on disk, for example by another instance
+        or by hand, and calls the listeners once the config version changed.
+        """
+        self.data_repository = data_repository
+        self.interval = interval
+        self.listeners = []
+        self.config_version = None
+
+    def add_listener(self, listener):
+        """:param listener: function called without arguments on the loop thread after the config changed"""
+        self.listeners.append(listener)
+
+    def check(self):
+        self.data_repository.get_config()
+        if self.config_version is not None and self.config_version != self.data_repository.config_version:
+            for listener in self.listeners:
+                listener()
+
+        self.config_version = self.data_repository.config_version
+
+    async def run_async(self):
+        while True:
+            self.check()
+            await asyncio.sleep(self.interval)
+
+
+class Runtime(threading.Thread):
+
+    def __init__(self, tasks: list, on_failed=None):
+        """
+        Runs the background tasks of the app, like tracking, persistence and config watching, as cooperative tasks
+        of one asyncio loop on a dedicated thread, instead of one thread with its own sleep loop per task. The Qt
+        event loop keeps the main thread, both sides talk through thread safe calls like ActivityTracker.on_quit.
+
+        stop cancels every task in the order of tasks and waits for it to finish before cancelling the next one, so
+        the final writes of the tracker are flushed by the persistence task after it.
+
+        A task which fails before stop is reported right away, as tracking or persisting would otherwise silently
+        end for the rest of the session.
+        :param tasks: functions returning the coroutine of a task, like ActivityTracker.run_async
+        :param on_failed: function called with the exception of a failed task on the loop thread
+        """
+        super().__init__(name="code-time runtime")
+        self.task_functions = tasks
+        self.loop = None
+        self.stop_event = None
+        self.on_failed = on_failed
+        self.started = threading.Event()
+        self.errors = []
+
+    def run(self):
+        asyncio.run(self.main())
+
+    async def main(self):
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        tasks = [asyncio.create_task(task_function()) for task_function in self.task_functions]
+        for task in tasks:
+            task.add_done_callback(self.on_task_done)
+        self.started.set()
+
+        await self.stop_event.wait()
+        for task in tasks:
+            task.cancel()
+            result = (await asyncio.gather(task, return_exceptions=True))[0]
+            if isinstance(result, Exception) and result not in self.errors:
+                self.errors.append(result)
+
+    def on_task_done(self, task: asyncio.Task):
+        if task.cancelled() or task.exception() is None or self.stop_event.is_set():
+            # failures while stopping are collected by main
+            return
+
+        self.errors.append(task.exception())
+        traceback.print_exception(type(task.exception()), task.exception(), task.exception().__traceback__)
+        if self.on_failed is not None:
+            self.on_failed(task.exception())
+
+    def stop(self):
+        """Cancels every task, can be called from any thread, join waits until the tasks finished."""
+        self.started.wait()
+        self.loop.call_soon_threadsafe(self.stop_event.set)
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.data_sources.atomic_file import atomic_write
+
+
+class AtomicFileTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.directory.name).joinpath("01-2020.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_atomic_write(self):
+        with atomic_write(self.file_path) as file:
+            file.write("{}")
+
+        with open(self.file_path, "r") as file:
+            self.assertEqual("{}", file.read())
+
+        self.assertEqual(["01-2020.json"], os.listdir(self.directory.name))
+
+    def test_atomic_write_keeps_old_content_on_error(self):
+        with open(self.file_path, "w") as file:
+            file.write("{}")
+
+        with self.assertRaises(RuntimeError):
+            with atomic_write(self.file_path) as file:
+                file.write('{"1": ')
+                raise RuntimeError()
+
+        with open(self.file_path, "r") as file:
+            self.assertEqual("{}", file.read())
+
+        self.assertEqual(["01-2020.json"], os.listdir(self.directory.name))
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from src.data_sources.columnar_data_backend import ColumnarDataBackend, convert_json_to_columnar, \
+    convert_columnar_to_json
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD
+from src.data_sources.errors import InvalidMonthDataFileError
+
+
+class ColumnarDataBackendTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_directory = Path(self.directory.name).joinpath("data")
+        self.paths = {
+            DATA_FILES_PATH_KEYWORD: self.data_directory
+        }
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    @staticmethod
+    def get_default_month_data():
+        return {
+            1: {
+                "PyCharm": 20000,
+                "IntelliJ": 5000
+            },
+            15: {
+                "Terminal": 1000,
+                "PyCharm": 86400000
+            },
+            31: {
+                "Visual Studio Code ✓": 3000
+            }
+        }
+
+    def test_get_data_file_path(self):
+        data_backend = ColumnarDataBackend(self.paths)
+        result = data_backend.get_data_file_path(date(2020, 1, 1))
+
+        self.assertEqual(self.data_directory.joinpath("01-2020.ctm"), result)
+
+    def test_write_and_read_month_data(self):
+        data_backend = ColumnarDataBackend(self.paths)
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 1, 1))
+
+        self.assertEqual(self.get_default_month_data(), data_backend.read_month_data(date(2020, 1, 1)))
+
+    def test_read_month_data_file_not_available(self):
+        data_backend = ColumnarDataBackend(self.paths)
+        self.assertEqual({}, data_backend.read_month_data(date(2020, 1, 1)))
+
+    def test_read_day_data(self):
+        data_backend = ColumnarDataBackend(self.paths)
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 1, 1))
+
+        for day in [1, 15, 31]:
+            result = data_backend.read_day_data(date(2020, 1, day))
+            self.assertEqual(self.get_default_month_data()[day], result)
+
+        self.assertEqual({}, data_backend.read_day_data(date(2020, 1, 2)))
+        self.assertEqual({}, data_backend.read_day_data(date(2020, 2, 1)))
+
+    def test_read_month_data_invalid_file(self):
+        data_backend = ColumnarDataBackend(self.paths)
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 1, 1))
+
+        file_path = data_backend.get_data_file_path(date(2020, 1, 1))
+        with open(file_path, "r+b") as file:
+            file.truncate(os.path.getsize(file_path) - 2)
+
+        self.assertRaises(InvalidMonthDataFileError, data_backend.read_month_data, date(2020, 1, 1))
+
+    def test_get_existing_years_and_months(self):
+        data_backend = ColumnarDataBackend(self.paths)
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 12, 1))
+        data_backend.write_month_data(self.get_default_month_data(), date(2021, 1, 1))
+
+        with open(self.data_directory.joinpath("05-2019.json"), "w") as file:
+            file.write(json.dumps(self.get_default_month_data()))
+
+        self.assertEqual([2020, 2021], data_backend.get_existing_years())
+        self.assertEqual([12], data_backend.get_existing_months(date(2020, 1, 1)))
+
+    def test_convert_json_to_columnar_and_back(self):
+        json_backend = DataBackend(self.paths)
+        json_backend.write_month_data(self.get_default_month_data(), date(2020, 12, 1))
+        json_backend.write_month_data({2: {"PyCharm": 1000}}, date(2021, 1, 1))
+
+        convert_json_to_columnar(self.paths)
+
+        columnar_backend = ColumnarDataBackend(self.paths)
+        self.assertEqual([], json_backend.get_existing_years())
+        self.assertEqual(self.get_default_month_data(), columnar_backend.read_month_data(date(2020, 12, 1)))
+        self.assertEqual({2: {"PyCharm": 1000}}, columnar_backend.read_month_data(date(2021, 1, 1)))
+
+        convert_columnar_to_json(self.paths)
+
+        self.assertEqual([], columnar_backend.get_existing_years())
+        self.assertEqual(self.get_default_month_data(), json_backend.read_month_data(date(2020, 12, 1)))
+        self.assertEqual({2: {"PyCharm": 1000}}, json_backend.read_month_data(date(2021, 1, 1)))
+
+    def test_file_smaller_than_json(self):
+        month_data = {day: {f"Activity {i}": i * 1000 for i in range(20)} for day in range(1, 32)}
+
+        DataBackend(self.paths).write_month_data(month_data, date(2020, 1, 1))
+        ColumnarDataBackend(self.paths).write_month_data(month_data, date(2020, 1, 1))
+
+        json_size = os.path.getsize(self.data_directory.joinpath("01-2020.json"))
+        columnar_size = os.path.getsize(self.data_directory.joinpath("01-2020.ctm"))
+        self.assertLess(columnar_size, json_size)
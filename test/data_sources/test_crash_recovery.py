@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from src.data_sources.atomic_file import get_backup_path
+from src.data_sources.columnar_data_backend import ColumnarDataBackend
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD, CONFIG_FILE_PATH_KEYWORD
+from src.data_sources.errors import CorruptMonthDataError, CorruptConfigError
+
+real_replace = os.replace
+
+
+class CrashRecoveryContract:
+    """Fault injection tests simulating crashes and corrupt files, run for every file based storage backend."""
+    backend_class = DataBackend
+    crash_target = None
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = {
+            DATA_FILES_PATH_KEYWORD: Path(self.directory.name).joinpath("data"),
+            CONFIG_FILE_PATH_KEYWORD: Path(self.directory.name).joinpath("config.json")
+        }
+        self.data_backend = self.backend_class(self.paths)
+        self.month = date(2020, 1, 1)
+        self.file_path = self.data_backend.get_data_file_path(self.month)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write_generations(self):
+        self.data_backend.write_month_data({1: {"PyCharm": 1000}}, self.month)
+        self.data_backend.write_month_data({1: {"PyCharm": 2000}}, self.month)
+
+    def crash_on_replace_of(self, file_path):
+        def replace(source, target):
+            if Path(target) == file_path:
+                raise OSError("Simulated crash")
+
+            real_replace(source, target)
+
+        return patch("src.data_sources.atomic_file.os.replace", side_effect=replace)
+
+    def truncate(self, file_path, size):
+        with open(file_path, "r+b") as file:
+            file.truncate(size)
+
+    def test_crash_before_rename_keeps_old_content(self):
+        self.write_generations()
+
+        with self.crash_on_replace_of(self.file_path):
+            self.assertRaises(OSError, self.data_backend.write_month_data, {1: {"PyCharm": 3000}}, self.month)
+
+        self.assertEqual({1: {"PyCharm": 2000}}, self.backend_class(self.paths).read_month_data(self.month))
+        self.assertEqual(["01-2020" + self.backend_class.DATA_FILE_EXTENSION],
+                         [name for name in os.listdir(self.paths[DATA_FILES_PATH_KEYWORD])
+                          if name.startswith("01-2020") and not name.endswith(".bak")])
+
+    def test_crash_during_write_keeps_old_content(self):
+        self.write_generations()
+
+        with patch(self.crash_target, side_effect=OSError("Simulated crash")):
+            self.assertRaises(OSError, self.data_backend.write_month_data, {1: {"PyCharm": 3000}}, self.month)
+
+        self.assertEqual({1: {"PyCharm": 2000}}, self.data_backend.read_month_data(self.month))
+
+    def test_truncated_file_falls_back_to_backup(self):
+        self.write_generations()
+        self.truncate(self.file_path, os.path.getsize(self.file_path) // 2)
+
+        self.assertEqual({1: {"PyCharm": 1000}}, self.data_backend.read_month_data(self.month))
+        self.assertTrue(self.data_backend.is_month_data_corrupt(self.month))
+
+    def test_empty_file_falls_back_to_backup(self):
+        self.write_generations()
+        self.truncate(self.file_path, 0)
+
+        self.assertEqual({1: {"PyCharm": 1000}}, self.data_backend.read_month_data(self.month))
+
+    def test_file_and_backup_corrupt(self):
+        self.write_generations()
+        self.truncate(self.file_path, 3)
+        self.truncate(get_backup_path(self.file_path), 3)
+
+        self.assertRaises(CorruptMonthDataError, self.data_backend.read_month_data, self.month)
+
+    def test_write_after_corruption_keeps_good_backup(self):
+        self.write_generations()
+        self.truncate(self.file_path, 3)
+
+        self.data_backend.write_month_data({1: {"PyCharm": 3000}}, self.month)
+        self.truncate(self.file_path, 3)
+
+        self.assertEqual({1: {"PyCharm": 1000}}, self.data_backend.read_month_data(self.month))
+
+    def test_write_syncs_to_disk(self):
+        with patch("src.data_sources.atomic_file.os.fsync", wraps=os.fsync) as fsync:
+            self.data_backend.write_month_data({1: {"PyCharm": 1000}}, self.month)
+
+        self.assertGreaterEqual(fsync.call_count, 2)
+
+    def test_remove_month_data_removes_backup(self):
+        self.write_generations()
+        self.data_backend.remove_month_data(self.month)
+
+        self.assertFalse(get_backup_path(self.file_path).exists())
+        self.assertEqual({}, self.data_backend.read_month_data(self.month))
+
+
+class JsonCrashRecoveryTest(CrashRecoveryContract, unittest.TestCase):
+    backend_class = DataBackend
+    crash_target = "src.data_sources.data_backend.json.dumps"
+
+    def test_corrupt_config_falls_back_to_backup(self):
+        self.data_backend.write_config({"enabled": True})
+        self.data_backend.write_config({"enabled": False})
+
+        with open(self.paths[CONFIG_FILE_PATH_KEYWORD], "w") as file:
+            file.write('{"enab')
+
+        self.assertEqual({"enabled": True}, self.data_backend.read_config())
+
+    def test_config_and_backup_corrupt(self):
+        self.data_backend.write_config({"enabled": True})
+
+        for path in (self.paths[CONFIG_FILE_PATH_KEYWORD], get_backup_path(self.paths[CONFIG_FILE_PATH_KEYWORD])):
+            with open(path, "w") as file:
+                file.write(json.dumps([]))
+
+        self.assertRaises(CorruptConfigError, self.data_backend.read_config)
+
+
+class ColumnarCrashRecoveryTest(CrashRecoveryContract, unittest.TestCase):
+    backend_class = ColumnarDataBackend
+    crash_target = "src.data_sources.columnar_data_backend.ColumnarDataBackend.write_column"
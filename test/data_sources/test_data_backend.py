@@ -6,10 +6,12 @@ from datetime import date
 from os import listdir
 from pathlib import Path
 
+from src.data_sources.columnar_data_backend import ColumnarDataBackend
 from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD, CONFIG_FILE_PATH_KEYWORD, \
-    RES_DIRECTORY_KEYWORD
+    RES_DIRECTORY_KEYWORD, convert_month_data
 from src.data_sources.errors import MonthDataFileNotFoundError, EmptyMonthDataError, ConfigFileNotFoundError, \
-    EmptyConfigError, InvalidMonthDataFileNameError
+    EmptyConfigError, InvalidMonthDataFileNameError, InvalidStorageBackendError
+from src.data_sources.sqlite_data_backend import SqliteDataBackend
 
 
 class DataBackendTest(unittest.TestCase):
@@ -261,6 +263,37 @@ class DataBackendTest(unittest.TestCase):
 
         self.assertEqual(expected_result, result)
 
+    def test_get_days_with_data_rebuilds_missing_index(self):
+        paths = {
+            DATA_FILES_PATH_KEYWORD: self.data_directory
+        }
+
+        with open(os.path.join(self.data_directory, "12-2020.json"), "w") as file:
+            file.write(json.dumps({1: {"PyCharm": 1000}}))
+
+        data_backend = DataBackend(paths)
+        data_backend.get_days_with_data()
+        os.remove(os.path.join(self.data_directory, "12-2020.json"))
+
+        self.assertEqual({2020: {12: [1]}}, DataBackend(paths).get_days_with_data())
+
+        os.remove(os.path.join(self.data_directory, "days_index.json"))
+        self.assertEqual({}, DataBackend(paths).get_days_with_data())
+
+    def test_write_month_data_updates_days_index(self):
+        paths = {
+            DATA_FILES_PATH_KEYWORD: self.data_directory
+        }
+
+        data_backend = DataBackend(paths)
+        data_backend.write_month_data({1: {"PyCharm": 1000}}, date(2020, 12, 1))
+        self.assertEqual({2020: {12: [1]}}, data_backend.get_days_with_data())
+
+        data_backend.write_month_data({1: {"PyCharm": 1000}, 2: {"PyCharm": 1000}}, date(2020, 12, 1))
+        data_backend.write_month_data({5: {"PyCharm": 1000}}, date(2021, 1, 1))
+
+        self.assertEqual({2020: {12: [1, 2]}, 2021: {1: [5]}}, DataBackend(paths).get_days_with_data())
+
     def test_get_res_file_path(self):
         paths = {
             RES_DIRECTORY_KEYWORD: Path("/")
@@ -287,3 +320,165 @@ class DataBackendTest(unittest.TestCase):
 
         data_backend = DataBackend(paths)
         self.assertFalse(data_backend.does_config_file_exist())
+
+
+class DataBackendContract:
+    """Tests of the DataBackend interface which every storage backend has to pass."""
+    backend_class = DataBackend
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = {
+            DATA_FILES_PATH_KEYWORD: Path(self.directory.name).joinpath("data")
+        }
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def create_data_backend(self):
+        return self.backend_class(self.paths)
+
+    @staticmethod
+    def get_default_month_data():
+        return {
+            1: {
+                "PyCharm": 20000,
+                "IntelliJ": 5000
+            },
+            31: {
+                "Terminal": 1000
+            }
+        }
+
+    def test_read_month_data_no_data(self):
+        data_backend = self.create_data_backend()
+        self.assertDictEqual({}, data_backend.read_month_data(date(2020, 1, 1)))
+
+    def test_write_month_data_empty_data(self):
+        data_backend = self.create_data_backend()
+        self.assertRaises(EmptyMonthDataError, data_backend.write_month_data, {}, date(2020, 1, 1))
+
+    def test_write_and_read_month_data(self):
+        data_backend = self.create_data_backend()
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 1, 1))
+
+        self.assertDictEqual(self.get_default_month_data(), data_backend.read_month_data(date(2020, 1, 1)))
+        self.assertDictEqual({}, data_backend.read_month_data(date(2020, 2, 1)))
+
+    def test_write_month_data_overwrites_month(self):
+        data_backend = self.create_data_backend()
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 1, 1))
+        data_backend.write_month_data({2: {"PyCharm": 1000}}, date(2020, 1, 1))
+
+        self.assertDictEqual({2: {"PyCharm": 1000}}, data_backend.read_month_data(date(2020, 1, 1)))
+
+    def test_get_existing_years_and_months(self):
+        data_backend = self.create_data_backend()
+        for test_date in [date(2020, 12, 1), date(2021, 1, 1), date(2019, 7, 1), date(2020, 3, 1)]:
+            data_backend.write_month_data(self.get_default_month_data(), test_date)
+
+        self.assertEqual([2019, 2020, 2021], data_backend.get_existing_years())
+        self.assertEqual([3, 12], data_backend.get_existing_months(date(2020, 1, 1)))
+        self.assertEqual([], data_backend.get_existing_months(date(2022, 1, 1)))
+
+    def test_get_existing_years_no_data(self):
+        self.assertEqual([], self.create_data_backend().get_existing_years())
+
+    def test_get_days_with_data(self):
+        data_backend = self.create_data_backend()
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 12, 1))
+        data_backend.write_month_data({2: {"PyCharm": 1000}}, date(2021, 1, 1))
+
+        expected_result = {
+            2020: {
+                12: [1, 31]
+            },
+            2021: {
+                1: [2]
+            }
+        }
+
+        self.assertEqual(expected_result, data_backend.get_days_with_data())
+        self.assertEqual(expected_result, self.create_data_backend().get_days_with_data())
+
+    def test_get_days_with_data_no_data(self):
+        self.assertEqual({}, self.create_data_backend().get_days_with_data())
+
+    def test_remove_month_data(self):
+        data_backend = self.create_data_backend()
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 12, 1))
+        data_backend.write_month_data({2: {"PyCharm": 1000}}, date(2021, 1, 1))
+
+        data_backend.remove_month_data(date(2020, 12, 1))
+
+        self.assertDictEqual({}, data_backend.read_month_data(date(2020, 12, 1)))
+        self.assertEqual({2021: {1: [2]}}, data_backend.get_days_with_data())
+
+    def test_convert_month_data_to_json_and_back(self):
+        data_backend = self.create_data_backend()
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 12, 1))
+
+        json_paths = {
+            DATA_FILES_PATH_KEYWORD: Path(self.directory.name).joinpath("json")
+        }
+        json_backend = DataBackend(json_paths)
+
+        convert_month_data(data_backend, json_backend)
+        self.assertEqual([], data_backend.get_existing_years())
+        self.assertDictEqual(self.get_default_month_data(), json_backend.read_month_data(date(2020, 12, 1)))
+
+        convert_month_data(json_backend, data_backend)
+        self.assertEqual([], json_backend.get_existing_years())
+        self.assertDictEqual(self.get_default_month_data(), data_backend.read_month_data(date(2020, 12, 1)))
+
+    def test_convert_month_data_onto_itself(self):
+        data_backend = self.create_data_backend()
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 12, 1))
+
+        self.assertRaises(InvalidStorageBackendError, convert_month_data, data_backend, self.create_data_backend())
+        self.assertDictEqual(self.get_default_month_data(),
+                             self.create_data_backend().read_month_data(date(2020, 12, 1)))
+
+    def test_get_month_rollup(self):
+        data_backend = self.create_data_backend()
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 1, 1))
+
+        expected_result = {
+            "2019-12-30": {"PyCharm": 20000, "IntelliJ": 5000},
+            "2020-01-27": {"Terminal": 1000}
+        }
+
+        self.assertEqual(expected_result, data_backend.get_month_rollup(date(2020, 1, 1)))
+
+        data_backend.write_month_data({31: {"Terminal": 3000}}, date(2020, 1, 1))
+        self.assertEqual({"2020-01-27": {"Terminal": 3000}},
+                         self.create_data_backend().get_month_rollup(date(2020, 1, 1)))
+
+        data_backend.remove_month_data(date(2020, 1, 1))
+        self.assertEqual({}, data_backend.get_month_rollup(date(2020, 1, 1)))
+
+    def test_convert_month_data_in_same_directory_keeps_indexes(self):
+        data_backend = self.create_data_backend()
+        data_backend.write_month_data(self.get_default_month_data(), date(2020, 1, 1))
+        data_backend.get_days_with_data()
+        data_backend.get_month_rollup(date(2020, 1, 1))
+
+        target_class = ColumnarDataBackend if self.backend_class is DataBackend else DataBackend
+        target = target_class(self.paths)
+        convert_month_data(data_backend, target)
+
+        self.assertEqual({2020: {1: [1, 31]}}, target_class(self.paths).get_days_with_data())
+        self.assertEqual({"2019-12-30": {"PyCharm": 20000, "IntelliJ": 5000}, "2020-01-27": {"Terminal": 1000}},
+                         target_class(self.paths).get_month_rollup(date(2020, 1, 1)))
+
+
+class JsonDataBackendContractTest(DataBackendContract, unittest.TestCase):
+    backend_class = DataBackend
+
+
+class ColumnarDataBackendContractTest(DataBackendContract, unittest.TestCase):
+    backend_class = ColumnarDataBackend
+
+
+class SqliteDataBackendContractTest(DataBackendContract, unittest.TestCase):
+    backend_class = SqliteDataBackend
@@ -0,0 +1,86 @@
+import datetime
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.data_sources.days_index import DaysIndex
+
+
+class DaysIndexTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.index_path = Path(self.directory.name).joinpath("days_index.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_days_to_bitmap(self):
+        self.assertEqual(0b1010, DaysIndex.days_to_bitmap([1, 3]))
+
+    def test_bitmap_to_days(self):
+        self.assertEqual([1, 3, 31], DaysIndex.bitmap_to_days(0b1010 | 1 << 31))
+
+    def test_is_available_missing_file(self):
+        days_index = DaysIndex(self.index_path)
+        self.assertFalse(days_index.is_available())
+
+    def test_is_available_corrupt_file(self):
+        with open(self.index_path, "w") as file:
+            file.write("{\"2020\": ")
+
+        days_index = DaysIndex(self.index_path)
+        self.assertFalse(days_index.is_available())
+
+    def test_rebuild(self):
+        days_with_data = {
+            2020: {
+                12: [1, 2]
+            },
+            2019: {
+                9: [30]
+            }
+        }
+
+        days_index = DaysIndex(self.index_path)
+        days_index.rebuild(days_with_data)
+
+        with open(self.index_path, "r") as file:
+            self.assertEqual({"2020": {"12": 6}, "2019": {"9": 1 << 30}}, json.load(file))
+
+        self.assertTrue(days_index.is_available())
+        self.assertEqual({2019: {9: [30]}, 2020: {12: [1, 2]}}, DaysIndex(self.index_path).get_days_with_data())
+
+    def test_update_month(self):
+        days_index = DaysIndex(self.index_path)
+        days_index.rebuild({2020: {12: [1]}})
+
+        days_index.update_month(datetime.date(2020, 12, 1), [1, 2])
+        days_index.update_month(datetime.date(2021, 1, 1), [5])
+
+        expected_result = {
+            2020: {
+                12: [1, 2]
+            },
+            2021: {
+                1: [5]
+            }
+        }
+
+        self.assertEqual(expected_result, DaysIndex(self.index_path).get_days_with_data())
+
+    def test_update_month_missing_index(self):
+        days_index = DaysIndex(self.index_path)
+        days_index.update_month(datetime.date(2020, 12, 1), [1, 2])
+
+        self.assertFalse(self.index_path.exists())
+
+    def test_remove_month(self):
+        days_index = DaysIndex(self.index_path)
+        days_index.rebuild({2020: {11: [1], 12: [1]}, 2021: {1: [5]}})
+
+        days_index.remove_month(datetime.date(2020, 12, 1))
+        days_index.remove_month(datetime.date(2021, 1, 1))
+
+        self.assertEqual({2020: {11: [1]}}, DaysIndex(self.index_path).get_days_with_data())
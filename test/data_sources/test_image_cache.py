@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.data_sources.image_cache import ImageCache
+
+
+class ImageCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name).joinpath("image_cache")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_get_and_put(self):
+        image_cache = ImageCache(self.path)
+        self.assertIsNone(image_cache.get("a"))
+
+        image_cache.put("a", b"png")
+        self.assertEqual(b"png", image_cache.get("a"))
+        self.assertEqual((1, 1), (image_cache.hits, image_cache.misses))
+
+    def test_get_from_disk(self):
+        ImageCache(self.path).put("a", b"png")
+
+        image_cache = ImageCache(self.path)
+        self.assertEqual(b"png", image_cache.get("a"))
+        self.assertIn("a", image_cache.images)
+
+    def test_memory_only(self):
+        image_cache = ImageCache()
+        image_cache.put("a", b"png")
+
+        self.assertEqual(b"png", image_cache.get("a"))
+        self.assertFalse(self.path.exists())
+
+    def test_memory_eviction(self):
+        image_cache = ImageCache(max_memory_bytes=10)
+        image_cache.put("a", b"12345")
+        image_cache.put("b", b"12345")
+        image_cache.get("a")
+        image_cache.put("c", b"12345")
+
+        self.assertEqual(["a", "c"], list(image_cache.images.keys()))
+        self.assertEqual(10, image_cache.memory_bytes)
+
+    def test_disk_eviction(self):
+        image_cache = ImageCache(self.path, max_disk_bytes=10)
+        image_cache.put("a", b"12345")
+        image_cache.put("b", b"12345")
+        os.utime(self.path.joinpath("a.png"), ns=(0, 0))
+        image_cache.put("c", b"12345")
+
+        self.assertEqual(["b.png", "c.png"], sorted(os.listdir(self.path)))
+
+    def test_clear(self):
+        image_cache = ImageCache(self.path)
+        image_cache.put("a", b"png")
+        image_cache.clear()
+
+        self.assertIsNone(image_cache.get("a"))
+        self.assertEqual([], os.listdir(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
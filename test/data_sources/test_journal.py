@@ -0,0 +1,82 @@
+import datetime
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.data_sources.journal import Journal, JournalRecord
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal_path = Path(self.directory.name).joinpath("journal.log")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_read_records_no_journal(self):
+        journal = Journal(self.journal_path)
+        self.assertEqual([], list(journal.read_records()))
+        self.assertTrue(journal.is_empty())
+
+    def test_append_and_read_records(self):
+        journal = Journal(self.journal_path)
+        start = datetime.datetime(2020, 1, 1, 10, 30, 0)
+
+        journal.append(start, "PyCharm", 3000, 3000)
+        journal.append(start, "PyCharm", 1000, 4000)
+
+        expected_result = [
+            JournalRecord(start, "PyCharm", 3000, 3000),
+            JournalRecord(start, "PyCharm", 1000, 4000)
+        ]
+
+        self.assertEqual(expected_result, list(journal.read_records()))
+        self.assertFalse(journal.is_empty())
+
+    def test_read_records_skips_torn_line(self):
+        journal = Journal(self.journal_path)
+        start = datetime.datetime(2020, 1, 1, 10, 30, 0)
+        journal.append(start, "PyCharm", 3000, 3000)
+        journal.flush()
+
+        with open(self.journal_path, "a") as file:
+            file.write('["2020-01-01T10:31:00", "PyCh')
+
+        self.assertEqual([JournalRecord(start, "PyCharm", 3000, 3000)], list(journal.read_records()))
+
+    def test_truncate(self):
+        journal = Journal(self.journal_path)
+        journal.append(datetime.datetime(2020, 1, 1), "PyCharm", 3000, 3000)
+        journal.flush()
+
+        journal.truncate()
+
+        self.assertTrue(journal.is_empty())
+        self.assertEqual(0, os.path.getsize(self.journal_path))
+
+    def test_append_is_buffered_until_flush(self):
+        journal = Journal(self.journal_path)
+        start = datetime.datetime(2020, 1, 1, 10, 30, 0)
+        journal.append(start, "PyCharm", 3000, 3000)
+        journal.append(start, "PyCharm", 1000, 4000)
+
+        self.assertFalse(self.journal_path.exists())
+        self.assertEqual(2, journal.get_pending_count())
+
+        journal.flush()
+
+        self.assertEqual(0, journal.get_pending_count())
+        self.assertEqual([JournalRecord(start, "PyCharm", 3000, 3000), JournalRecord(start, "PyCharm", 1000, 4000)],
+                         list(Journal(self.journal_path).read_records()))
+
+    def test_truncate_drops_pending_records(self):
+        journal = Journal(self.journal_path)
+        journal.append(datetime.datetime(2020, 1, 1), "PyCharm", 3000, 3000)
+
+        journal.truncate()
+        journal.flush()
+
+        self.assertTrue(journal.is_empty())
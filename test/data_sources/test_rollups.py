@@ -0,0 +1,63 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.data_sources.rollups import Rollups, compute_month_rollup, get_period_start
+
+
+class RollupsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.rollups_path = Path(self.directory.name).joinpath("rollups.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_compute_month_rollup(self):
+        month_data = {
+            1: {"PyCharm": 1000},
+            5: {"PyCharm": 2000, "Terminal": 500},
+            6: {"PyCharm": 3000}
+        }
+
+        expected_result = {
+            "2019-12-30": {"PyCharm": 3000, "Terminal": 500},
+            "2020-01-06": {"PyCharm": 3000}
+        }
+
+        self.assertEqual(expected_result, compute_month_rollup(datetime.date(2020, 1, 1), month_data))
+
+    def test_get_period_start(self):
+        date = datetime.date(2020, 3, 18)
+
+        self.assertEqual(date, get_period_start(date, "day"))
+        self.assertEqual(datetime.date(2020, 3, 16), get_period_start(date, "week"))
+        self.assertEqual(datetime.date(2020, 3, 1), get_period_start(date, "month"))
+        self.assertEqual(datetime.date(2020, 1, 1), get_period_start(date, "year"))
+
+    def test_missing_rollups_are_not_updated(self):
+        rollups = Rollups(self.rollups_path)
+        rollups.update_month(datetime.date(2020, 1, 1), {1: {"PyCharm": 1000}})
+
+        self.assertFalse(rollups.is_available())
+        self.assertFalse(self.rollups_path.exists())
+
+    def test_rebuild_update_and_remove_month(self):
+        rollups = Rollups(self.rollups_path)
+        rollups.rebuild({datetime.date(2020, 1, 1): {6: {"PyCharm": 1000}}})
+        rollups.update_month(datetime.date(2020, 2, 1), {3: {"Terminal": 2000}})
+
+        rollups = Rollups(self.rollups_path)
+        self.assertEqual({"2020-01-06": {"PyCharm": 1000}}, rollups.get_month_rollup(datetime.date(2020, 1, 1)))
+        self.assertEqual({"2020-02-03": {"Terminal": 2000}}, rollups.get_month_rollup(datetime.date(2020, 2, 1)))
+
+        rollups.remove_month(datetime.date(2020, 1, 1))
+        self.assertEqual({}, Rollups(self.rollups_path).get_month_rollup(datetime.date(2020, 1, 1)))
+
+    def test_corrupt_file_is_not_available(self):
+        with open(self.rollups_path, "w") as file:
+            file.write('{"2020-01": ')
+
+        self.assertFalse(Rollups(self.rollups_path).is_available())
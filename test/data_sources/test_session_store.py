@@ -0,0 +1,127 @@
+import datetime
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.data_sources.session_store import SessionStore, Session, SESSION_RECORD, split_at_midnight, split_interval
+
+
+class SessionStoreTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.sessions_directory = Path(self.directory.name).joinpath("sessions")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_record_size(self):
+        self.assertEqual(10, SESSION_RECORD.size)
+
+    def test_append_and_read_month_sessions(self):
+        session_store = SessionStore(self.sessions_directory)
+        session_store.append(datetime.datetime(2020, 1, 1, 10), 3000, "PyCharm")
+        session_store.append(datetime.datetime(2020, 1, 1, 11), 4000, "Terminal")
+        session_store.append(datetime.datetime(2020, 2, 1, 11), 4000, "PyCharm")
+        session_store.flush()
+
+        expected_result = [
+            Session(datetime.datetime(2020, 1, 1, 10), 3000, "PyCharm"),
+            Session(datetime.datetime(2020, 1, 1, 11), 4000, "Terminal")
+        ]
+
+        self.assertEqual(expected_result, SessionStore(self.sessions_directory).read_month_sessions(
+            datetime.date(2020, 1, 1)))
+        self.assertEqual(2 * SESSION_RECORD.size,
+                         os.path.getsize(self.sessions_directory.joinpath("01-2020.sessions")))
+
+    def test_append_is_buffered_until_flush(self):
+        session_store = SessionStore(self.sessions_directory)
+        session_store.append(datetime.datetime(2020, 1, 1, 10), 3000, "PyCharm")
+        file_path = self.sessions_directory.joinpath("01-2020.sessions")
+
+        self.assertFalse(file_path.exists())
+        self.assertEqual([Session(datetime.datetime(2020, 1, 1, 10), 3000, "PyCharm")],
+                         session_store.read_month_sessions(datetime.date(2020, 1, 1)))
+
+        session_store.flush()
+        self.assertEqual(SESSION_RECORD.size, os.path.getsize(file_path))
+
+    def test_flush_drops_torn_record(self):
+        session_store = SessionStore(self.sessions_directory)
+        session_store.append(datetime.datetime(2020, 1, 1, 10), 3000, "PyCharm")
+        session_store.flush()
+
+        with open(self.sessions_directory.joinpath("01-2020.sessions"), "ab") as file:
+            file.write(b"\x00\x01\x02")
+
+        session_store.append(datetime.datetime(2020, 1, 1, 11), 4000, "PyCharm")
+        session_store.flush()
+
+        expected_result = [
+            Session(datetime.datetime(2020, 1, 1, 10), 3000, "PyCharm"),
+            Session(datetime.datetime(2020, 1, 1, 11), 4000, "PyCharm")
+        ]
+        self.assertEqual(expected_result, SessionStore(self.sessions_directory).read_month_sessions(
+            datetime.date(2020, 1, 1)))
+
+    def test_append_empty_session(self):
+        session_store = SessionStore(self.sessions_directory)
+        session_store.append(datetime.datetime(2020, 1, 1, 10), 0, "PyCharm")
+
+        self.assertEqual([], session_store.read_month_sessions(datetime.date(2020, 1, 1)))
+
+    def test_read_sessions_window(self):
+        session_store = SessionStore(self.sessions_directory)
+        session_store.append(datetime.datetime(2020, 1, 31, 23, 59), 120000, "PyCharm")
+        session_store.append(datetime.datetime(2020, 2, 1, 10), 1000, "Terminal")
+        session_store.append(datetime.datetime(2020, 2, 2, 10), 1000, "Terminal")
+
+        result = list(session_store.read_sessions(datetime.datetime(2020, 2, 1), datetime.datetime(2020, 2, 2)))
+
+        expected_result = [
+            Session(datetime.datetime(2020, 1, 31, 23, 59), 120000, "PyCharm"),
+            Session(datetime.datetime(2020, 2, 1, 10), 1000, "Terminal")
+        ]
+
+        self.assertEqual(expected_result, result)
+
+    def test_get_month_totals(self):
+        session_store = SessionStore(self.sessions_directory)
+        session_store.append(datetime.datetime(2020, 1, 31, 23, 59), 120000, "PyCharm")
+        session_store.append(datetime.datetime(2020, 2, 1, 10), 1000, "PyCharm")
+        session_store.append(datetime.datetime(2020, 2, 1, 11), 2000, "Terminal")
+
+        expected_result = {
+            1: {
+                "PyCharm": 61000,
+                "Terminal": 2000
+            }
+        }
+
+        self.assertEqual(expected_result, session_store.get_month_totals(datetime.date(2020, 2, 1)))
+        self.assertEqual({31: {"PyCharm": 60000}}, session_store.get_month_totals(datetime.date(2020, 1, 1)))
+
+        session_store.append(datetime.datetime(2020, 2, 3, 11), 2000, "Terminal")
+        self.assertEqual({"Terminal": 2000}, session_store.get_month_totals(datetime.date(2020, 2, 1))[3])
+
+    def test_split_at_midnight(self):
+        result = list(split_at_midnight(datetime.datetime(2020, 1, 1, 23, 59, 59), 3000))
+
+        expected_result = [
+            (datetime.datetime(2020, 1, 1, 23, 59, 59), 1000),
+            (datetime.datetime(2020, 1, 2), 2000)
+        ]
+
+        self.assertEqual(expected_result, result)
+
+    def test_split_interval_hours(self):
+        result = list(split_interval(datetime.datetime(2020, 1, 1, 9, 30), 90 * 60000, datetime.timedelta(hours=1)))
+
+        expected_result = [
+            (datetime.datetime(2020, 1, 1, 9, 30), 30 * 60000),
+            (datetime.datetime(2020, 1, 1, 10), 60 * 60000)
+        ]
+
+        self.assertEqual(expected_result, result)
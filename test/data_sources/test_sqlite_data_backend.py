@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.data_sources.data_backend import DATA_FILES_PATH_KEYWORD
+from src.data_sources.sqlite_data_backend import SqliteDataBackend, DATABASE_FILE_NAME
+
+
+class SqliteDataBackendTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_directory = Path(self.directory.name).joinpath("data")
+        self.data_backend = SqliteDataBackend({
+            DATA_FILES_PATH_KEYWORD: self.data_directory
+        })
+
+        self.data_backend.write_month_data({
+            30: {
+                "PyCharm": 1000,
+                "Terminal": 500
+            }
+        }, date(2020, 11, 1))
+        self.data_backend.write_month_data({
+            1: {
+                "PyCharm": 2000
+            },
+            31: {
+                "PyCharm": 4000,
+                "IntelliJ": 3000
+            }
+        }, date(2020, 12, 1))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_database_file(self):
+        self.assertTrue(self.data_directory.joinpath(DATABASE_FILE_NAME).exists())
+
+    def test_get_activity_time(self):
+        result = self.data_backend.get_activity_time("PyCharm", date(2020, 11, 30), date(2020, 12, 1))
+        self.assertEqual(3000, result)
+
+    def test_get_activity_time_last_days(self):
+        end = date(2020, 12, 31)
+        result = self.data_backend.get_activity_time("PyCharm", end - timedelta(days=90), end)
+        self.assertEqual(7000, result)
+
+    def test_get_activity_time_no_data(self):
+        result = self.data_backend.get_activity_time("Vim", date(2020, 1, 1), date(2020, 12, 31))
+        self.assertEqual(0, result)
+
+    def test_get_time_per_activity(self):
+        result = self.data_backend.get_time_per_activity(date(2020, 12, 1), date(2020, 12, 31))
+        self.assertEqual({"PyCharm": 6000, "IntelliJ": 3000}, result)
+
+    def test_get_activity_time_no_database(self):
+        data_backend = SqliteDataBackend({
+            DATA_FILES_PATH_KEYWORD: Path(self.directory.name).joinpath("other")
+        })
+
+        self.assertEqual(0, data_backend.get_activity_time("PyCharm", date(2020, 1, 1), date(2020, 12, 31)))
+        self.assertEqual({}, data_backend.get_time_per_activity(date(2020, 1, 1), date(2020, 12, 31)))
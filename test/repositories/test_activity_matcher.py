@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.repositories.activity_matcher import ActivityMatcher
+
+
+class ActivityMatcherTest(unittest.TestCase):
+
+    def test_exact_names(self):
+        matcher = ActivityMatcher(["PyCharm", "Terminal"])
+
+        self.assertTrue(matcher.matches("PyCharm"))
+        self.assertFalse(matcher.matches("PyCharm CE"))
+        self.assertIsInstance(matcher.names, frozenset)
+
+    def test_prefix(self):
+        matcher = ActivityMatcher(["prefix:Visual Studio"])
+
+        self.assertTrue(matcher.matches("Visual Studio Code"))
+        self.assertFalse(matcher.matches("Xcode"))
+
+    def test_regex(self):
+        matcher = ActivityMatcher(["regex:Py(Charm|thon)", "regex:Intelli.*"])
+
+        self.assertTrue(matcher.matches("PyCharm"))
+        self.assertTrue(matcher.matches("IntelliJ IDEA"))
+        self.assertFalse(matcher.matches("PyCharm CE"))
+
+    def test_invalid_regex_never_matches(self):
+        matcher = ActivityMatcher(["regex:Py(", "PyCharm"])
+
+        self.assertEqual(["regex:Py("], matcher.invalid_patterns)
+        self.assertTrue(matcher.matches("PyCharm"))
+        self.assertFalse(matcher.matches("Py("))
+
+    def test_bundle_id(self):
+        matcher = ActivityMatcher(["bundle:com.apple.Safari", "PyCharm"])
+        get_bundle_id = MagicMock(return_value="com.apple.Safari")
+
+        self.assertTrue(matcher.matches("Safari", get_bundle_id))
+        self.assertTrue(matcher.matches("PyCharm", get_bundle_id))
+        get_bundle_id.assert_called_once_with("Safari")
+
+    def test_results_are_memoized(self):
+        matcher = ActivityMatcher(["bundle:com.apple.Safari"])
+        get_bundle_id = MagicMock(return_value="com.apple.Safari")
+
+        for _ in range(3):
+            self.assertTrue(matcher.matches("Safari", get_bundle_id))
+
+        get_bundle_id.assert_called_once_with("Safari")
+
+    def test_no_activities(self):
+        self.assertFalse(ActivityMatcher([]).matches("PyCharm"))
@@ -1,9 +1,14 @@
 import datetime
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, call
 
-from src.data_sources.data_backend import DataBackend
-from src.data_sources.errors import DefaultSettingNotFoundError, DataNotAvailableError
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD
+from src.data_sources.errors import DefaultSettingNotFoundError, DataNotAvailableError, CorruptMonthDataError, \
+    InvalidGranularityError
+from src.data_sources.journal import Journal, JournalRecord
+from src.data_sources.session_store import SessionStore, Session
 from src.repositories.code_time_data_repository import CodeTimeDataRepository
 
 
@@ -41,6 +46,106 @@ class CodeTimeDataRepositoryTest(unittest.TestCase):
 
         self.assertEqual(expected_result, repository.cached_month_data)
 
+    def test_cache_is_instance_scoped(self):
+        repository = CodeTimeDataRepository(DataBackend({}))
+        repository.cached_month_data["1-2020"] = self.get_default_month_data()
+
+        self.assertNotIn("1-2020", CodeTimeDataRepository(DataBackend({})).cached_month_data)
+
+    def test_get_month_data_invalidated_by_changed_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            data_backend = DataBackend({DATA_FILES_PATH_KEYWORD: Path(directory)})
+            data_backend.write_month_data({1: {"PyCharm": 1000}}, datetime.date(2020, 1, 1))
+            repository = CodeTimeDataRepository(data_backend, cache_max_entries=2)
+
+            self.assertEqual({1: {"PyCharm": 1000}}, repository.get_month_data(datetime.date(2020, 1, 1)))
+            self.assertEqual({1: {"PyCharm": 1000}}, repository.get_month_data(datetime.date(2020, 1, 1)))
+
+            DataBackend({DATA_FILES_PATH_KEYWORD: Path(directory)}).write_month_data({1: {"PyCharm": 20000}},
+                                                                                     datetime.date(2020, 1, 1))
+
+            self.assertEqual({1: {"PyCharm": 20000}}, repository.get_month_data(datetime.date(2020, 1, 1)))
+            statistics = repository.get_cache_statistics()
+            self.assertEqual((1, 2, 1), (statistics["hits"], statistics["misses"], statistics["invalidations"]))
+
+    def test_is_activity_tracked_rebuilt_on_update_setting(self):
+        data_backend = DataBackend({})
+        data_backend.read_config = MagicMock(return_value={"activities": ["PyCharm"]})
+        data_backend.write_config = MagicMock()
+        repository = CodeTimeDataRepository(data_backend)
+
+        self.assertTrue(repository.is_activity_tracked("PyCharm"))
+        self.assertFalse(repository.is_activity_tracked("Visual Studio Code"))
+        matcher = repository.get_activity_matcher()
+        self.assertIs(matcher, repository.get_activity_matcher())
+
+        repository.update_setting("activities", ["PyCharm", "prefix:Visual Studio"])
+
+        self.assertTrue(repository.is_activity_tracked("Visual Studio Code"))
+        self.assertIsNot(matcher, repository.get_activity_matcher())
+
+    def create_range_repository(self, directory):
+        data_backend = DataBackend({DATA_FILES_PATH_KEYWORD: Path(directory)})
+        data_backend.write_month_data({30: {"PyCharm": 1000}, 31: {"Terminal": 500}}, datetime.date(2019, 12, 1))
+        data_backend.write_month_data({1: {"PyCharm": 2000}, 6: {"PyCharm": 3000}}, datetime.date(2020, 1, 1))
+        data_backend.write_month_data({3: {"Terminal": 4000}}, datetime.date(2020, 2, 1))
+        return CodeTimeDataRepository(data_backend)
+
+    def test_get_range_statistics_per_week(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = self.create_range_repository(directory)
+            result = repository.get_range_statistics(datetime.date(2019, 12, 31), datetime.date(2020, 2, 29), "week")
+
+        expected_periods = [
+            {"start": datetime.date(2019, 12, 30), "total_time": 2500,
+             "activities": {"PyCharm": 2000, "Terminal": 500}},
+            {"start": datetime.date(2020, 1, 6), "total_time": 3000, "activities": {"PyCharm": 3000}},
+            {"start": datetime.date(2020, 2, 3), "total_time": 4000, "activities": {"Terminal": 4000}}
+        ]
+
+        self.assertEqual(expected_periods, result["periods"])
+        self.assertEqual(9500, result["total_time"])
+        self.assertEqual([{"name": "PyCharm", "time": 5000, "progress": 5000 / 9500},
+                          {"name": "Terminal", "time": 4500, "progress": 4500 / 9500}], result["activities"])
+
+    def test_get_range_statistics_per_year_uses_rollups(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = self.create_range_repository(directory)
+            repository.data_backend.rebuild_rollups()
+            repository.data_backend.read_month_data = MagicMock(side_effect=AssertionError)
+            result = repository.get_range_statistics(datetime.date(2019, 1, 1), datetime.date(2020, 12, 31), "year")
+
+        self.assertEqual([datetime.date(2019, 1, 1), datetime.date(2020, 1, 1)],
+                         [period["start"] for period in result["periods"]])
+        self.assertEqual([1500, 9000], [period["total_time"] for period in result["periods"]])
+
+    def test_get_range_statistics_matches_day_granularity(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = self.create_range_repository(directory)
+
+            for granularity in ["week", "month", "year"]:
+                result = repository.get_range_statistics(datetime.date(2019, 12, 31), datetime.date(2020, 2, 2),
+                                                         granularity)
+                days = repository.get_range_statistics(datetime.date(2019, 12, 31), datetime.date(2020, 2, 2))
+                self.assertEqual(days["activities"], result["activities"])
+
+    def test_get_range_statistics_includes_journal_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = self.create_range_repository(directory)
+            repository.journal = Journal(Path(directory).joinpath("journal.log"))
+            repository.add_day_data({"name": "PyCharm", "time": 500, "start_time": datetime.time(10)},
+                                    datetime.date(2020, 1, 6))
+
+            result = repository.get_range_statistics(datetime.date(2020, 1, 1), datetime.date(2020, 1, 31), "month")
+
+        self.assertEqual([{"start": datetime.date(2020, 1, 1), "total_time": 5500, "activities": {"PyCharm": 5500}}],
+                         result["periods"])
+
+    def test_get_range_statistics_invalid_granularity(self):
+        repository = CodeTimeDataRepository(DataBackend({}))
+        self.assertRaises(InvalidGranularityError, repository.get_range_statistics, datetime.date(2020, 1, 1),
+                          datetime.date(2020, 1, 31), "quarter")
+
     def test_get_month_data_cached(self):
         data_backend = DataBackend({})
         test_date = datetime.date(2020, 1, 1)
@@ -153,6 +258,178 @@ class CodeTimeDataRepositoryTest(unittest.TestCase):
         data_backend.read_month_data.assert_called_once_with(datetime.date(2020, 1, 2))
         data_backend.write_month_data.assert_has_calls([call(expected_month_data, test_date)], any_order=True)
 
+    def test_add_day_data_with_journal(self):
+        data_backend = DataBackend({})
+        data_backend.read_month_data = MagicMock(return_value=self.get_default_month_data())
+        data_backend.write_month_data = MagicMock()
+        journal = Journal("journal.log")
+        journal.append = MagicMock()
+
+        repository = CodeTimeDataRepository(data_backend, journal)
+        test_date = datetime.date(2020, 1, 1)
+
+        repository.add_day_data(self.get_default_day_data_to_add(), test_date)
+
+        data_backend.write_month_data.assert_not_called()
+        journal.append.assert_called_once_with(datetime.datetime(2020, 1, 1), "PyCharm", 4000, 8000)
+        self.assertEqual({"1-2020": test_date}, repository.dirty_months)
+
+    def test_add_session_data(self):
+        session_store = SessionStore("sessions")
+        session_store.append = MagicMock()
+
+        repository = CodeTimeDataRepository(DataBackend({}), session_store=session_store)
+        repository.add_day_data = MagicMock()
+        test_date = datetime.date(2020, 1, 1)
+
+        repository.add_session_data(self.get_default_day_data_to_add(datetime.time(10, 0, 0)), test_date)
+
+        session_store.append.assert_called_once_with(datetime.datetime(2020, 1, 1, 10), 4000, "PyCharm")
+        repository.add_day_data.assert_called_once_with(self.get_default_day_data_to_add(datetime.time(10, 0, 0)),
+                                                        test_date)
+
+    def test_get_sessions_without_session_store(self):
+        repository = CodeTimeDataRepository(DataBackend({}))
+        self.assertEqual([], repository.get_sessions(datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2)))
+
+    @staticmethod
+    def create_repository_with_sessions(directory, sessions):
+        session_store = SessionStore(Path(directory).joinpath("sessions"))
+        for session in sessions:
+            session_store.append(session.start, session.duration, session.name)
+
+        return CodeTimeDataRepository(DataBackend({}), session_store=session_store)
+
+    def test_get_hour_heatmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = self.create_repository_with_sessions(directory, [
+                Session(datetime.datetime(2020, 1, 1, 9, 30), 90 * 60000, "PyCharm"),
+                Session(datetime.datetime(2020, 1, 2, 10, 0), 60000, "Terminal"),
+                Session(datetime.datetime(2020, 1, 3, 10, 0), 60000, "Terminal")
+            ])
+
+            result = repository.get_hour_heatmap(datetime.date(2020, 1, 1), datetime.date(2020, 1, 2))
+
+        expected_result = [0] * 24
+        expected_result[9] = 30 * 60000
+        expected_result[10] = 61 * 60000
+
+        self.assertEqual(expected_result, result)
+
+    def test_get_longest_focus_streak(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = self.create_repository_with_sessions(directory, [
+                Session(datetime.datetime(2020, 1, 1, 9, 0), 60000, "PyCharm"),
+                Session(datetime.datetime(2020, 1, 1, 10, 0), 60000, "PyCharm"),
+                Session(datetime.datetime(2020, 1, 1, 10, 1, 30), 60000, "Terminal"),
+                Session(datetime.datetime(2020, 1, 1, 10, 3), 30000, "PyCharm")
+            ])
+
+            result = repository.get_longest_focus_streak(datetime.date(2020, 1, 1), datetime.date(2020, 1, 1))
+
+        expected_result = {
+            "start": datetime.datetime(2020, 1, 1, 10, 0),
+            "end": datetime.datetime(2020, 1, 1, 10, 3, 30),
+            "time": 150000
+        }
+
+        self.assertEqual(expected_result, result)
+
+    def test_replay_journal(self):
+        data_backend = DataBackend({})
+        data_backend.read_month_data = MagicMock(return_value=self.get_default_month_data())
+        journal = Journal("journal.log")
+        journal.read_records = MagicMock(return_value=[
+            JournalRecord(datetime.datetime(2020, 1, 1, 10), "PyCharm", 1000, 5000),
+            JournalRecord(datetime.datetime(2020, 1, 2, 10), "PyCharm", 2000, 2000)
+        ])
+
+        repository = CodeTimeDataRepository(data_backend, journal)
+        repository.replay_journal()
+
+        expected_month_data = {
+            1: {
+                "PyCharm": 5000,
+                "IntelliJ": 1000
+            },
+            2: {
+                "PyCharm": 2000
+            }
+        }
+
+        self.assertEqual(expected_month_data, repository.get_month_data(datetime.date(2020, 1, 1)))
+        self.assertEqual(["1-2020"], list(repository.dirty_months.keys()))
+
+    def test_repair_month_data(self):
+        data_backend = DataBackend({})
+        data_backend.read_month_data = MagicMock(side_effect=CorruptMonthDataError())
+        data_backend.write_month_data = MagicMock()
+        journal = Journal("journal.log")
+        journal.read_records = MagicMock(return_value=[
+            JournalRecord(datetime.datetime(2020, 1, 1, 10), "PyCharm", 1000, 5000),
+            JournalRecord(datetime.datetime(2020, 2, 1, 10), "PyCharm", 2000, 2000)
+        ])
+        session_store = SessionStore("sessions")
+        session_store.get_month_totals = MagicMock(return_value={1: {"PyCharm": 4000}, 2: {"Terminal": 3000}})
+
+        repository = CodeTimeDataRepository(data_backend, journal, session_store)
+        result = repository.repair_month_data(datetime.date(2020, 1, 1))
+
+        expected_month_data = {
+            1: {
+                "PyCharm": 5000
+            },
+            2: {
+                "Terminal": 3000
+            }
+        }
+
+        self.assertEqual(expected_month_data, result)
+        data_backend.write_month_data.assert_called_once_with(expected_month_data, datetime.date(2020, 1, 1))
+        self.assertEqual(expected_month_data, repository.get_month_data(datetime.date(2020, 1, 1)))
+
+    def test_compact_journal(self):
+        data_backend = DataBackend({})
+        data_backend.write_month_data = MagicMock()
+        journal = Journal("journal.log")
+        journal.truncate = MagicMock()
+
+        repository = CodeTimeDataRepository(data_backend, journal)
+        repository.cached_month_data["1-2020"] = self.get_default_month_data()
+        repository.dirty_months = {"1-2020": datetime.date(2020, 1, 1)}
+
+        repository.compact_journal()
+
+        data_backend.write_month_data.assert_called_once_with(self.get_default_month_data(),
+                                                              datetime.date(2020, 1, 1))
+        journal.truncate.assert_called_once()
+        self.assertEqual({}, repository.dirty_months)
+
+    def test_add_day_data_notifies_pending_listener(self):
+        data_backend = DataBackend({})
+        data_backend.read_month_data = MagicMock(return_value={})
+
+        repository = CodeTimeDataRepository(data_backend, Journal("journal.log"))
+        repository.pending_listener = MagicMock()
+
+        repository.add_day_data({"name": "PyCharm", "time": 1000, "start_time": datetime.time(10)},
+                                datetime.date(2020, 1, 1))
+        repository.add_day_data({"name": "PyCharm", "time": 1000, "start_time": datetime.time(11)},
+                                datetime.date(2020, 1, 1))
+
+        self.assertEqual([((1,),), ((2,),)], repository.pending_listener.call_args_list)
+
+    def test_flush(self):
+        journal = Journal("journal.log")
+        journal.flush = MagicMock()
+        session_store = SessionStore("sessions")
+        session_store.flush = MagicMock()
+
+        CodeTimeDataRepository(DataBackend({}), journal, session_store).flush()
+
+        journal.flush.assert_called_once()
+        session_store.flush.assert_called_once()
+
     def test_get_days_with_data(self):
         data_backend = DataBackend({})
 
@@ -168,6 +445,21 @@ class CodeTimeDataRepositoryTest(unittest.TestCase):
         result = data_repository.get_days_with_data()
         self.assertEqual(mock_return, result)
 
+    def test_get_days_with_data_includes_journal_days(self):
+        data_backend = DataBackend({})
+        data_backend.get_days_with_data = MagicMock(return_value={2020: {1: [1, 2]}})
+
+        data_repository = CodeTimeDataRepository(data_backend, Journal("journal.log"))
+        data_repository.cached_month_data["1-2020"] = {1: {}, 2: {}, 3: {}}
+        data_repository.cached_month_data["2-2021"] = {4: {}}
+        data_repository.dirty_months = {
+            "1-2020": datetime.date(2020, 1, 1),
+            "2-2021": datetime.date(2021, 2, 1)
+        }
+
+        result = data_repository.get_days_with_data()
+        self.assertEqual({2020: {1: [1, 2, 3]}, 2021: {2: [4]}}, result)
+
     def test_get_years_with_data(self):
         data_backend = DataBackend({})
 
@@ -238,6 +530,26 @@ class CodeTimeDataRepositoryTest(unittest.TestCase):
 
         data_backend.write_config.assert_called_once_with({"enabled": False})
 
+    def test_update_setting_failed_write(self):
+        data_backend = DataBackend({})
+        data_backend.read_config = MagicMock(return_value={"enabled": True})
+        data_backend.get_config_stamp = MagicMock(return_value=(1, 1))
+        data_backend.write_config = MagicMock(side_effect=OSError())
+
+        data_repository = CodeTimeDataRepository(data_backend)
+        self.assertRaises(OSError, data_repository.update_setting, "enabled", False)
+
+        self.assertTrue(data_repository.get_setting("enabled"))
+
+    def test_get_month_data_returns_copy(self):
+        data_backend = DataBackend({})
+        data_backend.read_month_data = MagicMock(return_value={1: {"PyCharm": 1000}})
+        repository = CodeTimeDataRepository(data_backend)
+
+        repository.get_month_data(datetime.date(2020, 1, 1))[1]["PyCharm"] = 0
+
+        self.assertEqual({1: {"PyCharm": 1000}}, repository.get_month_data(datetime.date(2020, 1, 1)))
+
     def test_get_setting_available_key(self):
         mock_config = {"enabled": True}
 
@@ -309,6 +621,18 @@ class CodeTimeDataRepositoryTest(unittest.TestCase):
         result = CodeTimeDataRepository.get_default_setting("username")
         self.assertEqual(result, "a random user")
 
+    def test_get_default_setting_storage_backend(self):
+        result = CodeTimeDataRepository.get_default_setting("storage_backend")
+        self.assertEqual(result, "json")
+
+    def test_get_default_setting_gap_policy(self):
+        result = CodeTimeDataRepository.get_default_setting("gap_policy")
+        self.assertEqual(result, "drop")
+
+    def test_get_default_setting_gap_cap(self):
+        result = CodeTimeDataRepository.get_default_setting("gap_cap")
+        self.assertEqual(result, 300)
+
     def test_get_default_setting_invalid_key(self):
         self.assertRaises(DefaultSettingNotFoundError, CodeTimeDataRepository.get_default_setting, "some_invalid_key")
 
@@ -0,0 +1,75 @@
+import unittest
+
+from src.repositories.month_data_cache import MonthDataCache, DAY_SIZE, ACTIVITY_SIZE
+
+
+class MonthDataCacheTest(unittest.TestCase):
+
+    def test_lookup_hit_and_miss(self):
+        cache = MonthDataCache()
+        cache.put("1-2020", {1: {"PyCharm": 1000}}, (1, 10))
+
+        self.assertEqual({1: {"PyCharm": 1000}}, cache.lookup("1-2020", (1, 10)))
+        self.assertIsNone(cache.lookup("2-2020", None))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_lookup_invalidates_changed_stamp(self):
+        cache = MonthDataCache()
+        cache.put("1-2020", {1: {"PyCharm": 1000}}, (1, 10))
+
+        self.assertIsNone(cache.lookup("1-2020", (2, 10)))
+        self.assertNotIn("1-2020", cache)
+        self.assertEqual(1, cache.invalidations)
+
+    def test_lookup_keeps_pinned_month_with_changed_stamp(self):
+        cache = MonthDataCache()
+        cache.put("1-2020", {1: {"PyCharm": 1000}}, (1, 10))
+        cache.pin("1-2020")
+
+        self.assertEqual({1: {"PyCharm": 1000}}, cache.lookup("1-2020", (2, 10)))
+
+    def test_evicts_least_recently_used_month(self):
+        cache = MonthDataCache(max_entries=2)
+        cache.put("1-2020", {}, None)
+        cache.put("2-2020", {}, None)
+        cache.lookup("1-2020", None)
+        cache.put("3-2020", {}, None)
+
+        self.assertEqual(["1-2020", "3-2020"], list(cache.keys()))
+        self.assertEqual(1, cache.evictions)
+
+    def test_evicts_by_estimated_size(self):
+        month_size = DAY_SIZE + ACTIVITY_SIZE + len("PyCharm")
+        cache = MonthDataCache(max_bytes=2 * month_size)
+
+        for key in ["1-2020", "2-2020", "3-2020"]:
+            cache.put(key, {1: {"PyCharm": 1000}}, None)
+
+        self.assertEqual(["2-2020", "3-2020"], list(cache.keys()))
+        self.assertEqual(2 * month_size, cache.get_size())
+
+    def test_does_not_evict_pinned_month(self):
+        cache = MonthDataCache(max_entries=1)
+        cache.put("1-2020", {}, None)
+        cache.pin("1-2020")
+        cache.put("2-2020", {}, None)
+        cache.put("3-2020", {}, None)
+
+        self.assertEqual(["1-2020", "3-2020"], list(cache.keys()))
+
+    def test_get_statistics(self):
+        cache = MonthDataCache()
+        cache.put("1-2020", {1: {"PyCharm": 1000}}, None)
+        cache.lookup("1-2020", None)
+
+        expected_result = {
+            "entries": 1,
+            "bytes": DAY_SIZE + ACTIVITY_SIZE + len("PyCharm"),
+            "hits": 1,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+
+        self.assertEqual(expected_result, cache.get_statistics())
@@ -0,0 +1,122 @@
+import datetime
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD, CONFIG_FILE_PATH_KEYWORD
+from src.data_sources.errors import DataNotAvailableError
+from src.data_sources.journal import Journal
+from src.data_sources.session_store import SessionStore
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+
+# seconds the stress test runs, set CODE_TIME_STRESS_SECONDS=300 to run it for minutes
+STRESS_SECONDS = float(os.environ.get("CODE_TIME_STRESS_SECONDS", "2"))
+
+WRITERS = 4
+READERS = 3
+DAYS = [datetime.date(2020, 1, 31), datetime.date(2020, 2, 1), datetime.date(2020, 2, 2)]
+
+
+class RepositoryConcurrencyTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.paths = {DATA_FILES_PATH_KEYWORD: self.path.joinpath("data"),
+                      CONFIG_FILE_PATH_KEYWORD: self.path.joinpath("config.json")}
+        self.data_repository = self.create_repository()
+        self.data_repository.create_default_config_if_config_is_missing()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def create_repository(self):
+        return CodeTimeDataRepository(DataBackend(self.paths),
+                                      journal=Journal(self.path.joinpath("data", "journal.log")),
+                                      session_store=SessionStore(self.path.joinpath("data", "sessions")))
+
+    def test_concurrent_writers_and_readers(self):
+        self.path.joinpath("data").mkdir()
+        deadline = time.monotonic() + STRESS_SECONDS
+        written = [{} for _ in range(WRITERS)]
+        errors = []
+
+        def run(function):
+            try:
+                function()
+            except Exception as e:
+                errors.append(e)
+
+        def write(index):
+            activities = [f"Activity {index}", "Shared"]
+            count = 0
+            while time.monotonic() < deadline:
+                day = DAYS[count % len(DAYS)]
+                name = activities[count % len(activities)]
+                self.data_repository.add_session_data({"name": name, "time": 7, "start_time": datetime.time(12)}, day)
+                written[index][(day, name)] = written[index].get((day, name), 0) + 7
+                count += 1
+
+        def read():
+            while time.monotonic() < deadline:
+                for day in DAYS:
+                    try:
+                        self.data_repository.get_statistics(day)
+                    except DataNotAvailableError:
+                        pass
+
+                self.data_repository.get_range_statistics(DAYS[0], DAYS[-1], "week")
+                self.data_repository.get_days_with_data()
+                self.data_repository.is_activity_tracked("Shared")
+
+        def change_settings():
+            count = 0
+            while time.monotonic() < deadline:
+                self.data_repository.update_setting("activities", [f"Activity {count % WRITERS}"])
+                count += 1
+                time.sleep(0.01)
+
+        def persist():
+            while time.monotonic() < deadline:
+                self.data_repository.flush()
+                self.data_repository.compact_journal()
+                time.sleep(0.05)
+
+        threads = [threading.Thread(target=run, args=(lambda index=index: write(index),)) for index in range(WRITERS)]
+        threads += [threading.Thread(target=run, args=(read,)) for _ in range(READERS)]
+        threads += [threading.Thread(target=run, args=(change_settings,)),
+                    threading.Thread(target=run, args=(persist,))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+
+        expected = {}
+        for writer_written in written:
+            for key, time_ in writer_written.items():
+                expected[key] = expected.get(key, 0) + time_
+
+        def get_times(data_repository):
+            return {(day, name): data_repository.get_month_data(day).get(day.day, {}).get(name, 0)
+                    for day, name in expected.keys()}
+
+        self.assertEqual(expected, get_times(self.data_repository))
+
+        self.data_repository.flush()
+        self.data_repository.compact_journal()
+        self.assertEqual(expected, get_times(self.create_repository()))
+
+        session_totals = {}
+        for day in DAYS:
+            for name, time_ in self.create_repository().session_store.get_month_totals(day).get(day.day, {}).items():
+                session_totals[(day, name)] = time_
+        self.assertEqual(expected, session_totals)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,281 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from src.repositories.scripted_focus_activity_provider import ScriptedFocusActivityProvider
+from src.use_cases.activity_tracker import ActivityTracker, TimeAccountant, GAP_POLICY_KEEP, GAP_POLICY_CAP, \
+    GAP_POLICY_DROP
+
+
+class SimulatedClock:
+
+    def __init__(self, seed=0):
+        """
+        Deterministic clock for the activity tracker. Waiting advances the simulated time by the timeout plus some
+        scheduling jitter and runs every scheduled action which became due.
+        """
+        self.random = random.Random(seed)
+        self.monotonic_time = 1000.0
+        self.since_boot_time = 2000.0
+        self.wall_start = datetime(2020, 1, 1, 8, 0, 0)
+        self.wall_time = 0.0
+        self.actions = []
+        self.action_counter = itertools.count()
+
+    def monotonic(self):
+        return self.monotonic_time
+
+    def since_boot(self):
+        return self.since_boot_time
+
+    def now(self):
+        return self.wall_start + timedelta(seconds=self.wall_time)
+
+    def advance(self, seconds):
+        self.monotonic_time += seconds
+        self.since_boot_time += seconds
+        self.wall_time += seconds
+
+    def suspend(self, seconds):
+        """Only the monotonic clock stops while the system is suspended."""
+        self.since_boot_time += seconds
+        self.wall_time += seconds
+
+    def step_wall_clock(self, seconds):
+        """Changes the wall clock only, like daylight saving time changes or NTP."""
+        self.wall_time += seconds
+
+    def schedule(self, at, action):
+        heapq.heappush(self.actions, (at, next(self.action_counter), action))
+
+    async def wait(self, wake_event: asyncio.Event, timeout):
+        """Returns without giving control to the event loop, events of due actions are queued by the tracker."""
+        if timeout is None:
+            self.advance(max(0.0, self.actions[0][0] - self.monotonic_time))
+        else:
+            self.advance(timeout + self.random.uniform(0, 0.05))
+
+        while self.actions and self.actions[0][0] <= self.monotonic_time:
+            heapq.heappop(self.actions)[2]()
+
+
+class ActivityTrackerTest(unittest.TestCase):
+
+    @staticmethod
+    def create_data_repository(gap_policy=GAP_POLICY_DROP, gap_cap=300):
+        settings = {
+            "activities": ["PyCharm", "Terminal", "IntelliJ"],
+            "gap_policy": gap_policy,
+            "gap_cap": gap_cap
+        }
+
+        data_repository = MagicMock()
+        data_repository.get_setting = MagicMock(side_effect=lambda name: settings[name])
+        data_repository.is_activity_tracked = MagicMock(
+            side_effect=lambda name, get_bundle_id=None: name in settings["activities"])
+        return data_repository
+
+    @staticmethod
+    def start_tracker(tracker: ActivityTracker) -> threading.Thread:
+        """Runs the tracker on an event loop of its own thread, like the runtime does."""
+        thread = threading.Thread(target=asyncio.run, args=(tracker.run_async(),))
+        thread.start()
+        return thread
+
+    @staticmethod
+    def get_tracked_times(data_repository):
+        return [(c.args[0]["name"], c.args[0]["time"]) for c in data_repository.add_session_data.call_args_list]
+
+    def test_event_driven_wake_ups(self):
+        data_repository = self.create_data_repository()
+        provider = ScriptedFocusActivityProvider("Safari")
+        tracker = ActivityTracker(data_repository, provider)
+
+        thread = self.start_tracker(tracker)
+        provider.play([(0.05, "PyCharm"), (0.3, "Terminal"), (0.1, "Safari")])
+        time.sleep(0.05)
+        tracker.on_quit()
+        thread.join()
+
+        self.assertEqual(4, tracker.wake_ups)
+        self.assertEqual(2, provider.poll_count)
+        self.assertEqual([], provider.subscribers)
+
+        tracked_times = self.get_tracked_times(data_repository)
+        self.assertEqual(["PyCharm", "Terminal"], [name for name, _ in tracked_times])
+        self.assertAlmostEqual(300, tracked_times[0][1], delta=50)
+        self.assertAlmostEqual(100, tracked_times[1][1], delta=50)
+
+    def test_polling_provider(self):
+        data_repository = self.create_data_repository()
+        provider = ScriptedFocusActivityProvider("PyCharm", push=False)
+        tracker = ActivityTracker(data_repository, provider, poll_interval=0.01)
+
+        thread = self.start_tracker(tracker)
+        provider.play([(0.2, "Safari")])
+        time.sleep(0.05)
+        tracker.on_quit()
+        thread.join()
+
+        self.assertGreater(tracker.wake_ups, 10)
+
+        tracked_times = self.get_tracked_times(data_repository)
+        self.assertEqual(["PyCharm"], [name for name, _ in tracked_times])
+        self.assertAlmostEqual(200, tracked_times[0][1], delta=50)
+
+    def test_pause_continue(self):
+        data_repository = self.create_data_repository()
+        provider = ScriptedFocusActivityProvider("PyCharm")
+        tracker = ActivityTracker(data_repository, provider)
+
+        thread = self.start_tracker(tracker)
+        time.sleep(0.1)
+        tracker.on_pause_continue()
+        time.sleep(0.2)
+        tracker.on_pause_continue()
+        time.sleep(0.1)
+        tracker.on_quit()
+        thread.join()
+
+        tracked_times = self.get_tracked_times(data_repository)
+        self.assertEqual(["PyCharm", "PyCharm"], [name for name, _ in tracked_times])
+        self.assertAlmostEqual(100, tracked_times[0][1], delta=50)
+        self.assertAlmostEqual(100, tracked_times[1][1], delta=50)
+        self.assertEqual(2, data_repository.flush.call_count)
+
+    def test_untracked_activity_not_written(self):
+        data_repository = self.create_data_repository()
+        provider = ScriptedFocusActivityProvider("Safari")
+        tracker = ActivityTracker(data_repository, provider)
+
+        thread = self.start_tracker(tracker)
+        provider.play([(0.05, "Mail")])
+        tracker.on_quit()
+        thread.join()
+
+        data_repository.add_session_data.assert_not_called()
+
+    def run_simulated_session(self, hours, push, gap_policy=GAP_POLICY_DROP, suspend=None):
+        """
+        Runs the tracker on a simulated clock through a session of switching between tracked activities every few
+        minutes with slow writes and scheduling jitter.
+        :param suspend: tuple of simulated hour and seconds the system is being suspended
+        :return: tracked milliseconds, simulated milliseconds until the last write and the tracker
+        """
+        clock = SimulatedClock()
+        write_times = []
+
+        def slow_write(*_):
+            write_times.append(clock.monotonic())
+            clock.advance(clock.random.uniform(0.05, 0.5))
+
+        data_repository = self.create_data_repository(gap_policy)
+        data_repository.add_session_data = MagicMock(side_effect=slow_write)
+
+        provider = ScriptedFocusActivityProvider("PyCharm", push=push)
+        tracker = ActivityTracker(data_repository, provider, clock=clock)
+
+        start = clock.monotonic()
+        end = start + hours * 3600
+        activities = itertools.cycle(["Terminal", "IntelliJ", "PyCharm"])
+
+        at = start
+        while at < end:
+            at += clock.random.uniform(30, 600)
+            clock.schedule(at, lambda activity=next(activities): provider.switch_to(activity))
+
+        clock.schedule(end, tracker.on_quit)
+        if suspend is not None:
+            clock.schedule(start + suspend[0] * 3600, lambda: clock.suspend(suspend[1]))
+
+        asyncio.run(tracker.run_async())
+
+        tracked_time = sum(c.args[0]["time"] for c in data_repository.add_session_data.call_args_list)
+        return tracked_time, (write_times[-1] - start) * 1000, tracker
+
+    def test_simulated_session_polling_accuracy(self):
+        hours = 8
+        tracked_time, elapsed_time, tracker = self.run_simulated_session(hours, push=False)
+
+        self.assertLessEqual(abs(tracked_time - elapsed_time), 5 * hours)
+
+    def test_simulated_session_event_driven_accuracy(self):
+        hours = 24
+        tracked_time, elapsed_time, tracker = self.run_simulated_session(hours, push=True)
+
+        self.assertLessEqual(abs(tracked_time - elapsed_time), 5 * hours)
+        self.assertLess(tracker.wake_ups, hours * 130)
+
+    def test_simulated_session_suspend_drop(self):
+        tracked_time, elapsed_time, _ = self.run_simulated_session(4, push=False, suspend=(2, 7200))
+        self.assertLessEqual(abs(tracked_time - elapsed_time), 20)
+
+    def test_simulated_session_suspend_keep(self):
+        tracked_time, elapsed_time, _ = self.run_simulated_session(4, push=False, gap_policy=GAP_POLICY_KEEP,
+                                                                   suspend=(2, 7200))
+        self.assertLessEqual(abs(tracked_time - elapsed_time - 7200 * 1000), 20)
+
+    def test_simulated_session_suspend_cap(self):
+        tracked_time, elapsed_time, _ = self.run_simulated_session(4, push=True, gap_policy=GAP_POLICY_CAP,
+                                                                   suspend=(2, 7200))
+        self.assertLessEqual(abs(tracked_time - elapsed_time - 300 * 1000), 20)
+
+
+class TimeAccountantTest(unittest.TestCase):
+
+    def test_tick_and_take(self):
+        clock = SimulatedClock()
+        time_accountant = TimeAccountant(clock)
+        time_accountant.start()
+
+        clock.advance(1.0004)
+        time_accountant.tick()
+        clock.advance(2.5)
+        time_accountant.tick()
+
+        self.assertEqual((datetime(2020, 1, 1, 8, 0, 0), 3500), time_accountant.take())
+        self.assertEqual(datetime(2020, 1, 1, 8, 0, 3, 500400), time_accountant.start_date)
+
+    def test_stalled_polling_dropped(self):
+        clock = SimulatedClock()
+        time_accountant = TimeAccountant(clock, polling=True, poll_interval=1)
+        time_accountant.start()
+
+        clock.advance(600)
+        time_accountant.tick()
+
+        self.assertEqual(1000, time_accountant.take()[1])
+
+    def test_idle_capped_across_ticks(self):
+        clock = SimulatedClock()
+        time_accountant = TimeAccountant(clock, gap_policy=GAP_POLICY_CAP, gap_cap=90, polling=False)
+        time_accountant.start()
+
+        clock.advance(30)
+        time_accountant.tick(idle_time=10)
+        for idle_time in [90, 150, 210]:
+            clock.advance(60)
+            time_accountant.tick(idle_time=idle_time)
+
+        self.assertEqual((30 + 90) * 1000, time_accountant.take()[1])
+
+    def test_wall_clock_steps_are_not_gaps(self):
+        clock = SimulatedClock()
+        time_accountant = TimeAccountant(clock, gap_policy=GAP_POLICY_KEEP, polling=False)
+        time_accountant.start()
+
+        clock.advance(30)
+        clock.step_wall_clock(3600)
+        time_accountant.tick()
+        clock.advance(30)
+        clock.step_wall_clock(-3600)
+        time_accountant.tick()
+
+        self.assertEqual((datetime(2020, 1, 1, 8, 0, 0), 60 * 1000), time_accountant.take())
+        self.assertEqual(datetime(2020, 1, 1, 8, 1, 0), time_accountant.start_date)
@@ -0,0 +1,69 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD
+from src.data_sources.errors import DataNotAvailableError
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.analytics_engine import AnalyticsEngine, is_analytics_engine_available
+
+
+@unittest.skipUnless(is_analytics_engine_available(), "NumPy is not installed")
+class AnalyticsEngineTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        data_backend = DataBackend({DATA_FILES_PATH_KEYWORD: Path(self.directory.name)})
+        data_backend.write_month_data({30: {"PyCharm": 1000}, 31: {"Terminal": 500}}, datetime.date(2019, 12, 1))
+        data_backend.write_month_data({
+            1: {"PyCharm": 2000, "Terminal": 100, "IntelliJ": 300, "Xcode": 400, "Safari": 50, "Mail": 10},
+            6: {"PyCharm": 3000}
+        }, datetime.date(2020, 1, 1))
+        data_backend.write_month_data({3: {"Terminal": 4000}}, datetime.date(2020, 2, 1))
+
+        self.data_repository = CodeTimeDataRepository(data_backend)
+        self.engine = AnalyticsEngine(self.data_repository)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_load(self):
+        matrix = self.engine.load(datetime.date(2019, 12, 31), datetime.date(2020, 1, 2))
+
+        self.assertEqual((3, 6), matrix.times.shape)
+        self.assertEqual(500, matrix.times[0, matrix.names.index("Terminal")])
+        self.assertEqual(2000, matrix.times[1, matrix.names.index("PyCharm")])
+        self.assertEqual([0, 0], list(matrix.times[2, :2]))
+
+    def test_get_statistics_matches_repository(self):
+        self.assertEqual(self.data_repository.get_statistics(datetime.date(2020, 1, 1)),
+                         self.engine.get_statistics(datetime.date(2020, 1, 1)))
+
+    def test_get_statistics_not_available_day(self):
+        self.assertRaises(DataNotAvailableError, self.engine.get_statistics, datetime.date(2020, 1, 2))
+
+    def test_get_range_statistics_matches_repository(self):
+        for granularity in ["day", "week", "month", "year"]:
+            start, end = datetime.date(2019, 12, 15), datetime.date(2020, 2, 29)
+            self.assertEqual(self.data_repository.get_range_statistics(start, end, granularity),
+                             self.engine.get_range_statistics(start, end, granularity))
+
+    def test_moving_average_and_percentiles(self):
+        matrix = self.engine.load(datetime.date(2020, 1, 5), datetime.date(2020, 1, 7))
+
+        self.assertEqual([1500, 1500], list(self.engine.get_moving_average(matrix, 2)))
+        self.assertEqual([0, 3000], list(self.engine.get_percentiles(matrix, [0, 100])))
+
+    def test_shares_and_ranking(self):
+        matrix = self.engine.load(datetime.date(2020, 2, 1), datetime.date(2020, 2, 29))
+
+        self.assertEqual(["Terminal"], matrix.names)
+        self.assertEqual([1.0], list(self.engine.get_shares(matrix)))
+        self.assertEqual([0], list(self.engine.get_ranking(matrix)))
+
+    def test_empty_range(self):
+        result = self.engine.get_range_statistics(datetime.date(2021, 1, 1), datetime.date(2021, 1, 31), "week")
+
+        self.assertEqual(0, result["total_time"])
+        self.assertEqual([], result["periods"])
@@ -0,0 +1,132 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from PIL import Image, ImageFont
+
+from benchmarks.image_fixtures import create_image_paths, create_image_data_repository
+from src.data_sources.data_backend import RES_DIRECTORY_KEYWORD
+from src.data_sources.errors import BackgroundImageNotFoundError
+from src.data_sources.image_cache import ImageCache
+from src.use_cases.image_creator.asset_cache import AssetCache
+from src.use_cases.image_creator.basic_image_creator import BasicImageCreator
+
+STATISTICS = {
+    "date": "Jan 01 2020",
+    "total_time": 5400000,
+    "activities": [{"name": "PyCharm", "time": 3600000, "progress": 2 / 3},
+                   {"name": "Terminal", "time": 1800000, "progress": 1 / 3}]
+}
+
+
+class AssetCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        paths = create_image_paths(Path(self.directory.name), background_size=(1080, 1400))
+        self.res_directory = paths[RES_DIRECTORY_KEYWORD]
+
+        self.asset_cache = AssetCache()
+        self.data_repository = create_image_data_repository(paths)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_get_font(self):
+        font_path = self.res_directory.joinpath("fonts", "OpenSans-Bold.ttf")
+        font = self.asset_cache.get_font(font_path, 30)
+
+        self.assertIs(font, self.asset_cache.get_font(font_path, 30))
+        self.assertIsNot(font, self.asset_cache.get_font(font_path, 40))
+
+    def test_get_image(self):
+        image_path = self.res_directory.joinpath("default_user.png")
+        image = self.asset_cache.get_image(image_path, size=(125, 125), mode="RGBA")
+
+        self.assertEqual((125, 125), image.size)
+        self.assertEqual("RGBA", image.mode)
+        self.assertIs(image, self.asset_cache.get_image(image_path, size=(125, 125), mode="RGBA"))
+        self.assertEqual((256, 256), self.asset_cache.get_image(image_path).size)
+        self.assertRaises(FileNotFoundError, self.asset_cache.get_image, self.res_directory.joinpath("missing.png"))
+
+    def test_invalidate_if_changed(self):
+        user_image_path = self.res_directory.joinpath("default_user.png")
+        background_path = self.res_directory.joinpath("default_background.png")
+        self.asset_cache.invalidate_if_changed([user_image_path])
+        self.asset_cache.get_image(user_image_path)
+
+        self.asset_cache.invalidate_if_changed([user_image_path])
+        self.assertEqual(1, len(self.asset_cache.images))
+
+        self.asset_cache.invalidate_if_changed([background_path])
+        self.assertEqual(0, len(self.asset_cache.images))
+
+    def test_replaced_image_is_loaded_again(self):
+        image_path = self.res_directory.joinpath("default_user.png")
+        self.asset_cache.invalidate_if_changed([image_path])
+        self.assertEqual((256, 256), self.asset_cache.get_image(image_path).size)
+
+        Image.new("RGB", (64, 64), "#000").save(image_path)
+        self.asset_cache.invalidate_if_changed([image_path])
+
+        self.assertEqual(0, len(self.asset_cache.images))
+        self.assertEqual((64, 64), self.asset_cache.get_image(image_path).size)
+
+    def test_create_image_loads_assets_once(self):
+        image_creator = BasicImageCreator(self.data_repository, self.asset_cache)
+
+        with patch("src.use_cases.image_creator.asset_cache.ImageFont.truetype",
+                   side_effect=ImageFont.truetype) as truetype:
+            first_image = image_creator.create_image(STATISTICS)
+            second_image = image_creator.create_image(STATISTICS)
+
+        self.assertEqual(4, truetype.call_count)
+        self.assertEqual(list(first_image.getdata()), list(second_image.getdata()))
+        self.assertIsNot(first_image, second_image)
+
+    def test_create_image_reloads_changed_image_setting(self):
+        image_creator = BasicImageCreator(self.data_repository, self.asset_cache)
+        image_creator.create_image(STATISTICS)
+
+        self.data_repository.update_setting("image", "missing.png")
+        self.assertRaises(BackgroundImageNotFoundError, image_creator.create_image, STATISTICS)
+
+    def test_create_image_scaled(self):
+        image_creator = BasicImageCreator(self.data_repository, self.asset_cache)
+        image = image_creator.create_image(STATISTICS, scale=0.5)
+
+        self.assertEqual((540, 700), image.size)
+        self.assertIn((self.res_directory.joinpath("fonts", "OpenSans-SemiBold.ttf").as_posix(), 20),
+                      [(Path(path).as_posix(), size) for path, _, size in self.asset_cache.fonts.keys()])
+        self.assertNotEqual(image_creator.get_image_key(STATISTICS, image_creator.get_theme()),
+                            image_creator.get_image_key(STATISTICS, image_creator.get_theme(), scale=0.5))
+
+    def test_create_png_cached(self):
+        image_creator = BasicImageCreator(self.data_repository, self.asset_cache, ImageCache())
+        image_creator.render = MagicMock(side_effect=image_creator.render)
+
+        png = image_creator.create_png(STATISTICS)
+        self.assertEqual(png, image_creator.create_png(STATISTICS))
+        self.assertEqual(1, image_creator.render.call_count)
+        self.assertEqual((1080, 1400), image_creator.create_cached_image(STATISTICS).size)
+
+        image_creator.create_png(dict(STATISTICS, total_time=7200000))
+        self.assertEqual(2, image_creator.render.call_count)
+
+        self.data_repository.update_setting("title_color", "#fff")
+        image_creator.create_png(STATISTICS)
+        self.assertEqual(3, image_creator.render.call_count)
+
+    def test_get_image_key_changes_with_assets(self):
+        image_creator = BasicImageCreator(self.data_repository, self.asset_cache)
+        theme = image_creator.get_theme()
+        key = image_creator.get_image_key(STATISTICS, theme)
+
+        self.assertEqual(key, image_creator.get_image_key(STATISTICS, theme))
+        Image.new("RGB", (64, 64), "#000").save(self.res_directory.joinpath("default_user.png"))
+        self.assertNotEqual(key, image_creator.get_image_key(STATISTICS, theme))
+
+
+if __name__ == '__main__':
+    unittest.main()
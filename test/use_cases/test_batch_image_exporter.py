@@ -0,0 +1,62 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from benchmarks.image_fixtures import create_image_paths, create_image_data_repository
+from src.data_sources.errors import DataNotAvailableError
+from src.use_cases.batch_image_exporter import export_images, get_days_to_export
+
+
+class BatchImageExporterTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.paths = create_image_paths(self.path, background_size=(1080, 1400))
+        self.data_repository = create_image_data_repository(self.paths)
+        self.data_repository.write_month_data({30: {"PyCharm": 1000}, 31: {"Terminal": 2000}},
+                                              datetime.date(2019, 12, 1))
+        self.data_repository.write_month_data({1: {"PyCharm": 3000}}, datetime.date(2020, 1, 1))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_get_days_to_export(self):
+        self.assertEqual([datetime.date(2019, 12, 30), datetime.date(2019, 12, 31), datetime.date(2020, 1, 1)],
+                         get_days_to_export(self.data_repository))
+        self.assertEqual([datetime.date(2019, 12, 31)],
+                         get_days_to_export(self.data_repository, datetime.date(2019, 12, 31),
+                                            datetime.date(2019, 12, 31)))
+
+    def test_export_images_in_process(self):
+        progress = MagicMock()
+        days = get_days_to_export(self.data_repository)
+        file_paths = export_images(self.paths, self.data_repository, days, self.path.joinpath("images"),
+                                   processes=1, progress=progress)
+
+        self.assertEqual(["code-time_2019-12-30.png", "code-time_2019-12-31.png", "code-time_2020-01-01.png"],
+                         [file_path.name for file_path in file_paths])
+        self.assertEqual((3, 3), progress.call_args[0])
+        with Image.open(file_paths[0]) as image:
+            self.assertEqual((1080, 1400), image.size)
+
+    def test_export_images_in_processes(self):
+        progress = MagicMock()
+        days = get_days_to_export(self.data_repository)
+        file_paths = export_images(self.paths, self.data_repository, days, self.path.joinpath("images"),
+                                   processes=2, progress=progress)
+
+        self.assertTrue(all(file_path.exists() for file_path in file_paths))
+        self.assertEqual(3, progress.call_count)
+
+    def test_export_images_without_data(self):
+        self.assertRaises(DataNotAvailableError, export_images, self.paths, self.data_repository,
+                          [datetime.date(2020, 2, 1)], self.path.joinpath("images"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import datetime
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD
+from src.data_sources.journal import Journal
+from src.use_cases.exporter import ExportRow, iter_export_rows, write_csv, write_ndjson
+
+
+class ExporterTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_backend = DataBackend({DATA_FILES_PATH_KEYWORD: Path(self.directory.name)})
+        self.data_backend.write_month_data({31: {"PyCharm": 1000}}, datetime.date(2019, 12, 1))
+        self.data_backend.write_month_data({2: {"Terminal": 500}, 1: {"PyCharm": 2000, "Visual Studio Code": 300}},
+                                           datetime.date(2020, 1, 1))
+        self.data_backend.write_month_data({3: {"Terminal": 4000}}, datetime.date(2020, 2, 1))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_iter_export_rows(self):
+        expected_result = [
+            ExportRow(datetime.date(2019, 12, 31), "PyCharm", 1000),
+            ExportRow(datetime.date(2020, 1, 1), "PyCharm", 2000),
+            ExportRow(datetime.date(2020, 1, 1), "Visual Studio Code", 300),
+            ExportRow(datetime.date(2020, 1, 2), "Terminal", 500),
+            ExportRow(datetime.date(2020, 2, 3), "Terminal", 4000)
+        ]
+
+        self.assertEqual(expected_result, list(iter_export_rows(self.data_backend)))
+
+    def test_iter_export_rows_filters(self):
+        result = list(iter_export_rows(self.data_backend, start=datetime.date(2020, 1, 1),
+                                       end=datetime.date(2020, 1, 31), activities=["PyCharm", "prefix:Visual"]))
+
+        self.assertEqual([ExportRow(datetime.date(2020, 1, 1), "PyCharm", 2000),
+                          ExportRow(datetime.date(2020, 1, 1), "Visual Studio Code", 300)], result)
+
+    def test_iter_export_rows_reads_one_month_at_a_time(self):
+        self.data_backend.read_month_data = MagicMock(side_effect=self.data_backend.read_month_data)
+        rows = iter_export_rows(self.data_backend, end=datetime.date(2020, 1, 31))
+
+        next(rows)
+        self.assertEqual(1, self.data_backend.read_month_data.call_count)
+        self.assertEqual(4, len(list(rows)) + 1)
+        self.assertEqual(2, self.data_backend.read_month_data.call_count)
+
+    def test_iter_export_rows_includes_journal(self):
+        journal = Journal(Path(self.directory.name).joinpath("journal.log"))
+        journal.append(datetime.datetime(2020, 2, 3, 10), "Terminal", 1000, 5000)
+        journal.append(datetime.datetime(2020, 3, 1, 10), "PyCharm", 1000, 1000)
+
+        result = list(iter_export_rows(self.data_backend, start=datetime.date(2020, 2, 1), journal=journal))
+
+        self.assertEqual([ExportRow(datetime.date(2020, 2, 3), "Terminal", 5000),
+                          ExportRow(datetime.date(2020, 3, 1), "PyCharm", 1000)], result)
+
+    def test_write_csv(self):
+        file = io.StringIO()
+        write_csv([ExportRow(datetime.date(2020, 1, 1), "PyCharm, Community", 2000)], file)
+
+        self.assertEqual('date,activity,time\r\n2020-01-01,"PyCharm, Community",2000\r\n', file.getvalue())
+
+    def test_write_ndjson(self):
+        file = io.StringIO()
+        write_ndjson([ExportRow(datetime.date(2020, 1, 1), "PyCharm", 2000),
+                      ExportRow(datetime.date(2020, 1, 2), "Terminal", 500)], file)
+
+        self.assertEqual([{"date": "2020-01-01", "activity": "PyCharm", "time": 2000},
+                          {"date": "2020-01-02", "activity": "Terminal", "time": 500}],
+                         [json.loads(line) for line in file.getvalue().splitlines()])
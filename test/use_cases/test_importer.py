@@ -0,0 +1,143 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.data_sources.columnar_data_backend import ColumnarDataBackend
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD
+from src.data_sources.errors import InvalidImportSourceError
+from src.data_sources.import_ledger import ImportLedger
+from src.use_cases.exporter import iter_export_rows, write_csv, write_ndjson
+from src.use_cases.importer import import_tracking_data, read_source_months, subtract_month_data, \
+    merge_month_data
+
+
+class ImporterTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.data_backend = DataBackend({DATA_FILES_PATH_KEYWORD: self.path.joinpath("local")})
+        self.data_backend.write_month_data({1: {"PyCharm": 1000}}, datetime.date(2020, 1, 1))
+        self.ledger = ImportLedger(self.path.joinpath("local", "imports.json"))
+
+        self.source_path = self.path.joinpath("laptop")
+        self.source_backend = ColumnarDataBackend({DATA_FILES_PATH_KEYWORD: self.source_path})
+        self.source_backend.write_month_data({1: {"PyCharm": 500, "Terminal": 200}}, datetime.date(2020, 1, 1))
+        self.source_backend.write_month_data({3: {"Terminal": 300}}, datetime.date(2020, 2, 1))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_import_data_directory(self):
+        result = import_tracking_data(self.data_backend, self.ledger, self.source_path, name="laptop")
+
+        self.assertEqual(2, result.imported_months)
+        self.assertEqual({1: {"PyCharm": 1500, "Terminal": 200}},
+                         self.data_backend.read_month_data(datetime.date(2020, 1, 1)))
+        self.assertEqual({3: {"Terminal": 300}}, self.data_backend.read_month_data(datetime.date(2020, 2, 1)))
+
+    def test_import_twice_is_skipped(self):
+        import_tracking_data(self.data_backend, self.ledger, self.source_path, name="laptop")
+        result = import_tracking_data(self.data_backend, ImportLedger(self.ledger.file_path), self.source_path,
+                                      name="other name")
+
+        self.assertTrue(result.skipped)
+        self.assertEqual({1: {"PyCharm": 1500, "Terminal": 200}},
+                         self.data_backend.read_month_data(datetime.date(2020, 1, 1)))
+
+    def test_import_again_adds_changes_only(self):
+        import_tracking_data(self.data_backend, self.ledger, self.source_path, name="laptop")
+        self.source_backend.write_month_data({3: {"Terminal": 300}, 4: {"PyCharm": 100}}, datetime.date(2020, 2, 1))
+
+        self.data_backend.write_month_data = MagicMock(side_effect=self.data_backend.write_month_data)
+        result = import_tracking_data(self.data_backend, ImportLedger(self.ledger.file_path), self.source_path,
+                                      name="laptop")
+
+        self.assertEqual(1, result.imported_months)
+        self.data_backend.write_month_data.assert_called_once()
+        self.assertEqual({1: {"PyCharm": 1500, "Terminal": 200}},
+                         self.data_backend.read_month_data(datetime.date(2020, 1, 1)))
+        self.assertEqual({3: {"Terminal": 300}, 4: {"PyCharm": 100}},
+                         self.data_backend.read_month_data(datetime.date(2020, 2, 1)))
+
+    def test_ledger_keeps_a_file_per_imported_month(self):
+        self.ledger.save = MagicMock(side_effect=self.ledger.save)
+        import_tracking_data(self.data_backend, self.ledger, self.source_path, name="laptop")
+
+        # once per month for recording it as pending and once for clearing it, once for recording the source
+        self.assertEqual(5, self.ledger.save.call_count)
+        self.assertEqual(2, len(list(self.ledger.months_directory.glob("*/*.json"))))
+        self.assertEqual({3: {"Terminal": 300}}, self.ledger.get_imported_month("laptop", "2020-02")["data"])
+        with open(self.ledger.file_path, "r") as file:
+            self.assertNotIn("Terminal", file.read())
+
+    def test_import_interrupted_after_write_is_not_repeated(self):
+        ledger = ImportLedger(self.ledger.file_path)
+        ledger.record_month = MagicMock(side_effect=KeyboardInterrupt())
+        with self.assertRaises(KeyboardInterrupt):
+            import_tracking_data(self.data_backend, ledger, self.source_path, name="laptop")
+
+        result = import_tracking_data(self.data_backend, ImportLedger(self.ledger.file_path), self.source_path,
+                                      name="laptop")
+
+        self.assertEqual(1, result.imported_months)
+        self.assertEqual({1: {"PyCharm": 1500, "Terminal": 200}},
+                         self.data_backend.read_month_data(datetime.date(2020, 1, 1)))
+        self.assertEqual({3: {"Terminal": 300}}, self.data_backend.read_month_data(datetime.date(2020, 2, 1)))
+
+    def test_import_interrupted_before_write_is_repeated(self):
+        self.data_backend.write_month_data = MagicMock(side_effect=KeyboardInterrupt())
+        with self.assertRaises(KeyboardInterrupt):
+            import_tracking_data(self.data_backend, self.ledger, self.source_path, name="laptop")
+        del self.data_backend.write_month_data
+
+        import_tracking_data(self.data_backend, ImportLedger(self.ledger.file_path), self.source_path, name="laptop")
+
+        self.assertEqual({1: {"PyCharm": 1500, "Terminal": 200}},
+                         self.data_backend.read_month_data(datetime.date(2020, 1, 1)))
+
+    def test_import_reads_and_writes_every_month_once(self):
+        self.data_backend.read_month_data = MagicMock(side_effect=self.data_backend.read_month_data)
+        self.data_backend.write_month_data = MagicMock(side_effect=self.data_backend.write_month_data)
+
+        export = self.path.joinpath("export.ndjson")
+        with open(export, "w") as file:
+            write_ndjson(iter_export_rows(self.source_backend), file)
+            write_ndjson(iter_export_rows(self.source_backend), file)
+
+        import_tracking_data(self.data_backend, self.ledger, export)
+
+        self.assertEqual(2, self.data_backend.read_month_data.call_count)
+        self.assertEqual(2, self.data_backend.write_month_data.call_count)
+        self.assertEqual({1: {"PyCharm": 2000, "Terminal": 400}},
+                         self.data_backend.read_month_data(datetime.date(2020, 1, 1)))
+
+    def test_read_source_months_csv(self):
+        export = self.path.joinpath("export.csv")
+        with open(export, "w", newline="") as file:
+            write_csv(iter_export_rows(self.source_backend), file)
+
+        self.assertEqual({datetime.date(2020, 1, 1): {1: {"PyCharm": 500, "Terminal": 200}},
+                          datetime.date(2020, 2, 1): {3: {"Terminal": 300}}}, read_source_months(export))
+
+    def test_read_source_months_invalid(self):
+        export = self.path.joinpath("export.csv")
+        with open(export, "w") as file:
+            file.write("date,activity,time\n2020-13-01,PyCharm,100\n")
+
+        self.assertRaises(InvalidImportSourceError, read_source_months, export)
+        self.assertRaises(InvalidImportSourceError, read_source_months, self.path.joinpath("export.txt"))
+
+    def test_subtract_and_merge_month_data(self):
+        difference = subtract_month_data({1: {"PyCharm": 500}, 2: {"Terminal": 100}},
+                                         {1: {"PyCharm": 500, "Terminal": 50}})
+
+        self.assertEqual({1: {"Terminal": -50}, 2: {"Terminal": 100}}, difference)
+        self.assertEqual({1: {"PyCharm": 10}, 2: {"Terminal": 100}},
+                         merge_month_data({1: {"PyCharm": 10, "Terminal": 50}}, difference))
+
+
+if __name__ == '__main__':
+    unittest.main()
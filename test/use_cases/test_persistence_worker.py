@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.use_cases.persistence_worker import PersistenceWorker
+
+
+class PersistenceWorkerTest(unittest.TestCase):
+
+    @staticmethod
+    def start_worker(worker: PersistenceWorker) -> threading.Thread:
+        """Runs the worker on an event loop of its own thread, like the runtime does."""
+        thread = threading.Thread(target=asyncio.run, args=(worker.run_async(),))
+        thread.start()
+        while worker.loop is None:
+            time.sleep(0.001)
+
+        return thread
+
+    def test_flush_on_quit(self):
+        data_repository = MagicMock()
+        worker = PersistenceWorker(data_repository, flush_interval=60)
+
+        thread = self.start_worker(worker)
+        worker.on_quit()
+        thread.join(1)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(2, data_repository.flush.call_count)
+        data_repository.compact_journal.assert_called_once()
+
+    def test_flush_interval(self):
+        data_repository = MagicMock()
+        worker = PersistenceWorker(data_repository, flush_interval=0.05)
+
+        thread = self.start_worker(worker)
+        time.sleep(0.3)
+        worker.on_quit()
+        thread.join(1)
+
+        self.assertGreaterEqual(worker.flush_count, 3)
+        self.assertLessEqual(worker.flush_count, 8)
+
+    def test_flush_after_pending_events(self):
+        data_repository = MagicMock()
+        worker = PersistenceWorker(data_repository, flush_interval=60, flush_events=3)
+        thread = self.start_worker(worker)
+
+        worker.on_pending_changed(1)
+        worker.on_pending_changed(2)
+        time.sleep(0.1)
+        self.assertEqual(0, worker.flush_count)
+
+        worker.on_pending_changed(3)
+        time.sleep(0.1)
+        self.assertEqual(1, worker.flush_count)
+
+        worker.on_quit()
+        thread.join(1)
+
+    def test_registers_pending_listener(self):
+        data_repository = MagicMock()
+        worker = PersistenceWorker(data_repository)
+        self.assertEqual(worker.on_pending_changed, data_repository.pending_listener)
+
+    def test_compaction_interval(self):
+        data_repository = MagicMock()
+        worker = PersistenceWorker(data_repository, flush_interval=0.02, compaction_interval=0.1)
+
+        thread = self.start_worker(worker)
+        time.sleep(0.35)
+        worker.on_quit()
+        thread.join(1)
+
+        self.assertGreaterEqual(data_repository.compact_journal.call_count, 3)
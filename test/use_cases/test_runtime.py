@@ -0,0 +1,130 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.repositories.scripted_focus_activity_provider import ScriptedFocusActivityProvider
+from src.use_cases.activity_tracker import ActivityTracker, GAP_POLICY_DROP, GAP_POLICY_KEEP
+from src.use_cases.persistence_worker import PersistenceWorker
+from src.use_cases.runtime import ConfigWatcher, Runtime
+
+
+class RuntimeTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.settings = {"activities": ["PyCharm", "Terminal"], "gap_policy": GAP_POLICY_DROP, "gap_cap": 300}
+        self.data_repository = MagicMock()
+        self.data_repository.config_version = 1
+        self.data_repository.get_setting = MagicMock(side_effect=lambda name: self.settings[name])
+        self.data_repository.is_activity_tracked = MagicMock(
+            side_effect=lambda name, get_bundle_id=None: name in self.settings["activities"])
+
+    def get_tracked_times(self):
+        return [(c.args[0]["name"], c.args[0]["time"]) for c in self.data_repository.add_session_data.call_args_list]
+
+    def test_tasks_share_one_thread(self):
+        provider = ScriptedFocusActivityProvider("Safari")
+        tracker = ActivityTracker(self.data_repository, provider)
+        persistence_worker = PersistenceWorker(self.data_repository, flush_interval=60)
+        thread_count = threading.active_count()
+
+        config_watcher = ConfigWatcher(self.data_repository)
+        runtime = Runtime([tracker.run_async, persistence_worker.run_async, config_watcher.run_async])
+        runtime.start()
+        provider.play([(0.05, "PyCharm"), (0.2, "Terminal"), (0.1, "Safari")])
+        self.assertEqual(thread_count + 1, threading.active_count())
+
+        runtime.stop()
+        runtime.join(1)
+
+        self.assertFalse(runtime.is_alive())
+        self.assertEqual([], runtime.errors)
+        self.assertEqual([], provider.subscribers)
+        self.assertEqual(["PyCharm", "Terminal"], [name for name, _ in self.get_tracked_times()])
+        self.assertAlmostEqual(200, self.get_tracked_times()[0][1], delta=50)
+        self.data_repository.compact_journal.assert_called_once()
+
+    def test_stop_writes_last_interval_before_flushing(self):
+        provider = ScriptedFocusActivityProvider("PyCharm", push=False)
+        tracker = ActivityTracker(self.data_repository, provider, poll_interval=0.01)
+        persistence_worker = PersistenceWorker(self.data_repository, flush_interval=60)
+
+        runtime = Runtime([tracker.run_async, persistence_worker.run_async])
+        runtime.start()
+        time.sleep(0.1)
+        runtime.stop()
+        runtime.join(1)
+
+        self.assertGreater(tracker.wake_ups, 5)
+        self.assertEqual(["PyCharm"], [name for name, _ in self.get_tracked_times()])
+        calls = [c[0] for c in self.data_repository.method_calls]
+        self.assertLess(calls.index("add_session_data"), calls.index("compact_journal"))
+
+    def test_tracker_quit_and_pause(self):
+        provider = ScriptedFocusActivityProvider("PyCharm")
+        tracker = ActivityTracker(self.data_repository, provider)
+
+        runtime = Runtime([tracker.run_async])
+        runtime.start()
+        time.sleep(0.1)
+        tracker.on_pause_continue()
+        time.sleep(0.1)
+        tracker.on_quit()
+        time.sleep(0.05)
+
+        self.assertEqual(["PyCharm"], [name for name, _ in self.get_tracked_times()])
+        self.assertAlmostEqual(100, self.get_tracked_times()[0][1], delta=50)
+        runtime.stop()
+        runtime.join(1)
+        self.assertFalse(runtime.is_alive())
+
+    def test_persistence_flush_after_pending_events(self):
+        persistence_worker = PersistenceWorker(self.data_repository, flush_interval=60, flush_events=2)
+
+        runtime = Runtime([persistence_worker.run_async])
+        runtime.start()
+        runtime.started.wait()
+        time.sleep(0.05)
+        persistence_worker.on_pending_changed(2)
+        time.sleep(0.05)
+
+        self.assertEqual(1, persistence_worker.flush_count)
+        runtime.stop()
+        runtime.join(1)
+
+    def test_config_watcher(self):
+        tracker = ActivityTracker(self.data_repository, ScriptedFocusActivityProvider("PyCharm"))
+        tracker.start_tracking()
+        config_watcher = ConfigWatcher(self.data_repository, interval=0.01)
+        config_watcher.add_listener(tracker.on_config_changed)
+
+        runtime = Runtime([config_watcher.run_async])
+        runtime.start()
+        time.sleep(0.05)
+        self.settings["gap_policy"] = GAP_POLICY_KEEP
+        self.data_repository.config_version = 2
+        time.sleep(0.05)
+        runtime.stop()
+        runtime.join(1)
+
+        self.assertEqual(GAP_POLICY_KEEP, tracker.time_accountant.gap_policy)
+        self.assertEqual([], runtime.errors)
+
+    def test_failed_task_is_reported_immediately(self):
+        async def fail():
+            raise OSError("disk full")
+
+        failures = []
+        runtime = Runtime([fail], on_failed=failures.append)
+        runtime.start()
+        time.sleep(0.05)
+
+        self.assertEqual(1, len(failures))
+        self.assertIsInstance(failures[0], OSError)
+        runtime.stop()
+        runtime.join(1)
+        self.assertEqual(failures, runtime.errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
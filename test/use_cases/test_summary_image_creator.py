@@ -0,0 +1,84 @@
+import datetime
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.image_fixtures import create_image_paths, create_image_data_repository
+from src.data_sources.errors import DataNotAvailableError
+from src.use_cases.image_creator import summary_image_creator
+from src.use_cases.image_creator.summary_image_creator import WeekSummaryImageCreator, MonthSummaryImageCreator, \
+    YearSummaryImageCreator, create_bar_mask, get_day_totals, get_summary_range
+
+
+class SummaryImageCreatorTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.data_repository = create_image_data_repository(create_image_paths(self.path))
+
+        for month in range(1, 13):
+            self.data_repository.write_month_data({day: {"PyCharm": day * 60000, f"Activity {month}": 1000}
+                                                   for day in range(1, 29)}, datetime.date(2020, month, 1))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_get_summary_range(self):
+        date = datetime.date(2020, 2, 12)
+
+        self.assertEqual((datetime.date(2020, 2, 10), datetime.date(2020, 2, 16)), get_summary_range(date, "week"))
+        self.assertEqual((datetime.date(2020, 2, 1), datetime.date(2020, 2, 29)), get_summary_range(date, "month"))
+        self.assertEqual((datetime.date(2020, 1, 1), datetime.date(2020, 12, 31)), get_summary_range(date, "year"))
+
+    def test_get_summary_statistics(self):
+        statistics = MonthSummaryImageCreator(self.data_repository).get_summary_statistics(datetime.date(2020, 2, 12))
+        day_totals = get_day_totals(statistics)
+
+        self.assertEqual("February 2020", statistics["date"])
+        self.assertEqual(29, len(day_totals))
+        self.assertEqual([61000, 0], [day_totals[0], day_totals[28]])
+        self.assertRaises(DataNotAvailableError,
+                          WeekSummaryImageCreator(self.data_repository).get_summary_statistics,
+                          datetime.date(2021, 6, 1))
+
+    def test_create_bar_mask(self):
+        mask = create_bar_mask([0, 5, 10], 30, 10)
+
+        self.assertEqual((30, 10), mask.size)
+        self.assertEqual(0, mask.getpixel((5, 9)))
+        self.assertEqual((0, 255), (mask.getpixel((15, 4)), mask.getpixel((15, 5))))
+        self.assertEqual((255, 0), (mask.getpixel((21, 0)), mask.getpixel((29, 0))))
+
+    def test_create_image(self):
+        for image_creator in (WeekSummaryImageCreator(self.data_repository),
+                              MonthSummaryImageCreator(self.data_repository),
+                              YearSummaryImageCreator(self.data_repository)):
+            statistics = image_creator.get_summary_statistics(datetime.date(2020, 2, 12))
+
+            self.assertEqual((1080, 1920), image_creator.create_image(statistics).size)
+            self.assertEqual((540, 960), image_creator.create_image(statistics, scale=0.5).size)
+
+    def test_create_image_without_numpy(self):
+        image_creator = MonthSummaryImageCreator(self.data_repository)
+        statistics = image_creator.get_summary_statistics(datetime.date(2020, 2, 12))
+        image = image_creator.create_image(statistics)
+
+        with patch.object(summary_image_creator, "numpy", None):
+            image_without_numpy = image_creator.create_image(statistics)
+
+        self.assertEqual(image.getpixel((141, 729)), image_without_numpy.getpixel((141, 729)))
+
+    def test_create_year_image_in_under_a_second(self):
+        image_creator = YearSummaryImageCreator(self.data_repository)
+        statistics = image_creator.get_summary_statistics(datetime.date(2020, 1, 1))
+
+        start = time.perf_counter()
+        image_creator.create_image(statistics)
+        self.assertLess(time.perf_counter() - start, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
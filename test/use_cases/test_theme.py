@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.data_sources.data_backend import DataBackend, DATA_FILES_PATH_KEYWORD, CONFIG_FILE_PATH_KEYWORD, \
+    RES_DIRECTORY_KEYWORD
+from src.repositories.code_time_data_repository import CodeTimeDataRepository
+from src.use_cases.image_creator.basic_image_creator import BasicImageCreator
+from src.use_cases.image_creator.theme import Theme
+
+
+class ThemeTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.data_repository = CodeTimeDataRepository(DataBackend({
+            DATA_FILES_PATH_KEYWORD: self.path.joinpath("data"),
+            CONFIG_FILE_PATH_KEYWORD: self.path.joinpath("config.json"),
+            RES_DIRECTORY_KEYWORD: self.path.joinpath("res")}))
+        self.data_repository.create_default_config_if_config_is_missing()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_from_repository(self):
+        self.data_repository.update_setting("username", " user ")
+        theme = Theme.from_repository(self.data_repository)
+
+        self.assertEqual((0, 0, 0), theme.title_color)
+        self.assertEqual((63, 81, 181), theme.progress_foreground_color)
+        self.assertEqual(str(self.path.joinpath("res", "fonts", "OpenSans-Bold.ttf")), str(theme.get_font_path("bold")))
+        self.assertEqual(str(self.path.joinpath("res", "default_background.png")), theme.image_path)
+        self.assertEqual("user", theme.username)
+
+    def test_immutable_and_hashable(self):
+        theme = Theme.from_repository(self.data_repository)
+
+        self.assertRaises(AttributeError, setattr, theme, "username", "other user")
+        self.assertRaises(AttributeError, setattr, theme, "unknown", 1)
+        self.assertFalse(hasattr(theme, "__dict__"))
+        self.assertEqual(theme, Theme.from_repository(self.data_repository))
+        self.assertEqual(hash(theme), hash(Theme.from_repository(self.data_repository)))
+
+        self.data_repository.update_setting("title_color", "#fff")
+        self.assertNotEqual(theme, Theme.from_repository(self.data_repository))
+
+    def test_get_theme_rebuilt_on_config_change(self):
+        image_creator = BasicImageCreator(self.data_repository)
+        theme = image_creator.get_theme()
+
+        self.data_repository.get_setting = MagicMock(side_effect=self.data_repository.get_setting)
+        self.assertIs(theme, image_creator.get_theme())
+        self.data_repository.get_setting.assert_not_called()
+
+        self.data_repository.update_setting("title_color", "#fff")
+        self.assertEqual((255, 255, 255), image_creator.get_theme().title_color)
+
+
+if __name__ == '__main__':
+    unittest.main()